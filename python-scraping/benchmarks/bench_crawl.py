@@ -0,0 +1,83 @@
+# bench_crawl.py
+# ========================================
+# ローカルの練習用カタログに対して、クローラーの速度（pages/sec）を計測する
+# ========================================
+# 実行例：
+#   python python-scraping/benchmarks/bench_crawl.py
+#   python python-scraping/benchmarks/bench_crawl.py --latency 0.05 --concurrency 1 8 32
+#
+# 💡 --latency は「サーバーの応答待ち」を疑似的に入れるオプション。
+#    本物のサイトは数十〜数百ミリ秒かかるので、並行化の効果が分かりやすくなります。
+# 💡 --cache を付けると、空のキャッシュで1回目 → 同じキャッシュで2回目を巡回し、
+#    条件付きリクエスト（304）でどれだけ通信量が減るかを比べます。
+
+import argparse
+import functools
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.async_crawler import crawl, fetch_html  # noqa: E402
+from scraping_common.client import FetchClient  # noqa: E402
+from scraping_common.fixture_server import CatalogueServer  # noqa: E402
+from scraping_common.http_cache import HttpCache  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="クローラーの pages/sec を計測")
+    parser.add_argument("--pages", type=int, default=50, help="一覧ページ数（1ページ20冊）")
+    parser.add_argument("--latency", type=float, default=0.02, help="1リクエストの疑似応答時間（秒）")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 32])
+    parser.add_argument("--no-details", action="store_true", help="詳細ページを取得しない")
+    parser.add_argument("--cache", action="store_true", help="キャッシュなし／あり（再検証）を比較")
+    parser.add_argument("--rate", type=float, default=None, help="1秒あたりのリクエスト上限")
+    args = parser.parse_args()
+
+    with CatalogueServer(pages=args.pages, latency=args.latency) as server:
+        print(f"▶ カタログ: {args.pages} ページ / 応答待ち {args.latency * 1000:.0f} ms")
+        if args.cache:
+            bench_cache(server, args)
+            return
+        print(
+            f"{'同時数':>6} {'ページ':>6} {'件数':>6} {'秒':>8} {'pages/sec':>10}"
+            f" {'再利用率':>8} {'p50ms':>7} {'p99ms':>7}"
+        )
+        for concurrency in args.concurrency:
+            with FetchClient(pool_size=concurrency, rate=args.rate, burst=concurrency) as client:
+                result = crawl(
+                    server.base_url,
+                    concurrency=concurrency,
+                    follow_details=not args.no_details,
+                    fetch=functools.partial(fetch_html, use_cache=False, client=client),
+                )
+                stats = client.stats()
+            print(
+                f"{concurrency:>6} {result.pages:>6} {len(result.records):>6} "
+                f"{result.elapsed:>8.2f} {result.pages_per_sec:>10.1f}"
+                f" {stats['reuse_ratio']:>8.1%} {stats.get('p50_ms', 0):>7.1f}"
+                f" {stats.get('p99_ms', 0):>7.1f}"
+            )
+
+
+def bench_cache(server: CatalogueServer, args) -> None:
+    """1回目（キャッシュ空）と2回目（ttl=0 で全ページ再検証）の秒数・通信量を比べる。"""
+    concurrency = max(args.concurrency)
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = HttpCache(tmp, ttl=0)  # ttl=0 → 毎回サーバーに「変わった？」と確認する
+        print(f"{'回':>4} {'ページ':>6} {'秒':>8} {'受信KB':>10}")
+        for label in ("1回目", "2回目"):
+            before = server.bytes_sent
+            result = crawl(
+                server.base_url,
+                concurrency=concurrency,
+                follow_details=not args.no_details,
+                fetch=functools.partial(fetch_html, cache=cache),
+            )
+            received = (server.bytes_sent - before) / 1024
+            print(f"{label:>4} {result.pages:>6} {result.elapsed:>8.2f} {received:>10.1f}")
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
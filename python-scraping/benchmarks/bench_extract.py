@@ -0,0 +1,73 @@
+# bench_extract.py
+# ========================================
+# HTML抽出バックエンドごとの速度（ms/page）とメモリ（ピーク）を比べる
+# ========================================
+# 実行例：
+#   python python-scraping/benchmarks/bench_extract.py
+#   python python-scraping/benchmarks/bench_extract.py --pages 200 --detail
+#
+# 比較対象の "soup" が、これまでの scraping_02 / scraping_03 と同じ方法
+# （BeautifulSoup(html, "html.parser") でページ全体をツリー化 → find_all）です。
+#
+# 💡 メモリは tracemalloc（Pythonが確保したメモリ）で計測します。
+#    lxml はC言語側でメモリを確保するため、実際より小さく表示される点に注意。
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.extract import BACKENDS, extract_detail, extract_listing, lxml  # noqa: E402
+from scraping_common.fixture_server import Catalogue  # noqa: E402
+
+
+def measure(func, pages: list[str]) -> tuple[float, float, list]:
+    """(ms/page, 1ページ解析中のピークKB, 結果) を返す。"""
+    # 速度：tracemalloc を切った状態で計測（計測そのものが遅くするため）
+    started = time.perf_counter()
+    results = [func(html) for html in pages]
+    ms_per_page = (time.perf_counter() - started) * 1000 / len(pages)
+
+    # メモリ：1ページずつ解析したときのピーク
+    tracemalloc.start()
+    peak = 0
+    for html in pages[:20]:
+        tracemalloc.reset_peak()
+        func(html)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+    tracemalloc.stop()
+    return ms_per_page, peak / 1024, results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="HTML抽出バックエンドの比較")
+    parser.add_argument("--pages", type=int, default=50, help="解析する一覧ページ数")
+    parser.add_argument("--detail", action="store_true", help="詳細ページでも比較する")
+    args = parser.parse_args()
+
+    catalogue = Catalogue(pages=args.pages)
+    listings = [catalogue.render_listing(n) for n in range(1, args.pages + 1)]
+    details = [catalogue.render_detail(book) for book in catalogue.books[: args.pages * 2]]
+    backends = [b for b in BACKENDS if b != "lxml" or lxml is not None]
+
+    targets = [("一覧", listings, lambda b: lambda html: extract_listing(html, b))]
+    if args.detail:
+        targets.append(("詳細", details, lambda b: lambda html: extract_detail(html, b)))
+
+    for label, pages, make_func in targets:
+        print(f"=== {label}ページ {len(pages)} 件 ===")
+        print(f"{'バックエンド':<10} {'ms/page':>9} {'ピークKB':>10} {'速度比':>7}")
+        baseline_ms, baseline_result = None, None
+        for backend in backends:
+            ms, peak_kb, result = measure(make_func(backend), pages)
+            if baseline_ms is None:  # 先頭の "soup"（これまでの方法）を基準にする
+                baseline_ms, baseline_result = ms, result
+            same = "" if result == baseline_result else "  ⚠ 結果が一致しません"
+            print(f"{backend:<10} {ms:>9.2f} {peak_kb:>10.0f} {baseline_ms / ms:>6.1f}x{same}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
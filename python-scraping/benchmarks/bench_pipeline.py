@@ -0,0 +1,77 @@
+# bench_pipeline.py
+# ========================================
+# 取得／解析パイプラインの速度が、解析プロセス数（CPUコア）に応じて伸びるかを計測する
+# ========================================
+# 実行例：
+#   python python-scraping/benchmarks/bench_pipeline.py
+#   python python-scraping/benchmarks/bench_pipeline.py --parsers 1 2 4 8 --parser soup
+#
+# 💡 練習用カタログのサーバーは別プロセスで動かします。
+#    同じプロセスに置くと、サーバー側の処理が計測対象とCPUを取り合ってしまうため。
+
+import argparse
+import functools
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.client import FetchClient  # noqa: E402
+from scraping_common.extract import BACKENDS  # noqa: E402
+from scraping_common.fixture_server import CatalogueServer  # noqa: E402
+from scraping_common.pipeline import fetch_bytes, pipeline  # noqa: E402
+
+
+def serve(pages: int, latency: float, urls, stop) -> None:
+    """別プロセスでカタログを配信し、URLを親プロセスに知らせる。"""
+    with CatalogueServer(pages=pages, latency=latency) as server:
+        urls.put(server.base_url)
+        stop.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="パイプラインの解析プロセス数ごとの速度")
+    parser.add_argument("--pages", type=int, default=50, help="一覧ページ数（1ページ20冊）")
+    parser.add_argument("--latency", type=float, default=0.0, help="1リクエストの疑似応答時間（秒）")
+    parser.add_argument("--fetchers", type=int, default=16, help="同時に通信する数")
+    parser.add_argument("--queue-size", type=int, default=64, help="HTMLキューの上限（ページ数）")
+    parser.add_argument("--parser", choices=BACKENDS, default="soup", help="HTML抽出のバックエンド")
+    cpus = os.cpu_count() or 1
+    parser.add_argument(
+        "--parsers", type=int, nargs="+", default=sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    )
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    urls, stop = context.Queue(), context.Event()
+    server = context.Process(target=serve, args=(args.pages, args.latency, urls, stop), daemon=True)
+    server.start()
+    base_url = urls.get()
+    try:
+        print(f"▶ カタログ: {args.pages} ページ / 抽出: {args.parser} / CPU: {cpus} コア")
+        print(f"{'解析数':>6} {'ページ':>6} {'件数':>6} {'秒':>8} {'pages/sec':>10} {'最大キュー':>10}")
+        baseline = None
+        for parsers in args.parsers:
+            with FetchClient(pool_size=args.fetchers) as client:
+                result = pipeline(
+                    base_url,
+                    fetchers=args.fetchers,
+                    parsers=parsers,
+                    queue_size=args.queue_size,
+                    fetch=functools.partial(fetch_bytes, use_cache=False, client=client),
+                    parser=args.parser,
+                )
+            baseline = baseline or result.pages_per_sec
+            print(
+                f"{parsers:>6} {result.pages:>6} {len(result.records):>6} {result.elapsed:>8.2f}"
+                f" {result.pages_per_sec:>10.1f} {result.max_queue:>10}"
+                f"  ({result.pages_per_sec / baseline:.1f}x)"
+            )
+    finally:
+        stop.set()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
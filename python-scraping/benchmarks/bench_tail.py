@@ -0,0 +1,73 @@
+# bench_tail.py
+# ========================================
+# 一部の応答だけが極端に遅いサーバーで、取得ポリシーごとの p99 と巡回時間を比べる
+# ========================================
+# 実行例：
+#   python python-scraping/benchmarks/bench_tail.py
+#   python python-scraping/benchmarks/bench_tail.py --slow-ratio 0.05 --slow-latency 2
+#
+# ポリシー	内容
+# なし	タイムアウト長め・ヘッジなし（これまでと同じ動き）
+# タイムアウト	受信タイムアウトを短くして、遅い応答は打ち切ってバックオフ後に再送
+# ヘッジ	p95 を過ぎても返ってこなければ、2本目を送って速い方を使う
+#
+# 💡 遅い応答は slow_ratio の割合でランダムに発生するので、再送・2本目はたいてい速く返ってきます。
+
+import argparse
+import functools
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.async_crawler import crawl, fetch_html  # noqa: E402
+from scraping_common.client import FetchClient  # noqa: E402
+from scraping_common.fixture_server import CatalogueServer  # noqa: E402
+from scraping_common.policy import FetchPolicy  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="取得ポリシーごとの p99 を比較")
+    parser.add_argument("--pages", type=int, default=20, help="一覧ページ数（1ページ20冊）")
+    parser.add_argument("--latency", type=float, default=0.02, help="通常の応答時間（秒）")
+    parser.add_argument("--slow-ratio", type=float, default=0.02, help="遅い応答の割合")
+    parser.add_argument("--slow-latency", type=float, default=1.0, help="遅い応答の追加待ち（秒）")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    read_timeout = args.latency * 10
+    policies = [
+        ("なし", FetchPolicy(retries=0)),
+        ("タイムアウト", FetchPolicy(read_timeout=read_timeout, backoff_base=args.latency)),
+        ("ヘッジ", FetchPolicy(hedge=True)),
+    ]
+    print(
+        f"▶ カタログ: {args.pages} ページ / 通常 {args.latency * 1000:.0f} ms・"
+        f"{args.slow_ratio:.0%} だけ +{args.slow_latency * 1000:.0f} ms"
+    )
+    print(
+        f"{'ポリシー':<8} {'秒':>7} {'p50ms':>7} {'p99ms':>8} {'送信数':>6}"
+        f" {'タイムアウト':>6} {'再試行':>6} {'ヘッジ':>6} {'ヘッジ勝ち':>6}"
+    )
+    for label, policy in policies:
+        # 毎回同じ乱数の並び（＝同じページが遅くなる）になるよう、サーバーを作り直す
+        with CatalogueServer(
+            pages=args.pages,
+            latency=args.latency,
+            slow_ratio=args.slow_ratio,
+            slow_latency=args.slow_latency,
+        ) as server, FetchClient(pool_size=args.concurrency, policy=policy) as client:
+            result = crawl(
+                server.base_url,
+                concurrency=args.concurrency,
+                fetch=functools.partial(fetch_html, use_cache=False, client=client),
+            )
+            stats = client.stats()
+        print(
+            f"{label:<8} {result.elapsed:>7.2f} {stats['p50_ms']:>7.1f} {stats['p99_ms']:>8.1f}"
+            f" {server.requests_served:>6} {stats['timeouts']:>6} {stats['retries']:>6}"
+            f" {stats['hedges']:>6} {stats['hedge_wins']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# record_fixtures.py
+# ========================================
+# ベンチマーク用に、本物のページのHTMLを「録画」して benchmarks/fixtures/ に保存する
+# ========================================
+# 実行例：
+#   python python-scraping/benchmarks/record_fixtures.py
+#   python python-scraping/benchmarks/record_fixtures.py --url http://127.0.0.1:8000/ --details 3
+#
+# 保存するページ
+# fixtures/index.html	一覧ページ1（トップページ）
+# fixtures/catalogue/page-2.html	一覧ページ2
+# fixtures/catalogue/<slug>/index.html	一覧ページ1に載っている書籍の詳細ページ（--details 件）
+#
+# 💡 サーバーが返したバイト列をそのまま保存します（デコードし直さないので文字コードもそのまま）。
+#    run_suite.py はこのファイルをローカルサーバーから配信し、オフラインで計測します。
+
+import argparse
+import sys
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.extract import extract_listing  # noqa: E402
+from scraping_common.fetch import fetch  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+def record(base_url: str, url: str, out_dir: Path) -> bytes:
+    """url を取得し、base_url からの相対パスで out_dir に保存する。"""
+    page = fetch(url, use_cache=False)
+    page.raise_for_status()
+    relative = urlparse(url).path[len(urlparse(base_url).path) :] or "index.html"
+    path = out_dir / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(page.content)
+    print(f"  {relative:<60} {len(page.content):>8,} bytes")
+    return page.content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ベンチマーク用のHTMLを録画する")
+    parser.add_argument("--url", default="https://books.toscrape.com/", help="録画するサイトのトップURL")
+    parser.add_argument("--out", type=Path, default=FIXTURES_DIR, help="保存先フォルダ")
+    parser.add_argument("--details", type=int, default=2, help="保存する詳細ページの数")
+    args = parser.parse_args()
+
+    base_url = args.url if args.url.endswith("/") else args.url + "/"
+    print(f"▶ 録画: {base_url} → {args.out}")
+    index = record(base_url, base_url, args.out)
+    record(base_url, urljoin(base_url, "catalogue/page-2.html"), args.out)
+    _, hrefs, _ = extract_listing(index.decode("utf-8", errors="replace"))
+    for href in hrefs[: args.details]:
+        record(base_url, urljoin(base_url, href), args.out)
+
+
+if __name__ == "__main__":
+    main()
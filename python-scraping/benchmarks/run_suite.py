@@ -0,0 +1,242 @@
+# run_suite.py
+# ========================================
+# scraping_01〜03 をオフラインで通しで計測し、結果をJSONに保存するベンチマークスイート
+# ========================================
+# 実行例：
+#   python python-scraping/benchmarks/run_suite.py
+#   python python-scraping/benchmarks/run_suite.py --repeat 3 --output results/2024-06-01.json
+#
+# 計測の流れ
+# 1. ローカルサーバーを2つ起動する
+#    録画済み	benchmarks/fixtures/ のHTML（record_fixtures.py で保存したもの）を配信
+#    練習用カタログ	一覧50ページ × 20冊 ＝ 1000冊（詳細ページ込みで 1050 ページ）を配信
+# 2. 各ステップのスクリプトを子プロセスで実行（取得先は環境変数 BOOKS_TO_SCRAPE_URL で差し替え）
+# 3. 抽出バックエンドごとの解析速度（ms/page）を、録画済みHTMLと練習用カタログの両方で計測
+#
+# 出力するJSON（回帰の確認用に、実行ごとに保存して比べる）
+# meta	Python / OS / CPU数 / git のコミット / 計測時刻
+# steps	ステップごとの 秒・pages/sec・ピーク割り当てバイト・最大RSS・出力ファイルサイズ
+# parse	バックエンドごとの ms/page・1ページ解析中のピークKB
+#
+# 💡 キャッシュ（SCRAPING_CACHE_DIR）と作業フォルダ（output/）は実行ごとに空のフォルダを使うので、
+#    毎回「初めて実行したとき」と同じ条件で計測されます。
+# 💡 割り当てバイト（tracemalloc）は計測そのものが処理を遅くするため、時間とは別の実行で測ります。
+
+import argparse
+import json
+import os
+import platform
+import resource
+import runpy
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_extract import measure  # noqa: E402
+from record_fixtures import FIXTURES_DIR  # noqa: E402
+from scraping_common.extract import BACKENDS, extract_detail, extract_listing, lxml  # noqa: E402
+from scraping_common.fixture_server import Catalogue, CatalogueServer, load_fixtures  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (名前, スクリプト, 引数, 配信元) ― 配信元 "recorded" は録画済み、"synthetic" は練習用カタログ
+STEPS = [
+    ("scraping_01", "step01_get_html/scraping_01_get_html.py", [], "recorded"),
+    ("scraping_02", "step02_parse_html/scraping_02_parse_basic.py", [], "recorded"),
+    ("scraping_03", "step03_to_excel/scraping_03_to_excel.py", [], "recorded"),
+    ("scraping_03_crawl", "step03_to_excel/scraping_03_to_excel.py", ["--crawl"], "synthetic"),
+]
+
+
+# ---- 子プロセス側：スクリプトを1回実行して計測値をファイルに書く ----
+def run_child(script: str, script_args: list[str], result_path: str, trace: bool) -> None:
+    sys.argv = [script, *script_args]
+    if trace:
+        tracemalloc.start()
+    started = time.perf_counter()
+    runpy.run_path(script, run_name="__main__")
+    elapsed = time.perf_counter() - started
+    result = {
+        "seconds": elapsed,
+        # Linux は KB、macOS はバイト単位で返る
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        // (1024 if sys.platform == "darwin" else 1),
+    }
+    if trace:
+        result["alloc_peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    Path(result_path).write_text(json.dumps(result))
+
+
+# ---- 親プロセス側 ----
+def run_step(script: Path, script_args: list[str], base_url: str, trace: bool) -> dict:
+    """空のキャッシュ・空の作業フォルダでスクリプトを子プロセス実行し、計測値を返す。"""
+    with tempfile.TemporaryDirectory() as work:
+        env = dict(
+            os.environ,
+            BOOKS_TO_SCRAPE_URL=base_url,
+            SCRAPING_CACHE_DIR=os.path.join(work, "cache"),
+        )
+        result_path = os.path.join(work, "result.json")
+        command = [sys.executable, __file__, "--child", "--result", result_path]
+        if trace:
+            command.append("--trace")
+        started = time.perf_counter()
+        subprocess.run(
+            [*command, str(script), *script_args],
+            cwd=work,
+            env=env,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        result = json.loads(Path(result_path).read_text())
+        result["wall_seconds"] = time.perf_counter() - started  # Python起動を含む
+        excel = Path(work, "output", "books_data.xlsx")
+        if excel.exists():
+            result["xlsx_bytes"] = excel.stat().st_size
+        return result
+
+
+def bench_steps(servers: dict, repeat: int) -> list[dict]:
+    rows = []
+    for name, script, script_args, source in STEPS:
+        server = servers[source]
+        runs = []
+        for _ in range(repeat):
+            before = server.requests_served
+            run = run_step(ROOT / script, script_args, server.base_url, trace=False)
+            run["requests"] = server.requests_served - before
+            runs.append(run)
+        best = min(runs, key=lambda r: r["seconds"])  # いちばん速かった回（ノイズが少ない）
+        traced = run_step(ROOT / script, script_args, server.base_url, trace=True)
+        rows.append(
+            {
+                "step": name,
+                "args": script_args,
+                "source": source,
+                "seconds": round(best["seconds"], 4),
+                "wall_seconds": round(best["wall_seconds"], 4),
+                "runs": [round(r["seconds"], 4) for r in runs],
+                "requests": best["requests"],
+                "pages_per_sec": round(best["requests"] / best["seconds"], 1),
+                "alloc_peak_bytes": traced["alloc_peak_bytes"],
+                "max_rss_kb": best["max_rss_kb"],
+                "xlsx_bytes": best.get("xlsx_bytes"),
+            }
+        )
+        print(
+            f"{name:<18} {best['seconds']:>8.3f} {rows[-1]['pages_per_sec']:>10.1f}"
+            f" {traced['alloc_peak_bytes'] / 1024:>12,.0f} {best['max_rss_kb']:>10,}"
+        )
+    return rows
+
+
+def bench_parse(recorded: dict[str, bytes], catalogue: Catalogue) -> list[dict]:
+    recorded_html = {path: body.decode("utf-8", errors="replace") for path, body in recorded.items()}
+    corpora = [
+        ("recorded", "listing", [h for p, h in recorded_html.items() if _is_listing(p)]),
+        ("recorded", "detail", [h for p, h in recorded_html.items() if not _is_listing(p)]),
+        (
+            "synthetic",
+            "listing",
+            [catalogue.render_listing(n) for n in range(1, catalogue.pages + 1)],
+        ),
+        ("synthetic", "detail", [catalogue.render_detail(b) for b in catalogue.books[:100]]),
+    ]
+    backends = [b for b in BACKENDS if b != "lxml" or lxml is not None]
+    rows = []
+    for source, kind, pages in corpora:
+        if not pages:
+            continue
+        extract = extract_listing if kind == "listing" else extract_detail
+        for backend in backends:
+            ms, peak_kb, _ = measure(lambda html: extract(html, backend), pages)
+            rows.append(
+                {
+                    "source": source,
+                    "kind": kind,
+                    "backend": backend,
+                    "pages": len(pages),
+                    "ms_per_page": round(ms, 3),
+                    "peak_kb": round(peak_kb, 1),
+                }
+            )
+            print(f"{source:<10} {kind:<8} {backend:<9} {len(pages):>6} {ms:>9.2f} {peak_kb:>9.0f}")
+    return rows
+
+
+def _is_listing(path: str) -> bool:
+    return path == "/index.html" or path.startswith("/catalogue/page-")
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="scraping_01〜03 のオフライン・ベンチマーク")
+    parser.add_argument("--pages", type=int, default=50, help="練習用カタログの一覧ページ数（1ページ20冊）")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="録画済みHTMLのフォルダ")
+    parser.add_argument("--repeat", type=int, default=1, help="各ステップの実行回数（最速の回を採用）")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"), help="結果のJSON")
+    # 以下は子プロセス用（直接指定しない）
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("script", nargs="?", help=argparse.SUPPRESS)
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.script, args.script_args, args.result, args.trace)
+        return
+
+    catalogue = Catalogue(pages=args.pages)
+    with CatalogueServer(fixtures_dir=args.fixtures) as recorded, CatalogueServer(
+        catalogue=catalogue
+    ) as synthetic:
+        print(f"▶ 録画済み: {len(recorded.recorded)} ファイル / 練習用カタログ: {len(catalogue.books)} 冊")
+        print(f"{'ステップ':<18} {'秒':>8} {'pages/sec':>10} {'ピーク割当KB':>12} {'最大RSS KB':>10}")
+        steps = bench_steps({"recorded": recorded, "synthetic": synthetic}, args.repeat)
+        print()
+        print(f"{'HTML':<10} {'ページ':<8} {'抽出':<9} {'件数':>6} {'ms/page':>9} {'ピークKB':>9}")
+        parse = bench_parse(load_fixtures(args.fixtures), catalogue)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "lxml": lxml is not None,
+        },
+        "catalogue": {
+            "listing_pages": catalogue.pages,
+            "books": len(catalogue.books),
+            "recorded_files": sorted(recorded.recorded),
+        },
+        "steps": steps,
+        "parse": parse,
+    }
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\n✅ 結果を保存しました: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
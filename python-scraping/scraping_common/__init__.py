@@ -0,0 +1,16 @@
+# scraping_common
+# step01〜step03 のスクリプトから共通で使う部品をまとめたパッケージ。
+#
+# モジュール	役割
+# fixture_server	books.toscrape.com と同じHTML構造のページを返すローカルサーバー（オフライン計測用）
+# async_crawler	asyncio で一覧ページ・詳細ページを並行して巡回するクローラー
+# http_cache	取得したHTMLをディスクに保存するキャッシュ（ETag / Last-Modified で再検証）
+# fetch	各スクリプト共通の「HTML取得」の入口（requests.get の代わりに使う）
+# client	接続を使い回す requests.Session ＋ レート制限 ＋ 応答時間の統計
+# policy	タイムアウト（接続・受信）・バックオフ付き再試行・ヘッジ（p95 を過ぎたら2本目を送る）の設定
+# rate_limit	ホストごとのトークンバケット（アクセス頻度の上限）
+# extract	必要なタグだけを解析する抽出エンジン（soup / strainer / css / lxml）
+# pipeline	取得（asyncio）と解析（プロセスプール）を上限付きキューでつないだ2段パイプライン
+# state_store	差分クロール用の SQLite ストア（URL・内容ハッシュ・取得時刻・抽出済みレコード）
+# normalize	価格の文字列を「通貨（category）」と「価格（float）」に一括変換
+# excel_stream	書籍レコードを1行ずつ .xlsx に追記する書き込み専用ライター（1,048,576行でシートを切り替え）
@@ -0,0 +1,191 @@
+# async_crawler.py
+# ========================================
+# asyncio でカタログ全体（一覧50ページ＋詳細約1000ページ）を並行巡回するクローラー
+# ========================================
+# requests.get() を1件ずつ順番に呼ぶと、通信待ちの時間がそのまま積み上がります。
+# ここでは「同時に最大 concurrency 件まで」リクエストを飛ばして待ち時間を重ねます。
+#
+# 💡 流れ
+# 1. 1ページ目を取得し「Page 1 of 50」から総ページ数を読む
+# 2. 残りの一覧ページをまとめて並行取得（"next" リンクを1つずつ辿るより速い）
+# 3. 各一覧ページの書籍リンク（詳細ページ）も見つけ次第、並行取得
+# 4. 結果は一覧ページ順・掲載順にそろえて返す（Excelの並びが毎回同じになる）
+#
+# 💡 state（CrawlState）を渡すと差分クロールになります。
+#    HTMLの sha256 が前回と同じページは解析せず、保存済みのレコードを使います。
+# 💡 on_records を渡すと、レコードを result.records に溜めずに、一覧ページ順にそろい次第
+#    on_records(records) へ渡します（Excelへのストリーミング出力用。メモリが件数に比例しない）。
+
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+from urllib.parse import urljoin
+
+from .client import FetchClient
+from .extract import DEFAULT_BACKEND, extract_detail, extract_listing, total_pages
+from .fetch import fetch as fetch_page
+from .http_cache import HttpCache
+from .state_store import CrawlState, content_hash
+
+
+def fetch_html(
+    url: str,
+    use_cache: bool = True,
+    cache: HttpCache | None = None,
+    client: FetchClient | None = None,
+) -> str:
+    """1ページ分のHTMLを取得する（スレッド内で呼ばれる同期関数）。
+
+    共通の fetch() 経由なので、2回目以降の巡回はディスクキャッシュが効きます。
+    """
+    page = fetch_page(url, use_cache=use_cache, cache=cache, client=client)
+    page.raise_for_status()
+    return page.text
+
+
+@dataclass
+class CrawlResult:
+    records: list[dict] = field(default_factory=list)  # {"書籍タイトル": ..., "価格": ...}
+    pages: int = 0  # 取得したページ数（一覧＋詳細）
+    bytes: int = 0  # 取得したHTMLの文字数合計
+    elapsed: float = 0.0  # 所要時間（秒）
+    changed: int = 0  # 差分クロール時：新規・変更・削除があったページ数
+    skipped: int = 0  # 差分クロール時：内容が同じで解析を省略したページ数
+    emitted: int = 0  # on_records に渡したレコード数
+
+    @property
+    def pages_per_sec(self) -> float:
+        return self.pages / self.elapsed if self.elapsed else 0.0
+
+
+# ---- HTML解析（一覧ページ・詳細ページ） ----
+def parse_listing(
+    url: str, html: str, parser: str = DEFAULT_BACKEND
+) -> tuple[list[dict], list[str], int | None]:
+    """一覧ページから (書籍レコード, 詳細ページURL, 総ページ数) を取り出す。"""
+    records, hrefs, pages_total = extract_listing(html, parser)
+    return records, [urljoin(url, href) for href in hrefs], pages_total
+
+
+def parse_detail(html: str, parser: str = DEFAULT_BACKEND) -> dict:
+    """詳細ページから正式タイトル（省略なし）と価格を取り出す。"""
+    return extract_detail(html, parser)
+
+
+def listing_url(start_url: str, page: int) -> str:
+    """N ページ目の一覧URL（books.toscrape.com と同じ命名）。"""
+    return urljoin(start_url, f"catalogue/page-{page}.html")
+
+
+# ---- クローラー本体 ----
+async def crawl_catalogue(
+    start_url: str = "https://books.toscrape.com/",
+    concurrency: int = 10,
+    follow_details: bool = True,
+    max_pages: int | None = None,
+    fetch: Callable[[str], str] = fetch_html,
+    parser: str = DEFAULT_BACKEND,
+    state: CrawlState | None = None,
+    on_records: Callable[[list[dict]], None] | None = None,
+) -> CrawlResult:
+    """カタログを並行巡回して CrawlResult を返す。
+
+    concurrency	同時に送るリクエストの上限（サーバーに優しく、でも速く）
+    follow_details	True なら詳細ページまで取得し、省略なしのタイトルを使う
+    max_pages	一覧ページの上限（None なら全ページ）
+    fetch	URL → HTML の同期関数（差し替え可能）
+    parser	HTML抽出のバックエンド（extract.py の BACKENDS から選択）
+    state	差分クロール用の状態ストア（None なら毎回すべて解析）
+    on_records	レコードを受け取る関数（指定すると result.records には溜めない）
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    result = CrawlResult()
+    started = time.perf_counter()
+
+    def listing_rows(url: str, html: str) -> tuple[list[dict], list[str]]:
+        if state is None:
+            records, detail_urls, _ = parse_listing(url, html, parser)
+            return records, detail_urls
+        digest = content_hash(html)
+        hit = state.lookup(url, digest)  # 前回と同じ内容なら解析しない
+        if hit is not None:
+            return hit
+        records, detail_urls, _ = parse_listing(url, html, parser)
+        state.save(url, digest, records, detail_urls)
+        return records, detail_urls
+
+    def detail_row(url: str, html: str) -> dict:
+        if state is None:
+            return parse_detail(html, parser)
+        digest = content_hash(html)
+        hit = state.lookup(url, digest)
+        if hit is not None:
+            return hit[0][0]
+        row = parse_detail(html, parser)
+        state.save(url, digest, [row])
+        return row
+
+    finished: dict[int, list[dict]] = {}  # 先に終わった一覧ページ（番号 → レコード）
+    next_page = 1
+
+    def emit(page: int, records: list[dict]) -> list[dict]:
+        """1ページ目から順に、そろった分だけ on_records に渡す。"""
+        nonlocal next_page
+        if on_records is None:
+            return records
+        finished[page] = records
+        while next_page in finished:
+            ready = finished.pop(next_page)
+            on_records(ready)
+            result.emitted += len(ready)
+            next_page += 1
+        return []
+
+    # requests は同期ライブラリなので、専用のスレッドプールで動かして await する
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+
+        async def get(url: str) -> str:
+            async with semaphore:  # 同時実行数をここで制限
+                html = await loop.run_in_executor(executor, fetch, url)
+            result.pages += 1
+            result.bytes += len(html)
+            return html
+
+        async def crawl_page(page: int, url: str, html: str | None = None) -> list[dict]:
+            if html is None:
+                html = await get(url)
+            records, detail_urls = listing_rows(url, html)
+            if follow_details:
+                details = await asyncio.gather(*(get(u) for u in detail_urls))
+                records = [detail_row(u, h) for u, h in zip(detail_urls, details)]
+            return emit(page, records)
+
+        # ① 1ページ目から総ページ数を知る
+        first_html = await get(start_url)
+        pages_total = total_pages(first_html) or 1
+        if max_pages:
+            pages_total = min(pages_total, max_pages)
+
+        # ② 全一覧ページ（＋その詳細ページ）を並行取得。gather は渡した順で結果を返す
+        pages = await asyncio.gather(
+            crawl_page(1, start_url, first_html),
+            *(crawl_page(n, listing_url(start_url, n)) for n in range(2, pages_total + 1)),
+        )
+
+    for records in pages:
+        result.records.extend(records)
+    if state is not None:
+        result.changed = state.finish()
+        result.skipped = state.skipped
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def crawl(start_url: str = "https://books.toscrape.com/", **kwargs) -> CrawlResult:
+    """同期コードから呼ぶための入口（asyncio.run でラップ）。"""
+    return asyncio.run(crawl_catalogue(start_url, **kwargs))
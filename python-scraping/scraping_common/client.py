@@ -0,0 +1,203 @@
+# client.py
+# ========================================
+# 接続を使い回す（Keep-Alive）HTTPクライアント
+# ========================================
+# requests.get() を毎回呼ぶと、そのたびに TCP接続（httpsならTLSの握手も）を作り直します。
+# requests.Session を使うと、一度つないだ接続をプールに残して次のリクエストで再利用できます。
+#
+# FetchClient がやること
+# 1. Session ＋ HTTPAdapter で接続プール（同時に保持する接続数 = pool_size）を用意
+# 2. HostRateLimiter でホストごとのリクエスト頻度を制限
+# 3. FetchPolicy に従って、タイムアウト・再試行（バックオフ）・ヘッジを行う
+# 4. 接続の再利用率・応答時間（p50/p90/p99）・タイムアウト等の回数を記録して stats() で確認できるようにする
+
+from __future__ import annotations
+
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .policy import RETRY_STATUSES, FetchPolicy
+from .rate_limit import HostRateLimiter
+
+USER_AGENT = "python-freelance-scraping/1.0 (+learning project)"
+LATENCY_WINDOW = 10_000  # stats() のパーセンタイルに使う、直近の get() の数（長いクロールでもメモリが増えない）
+
+
+class FetchClient:
+    """接続プール付きのHTTPクライアント。
+
+    pool_size	ホストごとに保持する接続数（並行クローラーの同時数以上にしておく）
+    rate	ホストごとの上限（回/秒）。None なら制限なし
+    burst	トークンバケットに貯められる最大数（短時間のまとめ撃ちを何回まで許すか）
+    policy	タイムアウト・再試行・ヘッジの設定（None なら FetchPolicy() の既定値）
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        rate: float | None = None,
+        burst: int = 1,
+        per_host: dict | None = None,
+        policy: FetchPolicy | None = None,
+    ):
+        self.policy = policy or FetchPolicy()
+        self.limiter = HostRateLimiter(rate, burst, per_host)
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        # ヘッジの2本目が1本目の接続の空きを待たないよう、ヘッジ時はプールを倍にしておく
+        maxsize = pool_size * 2 if self.policy.hedge else pool_size
+        # pool_block=True：プールが満杯なら新しい接続を作らず、空くのを待つ（接続数を増やしすぎない）
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=maxsize, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._adapters = [adapter]
+        self._hedger = ThreadPoolExecutor(max_workers=maxsize) if self.policy.hedge else None
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)  # 直近の get() 1回ごと（再試行・ヘッジ込み）の応答時間
+        self._samples: deque[float] = deque(maxlen=200)  # 送信1本ごとの応答時間（ヘッジの基準）
+        self._throttled = 0.0  # レート制限で待った合計秒数
+        self.counters = {"timeouts": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "failures": 0}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, headers: dict | None = None, timeout=None) -> requests.Response:
+        """GETリクエストを送る（失敗したらバックオフして再試行）。"""
+        policy = self.policy
+        timeout = timeout or policy.timeout
+        started = time.perf_counter()
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = self._send(url, headers, timeout)
+            except (requests.Timeout, requests.ConnectionError):
+                if attempt >= policy.retries:
+                    self._count("failures")
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= policy.retries:
+                    with self._lock:
+                        self._latencies.append(time.perf_counter() - started)
+                    return response
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+            self._count("retries")
+            time.sleep(policy.backoff(attempt, retry_after))
+            attempt += 1
+
+    def _send(self, url: str, headers: dict | None, timeout) -> requests.Response:
+        """1回分の送信。応答が p95 より遅ければ、同じリクエストをもう1本送って速い方を使う。"""
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._attempt(url, headers, timeout)
+
+        primary = self._hedger.submit(self._attempt, url, headers, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        self._count("hedges")
+        backup = self._hedger.submit(self._attempt, url, headers, timeout)
+        pending = {primary, backup}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    if future is backup:
+                        self._count("hedge_wins")
+                    for loser in pending:  # 遅れて届いた方は読み捨てる
+                        loser.add_done_callback(_close_response)
+                    return future.result()
+        return primary.result()  # 両方失敗 → 1本目の例外をそのまま投げる
+
+    def _attempt(self, url: str, headers: dict | None, timeout) -> requests.Response:
+        """送信1本（レート制限 → 送信 → 応答時間を記録）。"""
+        waited = self.limiter.acquire(url)
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, headers=headers, timeout=timeout)
+        except requests.Timeout:
+            self._count("timeouts")
+            raise
+        finally:
+            with self._lock:
+                self._throttled += waited
+        with self._lock:
+            self._samples.append(time.perf_counter() - started)
+        return response
+
+    def hedge_delay(self) -> float | None:
+        """2本目を送るまでの待ち時間（秒）。ヘッジしないなら None。"""
+        policy = self.policy
+        if not policy.hedge:
+            return None
+        if policy.hedge_delay is not None:
+            return policy.hedge_delay
+        with self._lock:
+            samples = list(self._samples)
+        if len(samples) < policy.hedge_min_samples:
+            return None
+        q = statistics.quantiles(samples, n=100, method="inclusive")
+        return q[round(policy.hedge_quantile * 100) - 1]
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.counters[name] += 1
+
+    # ---- 統計 ----
+    def connection_counts(self) -> tuple[int, int]:
+        """(作った接続数, 送ったリクエスト数) を接続プールから集計する。"""
+        new_connections = requests_sent = 0
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                new_connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return new_connections, requests_sent
+
+    def stats(self) -> dict:
+        """接続の再利用率・応答時間のパーセンタイル（ミリ秒。直近 LATENCY_WINDOW 回分）・タイムアウト等の回数を返す。"""
+        new_connections, requests_sent = self.connection_counts()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            throttled = self._throttled
+            counters = dict(self.counters)
+        result = {
+            "requests": requests_sent,
+            "new_connections": new_connections,
+            # 1 - (接続数 / リクエスト数)：1.0 に近いほど接続を使い回せている
+            "reuse_ratio": 1 - new_connections / requests_sent if requests_sent else 0.0,
+            "throttled_sec": round(throttled, 3),
+            **counters,
+        }
+        if len(latencies) >= 2:
+            q = statistics.quantiles(latencies, n=100, method="inclusive")
+            result.update(
+                p50_ms=round(q[49] * 1000, 1),
+                p90_ms=round(q[89] * 1000, 1),
+                p99_ms=round(q[98] * 1000, 1),
+            )
+        return result
+
+    def close(self) -> None:
+        if self._hedger is not None:
+            self._hedger.shutdown(wait=False)
+        self.session.close()
+
+    def __enter__(self) -> "FetchClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _close_response(future) -> None:
+    if future.exception() is None:
+        future.result().close()
@@ -0,0 +1,128 @@
+# excel_stream.py
+# ========================================
+# 解析したそばから1行ずつExcelに書き出す「ストリーミング出力」
+# ========================================
+# df.to_excel() は、全件をリスト → DataFrame → openpyxl のセルオブジェクト、と
+# メモリ上に組み立ててから保存します。件数が増えるほどメモリも比例して増えます。
+#
+# ここでは書き込み専用モードのブックに、レコードが届くたびに1行ずつ追記します。
+#
+# エンジン	仕組み
+# openpyxl	Workbook(write_only=True)：シートの行を一時ファイルに流し込み、保存時にzipへまとめる
+# xlsxwriter	constant_memory：行を書いたら次の行へ進むたびに一時ファイルへ書き出す
+#
+# 💡 どちらも「書いた行はメモリに残らない」ので、1000冊でも100万冊でもメモリはほぼ一定です。
+#    その代わり、一度書いた行を後から書き換えることはできません（上から順に書くだけ）。
+# 💡 1シートの上限は 1,048,576 行（見出し行を含む）。超える分は「Sheet1_2」「Sheet1_3」… に続けます。
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .normalize import normalize_record
+
+EXCEL_MAX_ROWS = 1_048_576  # Excel 1シートの最大行数
+ENGINES = ("openpyxl", "xlsxwriter")
+BOOK_COLUMNS = ("書籍タイトル", "価格", "通貨")
+
+
+class StreamingBookWriter:
+    """書籍レコードを1件ずつ .xlsx に追記するライター。
+
+    with StreamingBookWriter("output/books_data.xlsx") as writer:
+        writer.write_many(records)  # 何度呼んでもよい（呼んだ順に追記される）
+
+    💡 書き込み中は「<ファイル名>.part」に書き、close() で本来の名前に置き換えます。
+       途中で失敗しても、前回の books_data.xlsx が壊れた状態で残ることはありません。
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        columns: Iterable[str] = BOOK_COLUMNS,
+        engine: str = "openpyxl",
+        sheet_name: str = "Sheet1",
+        max_rows: int = EXCEL_MAX_ROWS,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"未対応のエンジンです: {engine}（{', '.join(ENGINES)} から選択）")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._part = self.path.with_name(self.path.name + ".part")
+        self.columns = list(columns)
+        self.engine = engine
+        self.sheet_name = sheet_name
+        self.max_rows = max_rows
+        self.rows = 0  # 書き込んだデータ行数（見出しを除く）
+        self.sheets = 0
+        self._sheet_rows = 0  # 今のシートに書いた行数（見出しを含む）
+
+        if engine == "openpyxl":
+            from openpyxl import Workbook
+
+            self._book = Workbook(write_only=True)
+        else:
+            import xlsxwriter
+
+            self._book = xlsxwriter.Workbook(str(self._part), {"constant_memory": True})
+        self._new_sheet()
+
+    def _new_sheet(self) -> None:
+        self.sheets += 1
+        title = self.sheet_name if self.sheets == 1 else f"{self.sheet_name}_{self.sheets}"
+        if self.engine == "openpyxl":
+            self._sheet = self._book.create_sheet(title)
+        else:
+            self._sheet = self._book.add_worksheet(title)
+        self._sheet_rows = 0
+        self._append(self.columns)  # どのシートにも見出し行を付ける
+
+    def _append(self, values: list) -> None:
+        if self.engine == "openpyxl":
+            self._sheet.append(values)
+        else:
+            self._sheet.write_row(self._sheet_rows, 0, values)
+        self._sheet_rows += 1
+
+    def write(self, record: dict) -> None:
+        """1件追記する（価格は normalize_record() で数値と通貨に分ける）。"""
+        if self._sheet_rows >= self.max_rows:  # シートが満杯 → 次のシートへ
+            self._new_sheet()
+        row = normalize_record(record)
+        self._append([row.get(column) for column in self.columns])
+        self.rows += 1
+
+    def write_many(self, records: Iterable[dict]) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        """保存して、書き込み中のファイルを本来の名前に置き換える。"""
+        if self._book is None:
+            return
+        self._save()
+        os.replace(self._part, self.path)
+
+    def discard(self) -> None:
+        """書き込みをやめて、書き込み中のファイルを消す（前回のファイルはそのまま）。"""
+        if self._book is not None:
+            self._save()  # 行の一時ファイルを片付けるため、いったん .part に保存してから消す
+        self._part.unlink(missing_ok=True)
+
+    def _save(self) -> None:
+        if self.engine == "openpyxl":
+            self._book.save(self._part)
+        else:
+            self._book.close()
+        self._book = None
+
+    def __enter__(self) -> "StreamingBookWriter":
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
@@ -0,0 +1,152 @@
+# extract.py
+# ========================================
+# 書籍タイトル・価格を「必要な部分だけ」解析して取り出す抽出エンジン
+# ========================================
+# BeautifulSoup(response.text, "html.parser") はページ全体（<head> や広告、ナビゲーションまで）を
+# ツリーに変換します。数千ページを処理すると、ここがいちばん重い処理になります。
+#
+# バックエンド	仕組み	特徴
+# soup	ページ全体をツリー化 → find_all("h3") と find_all("p", class_=...)	これまでの方法（比較用）
+# strainer	SoupStrainer で <article class="product_pod"> だけをツリー化	追加ライブラリ不要で速い
+# css	strainer と同じ小さなツリーに CSSセレクタ（select）で問い合わせ	セレクタで書ける
+# lxml	lxml（C言語実装）で解析し XPath で取り出す	いちばん速い（要 pip install lxml）
+#
+# 💡 どのバックエンドも、1冊ずつ <article> の中から「タイトルと価格をセットで」取り出します。
+#    （h3 と価格を別々に find_all して zip すると、片方が欠けたときに行がずれるため）
+
+from __future__ import annotations
+
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.html
+except ImportError:  # lxml は任意（入っていなければ lxml バックエンドだけ使えない）
+    lxml = None
+
+BACKENDS = ("soup", "strainer", "css", "lxml")
+# lxml が入っていればいちばん速い lxml、無ければ追加ライブラリ不要の strainer を使う
+DEFAULT_BACKEND = "lxml" if lxml is not None else "strainer"
+
+# パース前に「どのタグだけ残すか」を決めておくフィルター（使い回せるので1回だけ作る）
+# 💡 パース中の class 属性は "col-sm-6 product_main" という1つの文字列のままなので、
+#    class_="product_main" ではなく正規表現で「単語として含む」を指定する
+PRODUCT_POD = SoupStrainer("article", class_=re.compile(r"\bproduct_pod\b"))
+PRODUCT_MAIN = SoupStrainer("div", class_=re.compile(r"\bproduct_main\b"))
+
+TOTAL_PAGES = re.compile(r'class="current">\s*Page\s+\d+\s+of\s+(\d+)')
+
+
+def clean_price(text: str) -> str:
+    # 文字化け（Â£）は fetch() がデコードする時点で直しているので、ここでは前後の空白を除くだけ
+    return text.strip()
+
+
+# ---- 一覧ページ ----
+def extract_listing(html: str, backend: str = DEFAULT_BACKEND) -> tuple[list[dict], list[str], int | None]:
+    """一覧ページから (書籍レコード, 詳細ページへの相対リンク, 総ページ数) を取り出す。"""
+    if backend == "soup":
+        return _listing_soup(html)
+    if backend == "strainer":
+        return _listing_strainer(html)
+    if backend == "css":
+        return _listing_css(html)
+    if backend == "lxml":
+        return _listing_lxml(html)
+    raise ValueError(f"未対応のバックエンドです: {backend}（{', '.join(BACKENDS)} から選択）")
+
+
+def extract_books(html: str, backend: str = DEFAULT_BACKEND) -> list[dict]:
+    """一覧ページの書籍レコード {"書籍タイトル": ..., "価格": ...} だけを返す。"""
+    return extract_listing(html, backend)[0]
+
+
+def total_pages(html: str) -> int | None:
+    """一覧ページの「Page 1 of 50」から総ページ数を返す。"""
+    # 「Page 1 of 50」はページ末尾に1か所だけなので、ツリーを作らず正規表現で拾う
+    m = TOTAL_PAGES.search(html)
+    return int(m.group(1)) if m else None
+
+
+def _listing_soup(html):
+    soup = BeautifulSoup(html, "html.parser")
+    titles = [h3.get_text() for h3 in soup.find_all("h3")]
+    prices = [clean_price(p.get_text()) for p in soup.find_all("p", class_="price_color")]
+    hrefs = [h3.a["href"] for h3 in soup.find_all("h3")]
+    records = [{"書籍タイトル": t, "価格": p} for t, p in zip(titles, prices)]
+    return records, hrefs, total_pages(html)
+
+
+def _listing_strainer(html):
+    soup = BeautifulSoup(html, "html.parser", parse_only=PRODUCT_POD)
+    records, hrefs = [], []
+    for pod in soup.find_all("article"):
+        link = pod.h3.a
+        price = pod.find("p", class_="price_color")
+        records.append(
+            {"書籍タイトル": link.get_text(), "価格": clean_price(price.get_text()) if price else ""}
+        )
+        hrefs.append(link["href"])
+    return records, hrefs, total_pages(html)
+
+
+def _listing_css(html):
+    soup = BeautifulSoup(html, "html.parser", parse_only=PRODUCT_POD)
+    records, hrefs = [], []
+    for pod in soup.select("article.product_pod"):
+        link = pod.select_one("h3 > a")
+        price = pod.select_one("p.price_color")
+        records.append(
+            {"書籍タイトル": link.get_text(), "価格": clean_price(price.get_text()) if price else ""}
+        )
+        hrefs.append(link["href"])
+    return records, hrefs, total_pages(html)
+
+
+def _require_lxml():
+    if lxml is None:
+        raise RuntimeError("lxml バックエンドには lxml が必要です（pip install lxml）")
+
+
+def _listing_lxml(html):
+    _require_lxml()
+    doc = lxml.html.fromstring(html)
+    records, hrefs = [], []
+    for pod in doc.xpath('//article[contains(concat(" ", @class, " "), " product_pod ")]'):
+        link = pod.find(".//h3/a")
+        price = pod.xpath('.//p[contains(concat(" ", @class, " "), " price_color ")]')
+        records.append(
+            {
+                "書籍タイトル": link.text_content(),
+                "価格": clean_price(price[0].text_content()) if price else "",
+            }
+        )
+        hrefs.append(link.get("href"))
+    return records, hrefs, total_pages(html)
+
+
+# ---- 詳細ページ ----
+def extract_detail(html: str, backend: str = DEFAULT_BACKEND) -> dict:
+    """詳細ページから正式タイトル（省略なし）と価格を取り出す。"""
+    if backend == "lxml":
+        _require_lxml()
+        doc = lxml.html.fromstring(html)
+        main = doc.xpath('//div[contains(concat(" ", @class, " "), " product_main ")]')[0]
+        price = main.xpath('.//p[contains(concat(" ", @class, " "), " price_color ")]')
+        return {
+            "書籍タイトル": main.find(".//h1").text_content(),
+            "価格": clean_price(price[0].text_content()) if price else "",
+        }
+    if backend not in BACKENDS:
+        raise ValueError(f"未対応のバックエンドです: {backend}（{', '.join(BACKENDS)} から選択）")
+
+    if backend == "soup":
+        main = BeautifulSoup(html, "html.parser").find("div", class_="product_main")
+    else:
+        main = BeautifulSoup(html, "html.parser", parse_only=PRODUCT_MAIN)
+    price = main.find("p", class_="price_color")
+    return {
+        "書籍タイトル": main.find("h1").get_text(),
+        "価格": clean_price(price.get_text()) if price else "",
+    }
@@ -0,0 +1,152 @@
+# fetch.py
+# ========================================
+# step01〜step03 共通の「HTML取得」の入口
+# ========================================
+# 各スクリプトは requests.get(url) の代わりに fetch(url) を呼びます。
+# 戻り値の Page は response と同じく .status_code / .text / .content を持つので、
+# 呼び出し側のコードはほとんど変わりません。
+#
+# 💡 fetch() の中でやっていること
+# 1. キャッシュにあり、TTL 以内 → 通信せずに返す
+# 2. キャッシュにあるが TTL 切れ → ETag / Last-Modified を付けて問い合わせ
+#    304 なら保存済みのHTMLを返す（本文のダウンロードなし）
+# 3. キャッシュに無い → 普通に取得して保存
+# 通信そのものは FetchClient（接続プール＋レート制限）が担当します。
+
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import dataclass, field
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from .client import FetchClient
+from .http_cache import HttpCache
+
+
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.I)
+
+
+def detect_encoding(content_type: str, content: bytes) -> str:
+    """HTMLの文字コードを決める（ヘッダの charset → <meta> の charset → UTF-8 の順）。
+
+    💡 books.toscrape.com は Content-Type に charset を付けていません。
+       requests はその場合 ISO-8859-1 と見なすので、UTF-8 の「£」(C2 A3) が「Â£」に化けます。
+       HTML側の <meta charset="UTF-8"> を見て、デコードの時点で正しく直します。
+    """
+    m = re.search(r"charset=([\w-]+)", content_type, re.I)
+    if m:
+        return m.group(1)
+    m = META_CHARSET.search(content[:2048])  # <meta> は <head> の先頭付近にある
+    if m:
+        return m.group(1).decode("ascii")
+    return "utf-8"
+
+
+@dataclass
+class Page:
+    url: str
+    status_code: int
+    content: bytes
+    headers: CaseInsensitiveDict = field(default_factory=CaseInsensitiveDict)
+    from_cache: bool = False  # キャッシュから返したか（通信なし or 304）
+    revalidated: bool = False  # 条件付きリクエストで 304 を受け取ったか
+
+    @property
+    def encoding(self) -> str:
+        return detect_encoding(self.headers.get("Content-Type", ""), self.content)
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+_default_cache: HttpCache | None = None
+_default_client: FetchClient | None = None
+# クローラーは ThreadPoolExecutor の中で初めて fetch() を呼ぶので、2つのスレッドが同時に作らないようにする
+_default_lock = threading.Lock()
+
+
+def default_cache() -> HttpCache:
+    """最初に使われたときに1つだけ作る共有キャッシュ。"""
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:  # 待っている間に別のスレッドが作っていれば、それを使う
+                _default_cache = HttpCache()
+    return _default_cache
+
+
+def default_client() -> FetchClient:
+    """最初に使われたときに1つだけ作る共有クライアント（接続をプロセス内で使い回す）。"""
+    global _default_client
+    if _default_client is None:
+        with _default_lock:
+            if _default_client is None:
+                _default_client = FetchClient()
+    return _default_client
+
+
+def _from_entry(cache: HttpCache, entry, revalidated: bool = False) -> Page:
+    return Page(
+        url=entry.url,
+        status_code=entry.status,
+        content=cache.read_body(entry),
+        headers=CaseInsensitiveDict({"Content-Type": entry.content_type or ""}),
+        from_cache=True,
+        revalidated=revalidated,
+    )
+
+
+def fetch(
+    url: str,
+    use_cache: bool = True,
+    cache: HttpCache | None = None,
+    client: FetchClient | None = None,
+) -> Page:
+    """URLのHTMLを取得する（キャッシュ・条件付きリクエスト対応）。"""
+    client = client or default_client()
+    if not use_cache:
+        response = client.get(url)
+        return Page(url, response.status_code, response.content, response.headers)
+
+    cache = cache or default_cache()
+    entry = cache.lookup(url)
+    if entry is not None and cache.is_fresh(entry):
+        return _from_entry(cache, entry)
+
+    # 前回の ETag / Last-Modified を添えて「変わっていれば送って」と頼む
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    response = client.get(url, headers=headers)
+    if response.status_code == 304 and entry is not None:
+        cache.refresh(url, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return _from_entry(cache, entry, revalidated=True)
+
+    page = Page(url, response.status_code, response.content, response.headers)
+    # 成功したレスポンスだけ保存（no-store 指定のページは保存しない）
+    if response.status_code == 200 and "no-store" not in response.headers.get("Cache-Control", ""):
+        cache.store(
+            url,
+            response.content,
+            status=response.status_code,
+            content_type=response.headers.get("Content-Type", ""),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+    return page
@@ -0,0 +1,349 @@
+# fixture_server.py
+# ========================================
+# books.toscrape.com と同じHTML構造の「練習用カタログ」を返すローカルHTTPサーバー
+# ========================================
+# 本物のサイトに何度もアクセスせずに、クローラーの速度（pages/sec）を
+# オフラインで計測するための仕組みです。
+#
+# URL	内容
+# /  または /index.html	一覧ページ1
+# /catalogue/page-N.html	一覧ページN（1ページ20冊）
+# /catalogue/<slug>_<id>/index.html	書籍の詳細ページ
+#
+# 💡 Content-Type は本物と同じく charset なしの "text/html" で返します。
+#    （charset を推測しない素の requests だと ISO-8859-1 扱いになり「Â£」に化けます。
+#      fetch() は <meta charset="UTF-8"> を見て正しくデコードします）
+#
+# 💡 fixtures_dir を渡すと、record_fixtures.py で保存した「録画済みHTML」を優先して返します。
+#    （fixtures/catalogue/page-2.html → /catalogue/page-2.html のように、パスをそのまま対応させる）
+
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# 左サイドバーのカテゴリ一覧（本物と同じく一覧ページごとに約50件並ぶ）
+CATEGORIES = [
+    "Travel", "Mystery", "Historical Fiction", "Sequential Art", "Classics", "Philosophy",
+    "Romance", "Womens Fiction", "Fiction", "Childrens", "Religion", "Nonfiction", "Music",
+    "Default", "Science Fiction", "Sports and Games", "Add a comment", "Fantasy", "New Adult",
+    "Young Adult", "Science", "Poetry", "Paranormal", "Art", "Psychology", "Autobiography",
+    "Parenting", "Adult Fiction", "Humor", "Horror", "History", "Food and Drink",
+    "Christian Fiction", "Business", "Biography", "Thriller", "Contemporary", "Spirituality",
+    "Academic", "Self Help", "Historical", "Christian", "Suspense", "Short Stories", "Novels",
+    "Health", "Politics", "Cultural", "Erotica", "Crime",
+]
+
+WORDS = [
+    "Light", "Attic", "Velvet", "Soumission", "Sharp", "Objects", "Sapiens",
+    "History", "Requiem", "Red", "Dirty", "Little", "Secrets", "Coming", "Woman",
+    "Boys", "Boat", "Mesaerion", "Starving", "Hearts", "Shakespeare", "Sonnets",
+    "Set", "Me", "Free", "Rip", "Olivio", "Our", "Band", "Could", "Be", "Life",
+]
+
+LISTING_TEMPLATE = """<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+<head>
+<title>All products | Books to Scrape - Sandbox</title>
+<meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+</head>
+<body id="default" class="default">
+<header class="header container-fluid"><div class="page_inner"><div class="row">
+<div class="col-sm-8 h1"><a href="{home}">Books to Scrape</a><small> We love being scraped!</small></div>
+</div></div></header>
+<div class="container-fluid page"><div class="page_inner">
+<ul class="breadcrumb"><li><a href="{home}">Home</a></li><li class="active">All products</li></ul>
+<div class="row">
+<aside class="sidebar col-sm-4 col-md-3">
+<div class="side_categories"><ul class="nav nav-list"><li><a href="{home}">Books</a><ul>
+{categories}
+</ul></li></ul></div>
+</aside>
+<div class="col-sm-8 col-md-9">
+<div class="page-header action"><h1>All products</h1></div>
+<form method="get" class="form-horizontal"><div style="display:none"></div>
+<strong>{total}</strong> results - showing <strong>{first}</strong> to <strong>{last}</strong>.</form>
+<section>
+<ol class="row">
+{articles}
+</ol>
+<div>
+<ul class="pager">
+<li class="current">Page {page} of {pages}</li>
+{next_link}
+</ul>
+</div>
+</section>
+</div>
+</div>
+</div></div>
+<footer class="footer container-fluid"></footer>
+<script src="../static/oscar/js/bootstrap3/bootstrap.min.js" type="text/javascript"></script>
+<script type="text/javascript">$(function() {{ oscar.init(); oscar.search.init(); }});</script>
+</body>
+</html>
+"""
+
+ARTICLE_TEMPLATE = """<li class="col-xs-6 col-sm-4 col-md-3 col-lg-3">
+<article class="product_pod">
+<div class="image_container"><a href="{href}"><img src="../media/cache/{book_id}.jpg" alt="{title}" class="thumbnail"></a></div>
+<p class="star-rating Three"><i class="icon-star"></i></p>
+<h3><a href="{href}" title="{title}">{short_title}</a></h3>
+<div class="product_price">
+<p class="price_color">{price}</p>
+<p class="instock availability"><i class="icon-ok"></i> In stock</p>
+</div>
+</article>
+</li>"""
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html lang="en-us" class="no-js">
+<head>
+<title>{title} | Books to Scrape - Sandbox</title>
+<meta http-equiv="content-type" content="text/html; charset=UTF-8" />
+</head>
+<body id="default" class="default">
+<div class="page_inner">
+<article class="product_page">
+<div class="row">
+<div class="col-sm-6 product_main">
+<h1>{title}</h1>
+<p class="price_color">{price}</p>
+<p class="instock availability"><i class="icon-ok"></i> In stock</p>
+</div>
+</div>
+<div id="product_description" class="sub-header"><h2>Product Description</h2></div>
+<p>{description}</p>
+</article>
+</div>
+</body>
+</html>
+"""
+
+
+def make_catalogue(pages: int = 50, per_page: int = 20, seed: int = 0) -> list[dict]:
+    """ダミーの書籍データ（タイトル・価格・URL用スラッグ）を pages×per_page 件つくる。"""
+    rng = random.Random(seed)
+    books = []
+    for i in range(pages * per_page):
+        book_id = pages * per_page - i
+        title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 7)))
+        slug = re.sub(r"[^a-z0-9]+", "-", title.lower()).strip("-")
+        books.append(
+            {
+                "id": book_id,
+                "title": title,
+                "slug": f"{slug}_{book_id}",
+                "price": f"£{rng.uniform(10, 60):.2f}",
+            }
+        )
+    return books
+
+
+def shorten(title: str, limit: int = 20) -> str:
+    """一覧ページの <h3> と同じく、長いタイトルを「...」で省略する。"""
+    return title if len(title) <= limit else title[:limit].rstrip() + " ..."
+
+
+class Catalogue:
+    """練習用カタログのHTMLを組み立てるクラス（サーバーなしでも使える）。"""
+
+    def __init__(self, pages: int = 50, per_page: int = 20, seed: int = 0):
+        self.pages = pages
+        self.per_page = per_page
+        self.books = make_catalogue(pages, per_page, seed)
+        self.by_slug = {book["slug"]: book for book in self.books}
+
+    def render_listing(self, page: int, at_root: bool = False) -> str:
+        start = (page - 1) * self.per_page
+        # トップページ（/）だけ、本物と同じくリンクに "catalogue/" が付く
+        prefix = "catalogue/" if at_root else ""
+        articles = "\n".join(
+            ARTICLE_TEMPLATE.format(
+                href=f"{prefix}{book['slug']}/index.html",
+                book_id=book["id"],
+                title=book["title"],
+                short_title=shorten(book["title"]),
+                price=book["price"],
+            )
+            for book in self.books[start : start + self.per_page]
+        )
+        next_link = ""
+        if page < self.pages:
+            next_link = f'<li class="next"><a href="{prefix}page-{page + 1}.html">next</a></li>'
+        home = "index.html" if at_root else "../index.html"
+        categories = "\n".join(
+            f'<li><a href="{prefix}category/books/{name.lower().replace(" ", "-")}_{i}/index.html">'
+            f"\n    {name}\n</a></li>"
+            for i, name in enumerate(CATEGORIES, start=2)
+        )
+        return LISTING_TEMPLATE.format(
+            home=home,
+            categories=categories,
+            total=len(self.books),
+            first=start + 1,
+            last=min(start + self.per_page, len(self.books)),
+            articles=articles,
+            page=page,
+            pages=self.pages,
+            next_link=next_link,
+        )
+
+    def render(self, path: str) -> str | None:
+        """パスに対応するHTMLを返す（存在しなければ None）。"""
+        path = path.split("?", 1)[0]
+        if path in ("/", "/index.html"):
+            return self.render_listing(1, at_root=True)
+        m = re.fullmatch(r"/catalogue/page-(\d+)\.html", path)
+        if m and 1 <= int(m.group(1)) <= self.pages:
+            return self.render_listing(int(m.group(1)))
+        m = re.fullmatch(r"/catalogue/([^/]+)/index\.html", path)
+        if m and m.group(1) in self.by_slug:
+            return self.render_detail(self.by_slug[m.group(1)])
+        return None
+
+    def render_detail(self, book: dict) -> str:
+        return DETAIL_TEMPLATE.format(
+            title=book["title"],
+            price=book["price"],
+            description=" ".join([book["title"]] * 20),
+        )
+
+
+def load_fixtures(fixtures_dir: str | Path) -> dict[str, bytes]:
+    """録画済みHTMLを {URLパス: 本文} の辞書にして読み込む。"""
+    root = Path(fixtures_dir)
+    pages = {}
+    for file in sorted(root.rglob("*.html")):
+        pages["/" + file.relative_to(root).as_posix()] = file.read_bytes()
+    return pages
+
+
+class CatalogueServer:
+    """練習用カタログをローカルで配信するサーバー。
+
+    with CatalogueServer(pages=50) as server:
+        print(server.base_url)  # → http://127.0.0.1:xxxxx/
+    """
+
+    def __init__(
+        self,
+        pages: int = 50,
+        per_page: int = 20,
+        latency: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int = 0,
+        catalogue: Catalogue | None = None,
+        fixtures_dir: str | Path | None = None,
+        slow_ratio: float = 0.0,
+        slow_latency: float = 1.0,
+    ):
+        self.catalogue = catalogue or Catalogue(pages, per_page, seed)
+        # 録画済みHTML（パス → 本文）。ここに無いパスは練習用カタログで組み立てる
+        self.recorded = load_fixtures(fixtures_dir) if fixtures_dir else {}
+        self.latency = latency  # 1リクエストごとの疑似的な応答待ち（秒）
+        # slow_ratio の割合のリクエストだけ、さらに slow_latency 秒待たせる（応答時間の「裾」の再現）
+        self.slow_ratio = slow_ratio
+        self.slow_latency = slow_latency
+        self._rng = random.Random(seed)
+        self.requests_served = 0
+        self.bytes_sent = 0  # 本文として送ったバイト数（304 は 0）
+        self.last_modified = formatdate(time.time(), usegmt=True)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    # ---- URL ----
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    # ---- 起動・停止 ----
+    def start(self) -> "CatalogueServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "CatalogueServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 にして Keep-Alive（接続の使い回し）を有効にする
+            protocol_version = "HTTP/1.1"
+            # ヘッダと本文を別々に送るので、Nagle（小さなパケットの待ち合わせ）を切っておく。
+            # 切らないと Keep-Alive 時に1リクエストあたり約40msの余計な待ちが出る
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with server._lock:
+                    server.requests_served += 1
+                    slow = server.slow_ratio and server._rng.random() < server.slow_ratio
+                if server.latency or slow:
+                    time.sleep(server.latency + (server.slow_latency if slow else 0))
+                path = self.path.split("?", 1)[0]
+                body = server.recorded.get("/index.html" if path == "/" else path)
+                if body is None:
+                    html = server.catalogue.render(self.path)
+                    if html is None:
+                        self.send_error(404)
+                        return
+                    body = html.encode("utf-8")
+                # 本物のサーバーと同じく ETag / Last-Modified を付け、
+                # 変更が無ければ 304（本文なし）で応答する
+                etag = '"' + hashlib.md5(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", server.last_modified)
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # タイムアウトやヘッジで、クライアントが先に接続を切った（想定どおり）
+                    return
+                with server._lock:
+                    server.bytes_sent += len(body)
+
+            def log_message(self, format, *args):  # アクセスログは出さない
+                pass
+
+        return Handler
+
+
+if __name__ == "__main__":
+    # 単体起動：python fixture_server.py → Ctrl+C で停止
+    with CatalogueServer() as server:
+        print("▶ 練習用カタログを配信中:", server.base_url)
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\n▶ 停止しました")
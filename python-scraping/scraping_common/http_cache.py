@@ -0,0 +1,206 @@
+# http_cache.py
+# ========================================
+# 取得したHTMLをディスクに保存しておく「レスポンスキャッシュ」
+# ========================================
+# 同じページを毎回ダウンロードし直すのは、時間も通信量ももったいない。
+# 一度取得したHTMLを保存しておき、次回は次のように使い分けます。
+#
+# 状態	動き
+# TTL（有効期限）内	通信せずに保存済みのHTMLを返す
+# TTL切れ	If-None-Match / If-Modified-Since 付きで問い合わせる（条件付きリクエスト）
+#   → 304 Not Modified	本文は受け取らず、保存済みのHTMLを使う（ほぼ通信ゼロ）
+#   → 200 OK	新しいHTMLで保存し直す
+#
+# 💡 保存の仕組み
+# - 本文は「中身のハッシュ値（sha256）」をファイル名にして objects/ に保存（同じ中身は1ファイル）
+# - URL → ハッシュ値・ETag・Last-Modified などの対応表は SQLite（index.sqlite3）に保存
+# - 合計サイズが max_bytes を超えたら、最後に使ってから一番時間が経ったものから削除（LRU）
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get("SCRAPING_CACHE_DIR", Path(__file__).resolve().parent.parent / ".http_cache")
+)
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    hash: str  # 本文の sha256（objects/ のファイル名）
+    size: int  # 本文のバイト数
+    status: int
+    content_type: str
+    etag: str | None
+    last_modified: str | None
+    stored_at: float  # 取得（または再検証）した時刻
+    last_access: float  # 最後に使った時刻（LRU用）
+
+
+class HttpCache:
+    """URLごとのレスポンスをディスクに保存するキャッシュ。
+
+    ttl	この秒数以内なら通信せずにキャッシュを返す（0 なら毎回再検証）
+    max_bytes	本文の合計サイズ上限。超えたら古いものから削除
+    """
+
+    def __init__(
+        self,
+        root: str | Path = DEFAULT_CACHE_DIR,
+        ttl: float = 3600,
+        max_bytes: int = 200 * 1024 * 1024,
+    ):
+        self.root = Path(root)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        # クローラーは複数スレッドから呼ぶので、接続を共有してロックで守る
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite3", check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                content_type TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_hash ON entries(hash)")
+        self._db.commit()
+
+    # ---- 読み取り ----
+    def lookup(self, url: str) -> CacheEntry | None:
+        """URLの保存情報を返す（無ければ None）。"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, hash, size, status, content_type, etag, last_modified,"
+                " stored_at, last_access FROM entries WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        entry = CacheEntry(*row)
+        if not self._object_path(entry.hash).exists():  # 本文ファイルが消えていたら無効
+            return None
+        return entry
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        """TTL 以内なら True（通信せずに使ってよい）。"""
+        return time.time() - entry.stored_at < self.ttl
+
+    def read_body(self, entry: CacheEntry) -> bytes:
+        body = self._object_path(entry.hash).read_bytes()
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), entry.url)
+            )
+            self._db.commit()
+        return body
+
+    # ---- 書き込み ----
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        status: int = 200,
+        content_type: str = "",
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        """本文を保存して対応表を更新する。"""
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():  # 同じ中身がすでにあれば書かない（中身でアドレスする利点）
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, path)  # 書きかけのファイルを読まれないよう、最後に置き換える
+
+        now = time.time()
+        entry = CacheEntry(url, digest, len(body), status, content_type, etag, last_modified, now, now)
+        with self._lock:
+            old = self._db.execute("SELECT hash FROM entries WHERE url = ?", (url,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, digest, len(body), status, content_type, etag, last_modified, now, now),
+            )
+            if old and old[0] != digest:
+                self._drop_object_if_unused(old[0])
+            self._evict()
+            self._db.commit()
+        return entry
+
+    def refresh(self, url: str, etag: str | None = None, last_modified: str | None = None) -> None:
+        """304 を受け取ったとき：本文はそのまま、取得時刻（と検証用ヘッダ）だけ更新する。"""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET stored_at = ?, last_access = ?,"
+                " etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)"
+                " WHERE url = ?",
+                (now, now, etag, last_modified, url),
+            )
+            self._db.commit()
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._total_bytes()
+
+    def clear(self) -> None:
+        with self._lock:
+            for (digest,) in self._db.execute("SELECT DISTINCT hash FROM entries").fetchall():
+                self._object_path(digest).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    # ---- 内部処理 ----
+    def _object_path(self, digest: str) -> Path:
+        # 1フォルダにファイルが集中しないよう、先頭2文字でフォルダを分ける
+        return self.objects / digest[:2] / digest
+
+    def _total_bytes(self) -> int:
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT hash, size FROM entries)"
+        ).fetchone()
+        return row[0]
+
+    def _drop_object_if_unused(self, digest: str) -> None:
+        used = self._db.execute("SELECT 1 FROM entries WHERE hash = ? LIMIT 1", (digest,)).fetchone()
+        if not used:
+            self._object_path(digest).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """合計サイズが上限を超えていたら、最後に使った時刻が古い順に削除する（LRU）。"""
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT url, hash FROM entries ORDER BY last_access").fetchall()
+        for url, digest in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            still_used = self._db.execute(
+                "SELECT 1 FROM entries WHERE hash = ? LIMIT 1", (digest,)
+            ).fetchone()
+            if not still_used:
+                path = self._object_path(digest)
+                if path.exists():
+                    total -= path.stat().st_size
+                    path.unlink()
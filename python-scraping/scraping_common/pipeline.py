@@ -0,0 +1,155 @@
+# pipeline.py
+# ========================================
+# 「取得（通信）」と「解析（CPU）」を分けた2段構成のパイプライン
+# ========================================
+# async_crawler は取得も解析も1つのプロセス内で行うため、ページ数が増えると
+# BeautifulSoup の解析（CPUを使う処理）が通信処理と取り合いになります。
+# ここでは役割を分けて、解析を複数プロセス（CPUコアの数だけ）に逃がします。
+#
+#   [URLキュー] → 取得係（asyncio × fetchers） → [HTMLキュー（上限あり）] → 解析係（プロセス × parsers）
+#        ↑                                                                     │
+#        └──────────── 一覧ページから見つかった詳細ページURL ─────────────────────┘
+#
+# 💡 HTMLキューには上限（queue_size）があるので、解析が追いつかないと取得係は put() で待たされます。
+#    これが「バックプレッシャー」。メモリに溜まるHTMLは最大でも queue_size ページ分に抑えられます。
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable
+from urllib.parse import urljoin
+
+from .async_crawler import CrawlResult, listing_url
+from .client import FetchClient
+from .extract import DEFAULT_BACKEND, extract_detail, extract_listing
+from .fetch import fetch
+
+
+def fetch_bytes(
+    url: str, use_cache: bool = True, client: FetchClient | None = None
+) -> tuple[bytes, str]:
+    """(HTMLのバイト列, 文字コード) を返す。解析プロセスへはバイト列のまま渡す。"""
+    page = fetch(url, use_cache=use_cache, client=client)
+    page.raise_for_status()
+    return page.content, page.encoding
+
+
+def parse_page(kind: str, url: str, body: bytes, encoding: str, parser: str):
+    """解析プロセスで実行される関数（プロセス間で受け渡すため、モジュール直下に置く）。
+
+    戻り値：(書籍レコード, 詳細ページURL, 総ページ数)
+    """
+    html = body.decode(encoding, errors="replace")
+    if kind == "detail":
+        return [extract_detail(html, parser)], [], None
+    records, hrefs, total_pages = extract_listing(html, parser)
+    return records, [urljoin(url, href) for href in hrefs], total_pages
+
+
+@dataclass
+class PipelineResult(CrawlResult):
+    max_queue: int = 0  # HTMLキューに溜まった最大ページ数（バックプレッシャーの確認用）
+    errors: int = 0  # 取得・解析に失敗したページ数
+
+
+async def run_pipeline(
+    start_url: str = "https://books.toscrape.com/",
+    fetchers: int = 16,
+    parsers: int | None = None,
+    queue_size: int = 64,
+    follow_details: bool = True,
+    fetch: Callable[[str], tuple[bytes, str]] = fetch_bytes,
+    parser: str = DEFAULT_BACKEND,
+) -> PipelineResult:
+    """カタログ全体を「取得 → 解析」の2段パイプラインで処理する。
+
+    fetchers	同時に通信する数（スレッド）
+    parsers	解析プロセス数（None なら CPUコア数）
+    queue_size	取得済み・未解析のHTMLを溜めておける上限（ページ数）
+    """
+    parsers = parsers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    result = PipelineResult()
+    started = time.perf_counter()
+
+    url_queue: asyncio.Queue = asyncio.Queue()  # URLは小さいので上限なし
+    html_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)  # HTMLは上限あり
+    done = asyncio.Event()
+    pending = 0  # 「キューに入れたがまだ解析が終わっていない」ページ数
+    collected: dict[tuple, list[dict]] = {}  # 並び順キー → レコード
+
+    def enqueue(kind: str, url: str, key: tuple) -> None:
+        nonlocal pending
+        pending += 1
+        url_queue.put_nowait((kind, url, key))
+
+    def finish_one() -> None:
+        nonlocal pending
+        pending -= 1
+        if pending == 0:
+            done.set()
+
+    async def fetch_worker(threads: ThreadPoolExecutor) -> None:
+        while True:
+            kind, url, key = await url_queue.get()
+            try:
+                body, encoding = await loop.run_in_executor(threads, fetch, url)
+            except Exception:
+                result.errors += 1
+                finish_one()
+                continue
+            result.pages += 1
+            result.bytes += len(body)
+            await html_queue.put((kind, url, key, body, encoding))  # 満杯ならここで待つ
+            result.max_queue = max(result.max_queue, html_queue.qsize())
+
+    async def parse_worker(processes: ProcessPoolExecutor) -> None:
+        while True:
+            kind, url, key, body, encoding = await html_queue.get()
+            try:
+                records, detail_urls, total_pages = await loop.run_in_executor(
+                    processes, parse_page, kind, url, body, encoding, parser
+                )
+            except Exception:
+                result.errors += 1
+                finish_one()
+                continue
+
+            if key == (1,) and total_pages:  # 1ページ目 → 残りの一覧ページを投入
+                for n in range(2, total_pages + 1):
+                    enqueue("listing", listing_url(start_url, n), (n,))
+            if kind == "listing" and follow_details:
+                for i, detail_url in enumerate(detail_urls):
+                    enqueue("detail", detail_url, key + (i,))
+            else:
+                collected[key] = records
+            finish_one()
+
+    # spawn：スレッドが動いている親プロセスを fork しないよう、新しいPythonで解析係を起動する
+    context = multiprocessing.get_context("spawn")
+    with ThreadPoolExecutor(max_workers=fetchers) as threads, ProcessPoolExecutor(
+        max_workers=parsers, mp_context=context
+    ) as processes:
+        enqueue("listing", start_url, (1,))
+        workers = [asyncio.create_task(fetch_worker(threads)) for _ in range(fetchers)]
+        workers += [asyncio.create_task(parse_worker(processes)) for _ in range(parsers)]
+        await done.wait()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    # 並び順キー（一覧ページ番号, 掲載位置）でソートして、いつも同じ順番にそろえる
+    for key in sorted(collected):
+        result.records.extend(collected[key])
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def pipeline(start_url: str = "https://books.toscrape.com/", **kwargs) -> PipelineResult:
+    """同期コードから呼ぶための入口（asyncio.run でラップ）。"""
+    return asyncio.run(run_pipeline(start_url, **kwargs))
@@ -0,0 +1,52 @@
+# policy.py
+# ========================================
+# 「遅い1件」に全体が引きずられないための取得ポリシー（タイムアウト・再試行・ヘッジ）
+# ========================================
+# requests.get(url) はタイムアウトを指定しないと、応答が来るまでいつまでも待ち続けます。
+# 1000ページ巡回して1ページだけ固まると、そのページが巡回全体の終わりを決めてしまいます。
+#
+# 設定	内容
+# connect_timeout	接続できるまでの上限（秒）。超えたら失敗として再試行
+# read_timeout	応答の受信が途切れてからの上限（秒）。超えたら失敗として再試行
+# retries	失敗（タイムアウト・接続エラー・429/5xx）時に再試行する回数
+# backoff_base / backoff_max	再試行までの待ち時間：0〜min(backoff_max, backoff_base × 2^回数) のランダム
+# hedge	ON にすると、応答が「いつもの95%より遅い」ときに同じリクエストをもう1本送る
+#
+# 💡 ヘッジ（hedged request）のイメージ
+# 1本目を送る → p95（100回中95回はこれより速い時間）を過ぎても返ってこない → 2本目を送る
+# → 先に返ってきた方を使う。遅いのは5%だけなので、増える通信は最大でも約5%です。
+# 💡 待ち時間をランダムにする（ジッター）のは、一斉に失敗したリクエストが
+#    一斉に再送してサーバーをまた詰まらせる、のを避けるためです。
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+
+# 再試行してよいステータス（混雑・一時的な障害）
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass
+class FetchPolicy:
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    retries: int = 2
+    backoff_base: float = 0.5
+    backoff_max: float = 10.0
+    hedge: bool = False
+    hedge_quantile: float = 0.95  # この割合より遅ければ2本目を送る
+    hedge_delay: float | None = None  # 固定の待ち時間（秒）。None なら実測の p95 を使う
+    hedge_min_samples: int = 20  # 実測値がこれだけ貯まるまではヘッジしない
+
+    @property
+    def timeout(self) -> tuple[float, float]:
+        """requests に渡す (接続, 受信) のタイムアウト。"""
+        return (self.connect_timeout, self.read_timeout)
+
+    def backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """attempt 回目（0始まり）の失敗のあと、次を送るまでに待つ秒数。"""
+        if retry_after and retry_after.isdigit():  # サーバーが待ち時間を指定してきたら従う
+            return min(float(retry_after), self.backoff_max)
+        # フルジッター：0 から上限までの一様乱数
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
@@ -0,0 +1,68 @@
+# rate_limit.py
+# ========================================
+# ホスト（サイト）ごとのアクセス頻度を制限する「トークンバケット」
+# ========================================
+# 💡 イメージ
+# バケツに「1秒あたり rate 個」のペースでトークン（入場券）が貯まっていき、
+# 最大 burst 個まで貯められる。リクエストを1回送るたびに1個使う。
+# トークンが無ければ、貯まるまで待つ。
+#
+# → 平均では rate 回/秒を超えず、それでいて短時間の「まとめ撃ち」（burst）は許す。
+#   サーバー側のアクセス制限（429 Too Many Requests など）に引っかからない範囲で、
+#   いちばん速く取得するための仕組みです。
+
+from __future__ import annotations
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate  # 1秒あたりに補充されるトークン数
+        self.burst = max(1, burst)  # 貯められる最大数
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """トークンを1個取る（無ければ待つ）。待った秒数を返す。"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)  # ロックを外してから待つ（他のホストの処理を止めない）
+            waited += wait
+
+
+class HostRateLimiter:
+    """URLのホスト名ごとに TokenBucket を持つ。
+
+    rate=None なら制限なし。per_host で特定ホストだけ別の上限にもできる：
+        HostRateLimiter(rate=5, per_host={"books.toscrape.com": 20})
+    """
+
+    def __init__(self, rate: float | None = None, burst: int = 1, per_host: dict | None = None):
+        self.rate = rate
+        self.burst = burst
+        self.per_host = per_host or {}
+        self.buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url: str) -> float:
+        host = urlsplit(url).netloc
+        rate = self.per_host.get(host, self.rate)
+        if not rate:
+            return 0.0
+        with self._lock:
+            bucket = self.buckets.get(host)
+            if bucket is None:
+                bucket = self.buckets[host] = TokenBucket(rate, self.burst)
+        return bucket.acquire()
@@ -0,0 +1,107 @@
+# state_store.py
+# ========================================
+# 差分クロール用の「前回の状態」を保存する SQLite ストア
+# ========================================
+# 毎晩の価格チェックで変わるのは、1000冊のうち数冊だけ、ということがほとんどです。
+# そこで、ページごとに次の情報を保存しておきます。
+#
+# 列	内容
+# url	ページのURL
+# content_hash	HTMLの sha256（中身が1文字でも変われば別の値になる）
+# fetched_at	取得した時刻
+# rows_json	そのページから取り出したレコード（JSON）
+# links_json	一覧ページの場合は、詳細ページへのリンク（JSON）
+# last_run	最後にそのページを見かけた実行回（消えたページの検出に使う）
+#
+# 💡 次回の巡回で content_hash が同じなら、解析を飛ばして保存済みのレコードをそのまま使います。
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+
+def content_hash(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class CrawlState:
+    def __init__(self, path: str | Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                rows_json TEXT NOT NULL,
+                links_json TEXT NOT NULL DEFAULT '[]',
+                last_run INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                started_at REAL NOT NULL,
+                changed INTEGER
+            );
+            """
+        )
+        self.run_id = self._db.execute(
+            "INSERT INTO runs (started_at) VALUES (?)", (time.time(),)
+        ).lastrowid
+        self.changed = 0  # 今回、新規または内容が変わったページ数
+        self.skipped = 0  # 今回、内容が同じで解析を省略したページ数
+
+    def lookup(self, url: str, digest: str) -> tuple[list[dict], list[str]] | None:
+        """前回と同じ内容なら (保存済みレコード, 保存済みリンク) を返す。変わっていれば None。"""
+        row = self._db.execute(
+            "SELECT content_hash, rows_json, links_json FROM pages WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None or row[0] != digest:
+            return None
+        self._db.execute(
+            "UPDATE pages SET fetched_at = ?, last_run = ? WHERE url = ?",
+            (time.time(), self.run_id, url),
+        )
+        self.skipped += 1
+        return json.loads(row[1]), json.loads(row[2])
+
+    def save(self, url: str, digest: str, rows: list[dict], links: list[str] = ()) -> None:
+        """新規または内容が変わったページの解析結果を保存する。"""
+        self._db.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                digest,
+                time.time(),
+                json.dumps(rows, ensure_ascii=False),
+                json.dumps(list(links)),
+                self.run_id,
+            ),
+        )
+        self.changed += 1
+
+    def removed(self) -> int:
+        """前回の実行では見えていたのに、今回は見えなかったページ数（削除された書籍など）。"""
+        previous = self._db.execute(
+            "SELECT MAX(id) FROM runs WHERE id < ?", (self.run_id,)
+        ).fetchone()[0]
+        if previous is None:
+            return 0
+        return self._db.execute(
+            "SELECT COUNT(*) FROM pages WHERE last_run = ?", (previous,)
+        ).fetchone()[0]
+
+    def finish(self) -> int:
+        """実行を締めくくり、「変更ありページ数（新規・変更・削除）」を返す。"""
+        total = self.changed + self.removed()
+        self._db.execute("UPDATE runs SET changed = ? WHERE id = ?", (total, self.run_id))
+        self._db.commit()
+        return total
+
+    def close(self) -> None:
+        self._db.commit()
+        self._db.close()
@@ -1,20 +1,29 @@
 # scraping_01_get_html.py
-import requests
+import os
+import sys
+from pathlib import Path
 
-# これは 「WebページにアクセスしてHTMLを取得する」 ためのライブラリ。
+# python-scraping/ を import パスに追加（共通部品 scraping_common を使うため）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.fetch import fetch  # noqa: E402
+
+# fetch() は中で requests（「WebページにアクセスしてHTMLを取得する」 ためのライブラリ）を使っています。
 # ブラウザでURLを開くのと同じことを、Pythonから自動で行えます。
+# 💡 一度取得したHTMLはディスクに保存され、2回目以降はキャッシュから返ります。
+#    （変わっていないか ETag / Last-Modified でサーバーに確認するので、内容は常に最新）
 
 # 練習用サイト（安全にスクレイピング練習できる）
-url = "https://books.toscrape.com/"
+url = os.environ.get("BOOKS_TO_SCRAPE_URL", "https://books.toscrape.com/")
+# 環境変数 BOOKS_TO_SCRAPE_URL を指定すると、取得先を差し替えられます（オフライン計測用）
 
 # 取得したいページのURLを変数 url に代入しています。
 # このサイト（Books to Scrape）は「スクレイピング学習専用サイト」で、
 # 法的にも安全に練習できます（＝禁止されていません）。
 
 # HTML取得
-response = requests.get(url)
+response = fetch(url)
 
-# requests.get() 関数で、指定URLのサーバーにHTTPリクエストを送信。
+# fetch() 関数（中身は requests.get()）で、指定URLのサーバーにHTTPリクエストを送信。
 # サーバーから返ってきた結果（＝レスポンス）を response というオブジェクトに格納します。
 # 💡 ここで取得しているのは、ブラウザが裏で受け取っているHTMLそのもの。
 
@@ -3,25 +3,33 @@
 # BeautifulSoupを使ってHTMLから特定要素を抽出する練習
 # ========================================
 
-import requests
+import os
+import sys
+from pathlib import Path
+
 from bs4 import BeautifulSoup
 
+# python-scraping/ を import パスに追加（共通部品 scraping_common を使うため）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.fetch import fetch  # noqa: E402
+
 # BeautifulSoup
 # → 取得したHTMLの「タグ構造」を理解し、
 # 必要な部分（タイトル・価格など）を抜き出すツール。
 # HTMLを“データベースのように検索できる”ようにしてくれます。
 
 # 1️⃣ 練習用サイト（安全にスクレイピング可能）
-url = "https://books.toscrape.com/"
+url = os.environ.get("BOOKS_TO_SCRAPE_URL", "https://books.toscrape.com/")
+# 環境変数 BOOKS_TO_SCRAPE_URL を指定すると、取得先を差し替えられます（オフライン計測用）
 
-# 2️⃣ HTMLを取得
-response = requests.get(url)
+# 2️⃣ HTMLを取得（キャッシュ付き。2回目以降はダウンロードし直さない）
+response = fetch(url)
 
 # ステータスコード確認
 print("Status Code:", response.status_code)
 
-# requests.get(url)
-# → 指定したURLにアクセスしてHTMLを取得します。
+# fetch(url)
+# → 指定したURLにアクセスしてHTMLを取得します（中身は requests.get(url)）。
 
 # response オブジェクトには次の情報が含まれています：
 # .status_code: サーバーの応答コード（200なら成功）
@@ -85,3 +93,9 @@ for price in prices[:5]:
 # - BeautifulSoupでタグを抽出
 # - find_all()で複数要素を取得
 # - .textでテキスト内容を取り出す
+
+# 💡 大量のページを解析するときは
+# BeautifulSoup(response.text, "html.parser") はページ全体をツリーにするので、
+# 数千ページになると解析がいちばん重い処理になります。
+# scraping_common/extract.py の extract_books() は、書籍の枠（<article class="product_pod">）だけを
+# 解析して「タイトルと価格をセットで」取り出す高速版です（step03 で使用）。
@@ -1,46 +1,145 @@
 # scraping_03_to_excel.py
 # Step03：スクレイピング結果をExcelに出力する
 
-import requests
-from bs4 import BeautifulSoup
+import argparse
+import functools
+import sys
+from pathlib import Path
+
 import pandas as pd
 import os
 
+# python-scraping/ を import パスに追加（共通部品 scraping_common を使うため）
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from scraping_common.async_crawler import crawl, fetch_html  # noqa: E402
+from scraping_common.client import FetchClient  # noqa: E402
+from scraping_common.excel_stream import ENGINES, StreamingBookWriter  # noqa: E402
+from scraping_common.extract import BACKENDS, DEFAULT_BACKEND, extract_books  # noqa: E402
+from scraping_common.fetch import fetch  # noqa: E402
+from scraping_common.normalize import normalize_prices  # noqa: E402
+from scraping_common.policy import FetchPolicy  # noqa: E402
+from scraping_common.state_store import CrawlState  # noqa: E402
+
+# =========================================
+# ⓪ 実行モードの指定
+# =========================================
+parser = argparse.ArgumentParser(description="Books to Scrape の書籍データをExcelに出力")
+parser.add_argument(
+    "--url",
+    default=os.environ.get("BOOKS_TO_SCRAPE_URL", "https://books.toscrape.com/"),
+    help="取得先のトップURL（環境変数 BOOKS_TO_SCRAPE_URL でも指定可）",
+)
+parser.add_argument("--crawl", action="store_true", help="全ページを asyncio で並行巡回する")
+parser.add_argument("--concurrency", type=int, default=10, help="--crawl 時の同時リクエスト数")
+parser.add_argument(
+    "--no-details", action="store_true", help="--crawl 時に詳細ページを取得しない（一覧のみ）"
+)
+parser.add_argument("--no-cache", action="store_true", help="ディスクキャッシュを使わずに毎回取得する")
+parser.add_argument("--rate", type=float, default=None, help="1秒あたりのリクエスト上限（ホストごと）")
+parser.add_argument("--burst", type=int, default=5, help="--rate 時に連続で送ってよい回数")
+parser.add_argument("--timeout", type=float, default=30, help="応答の受信タイムアウト（秒）")
+parser.add_argument("--retries", type=int, default=2, help="タイムアウト・5xx のときに再試行する回数")
+parser.add_argument(
+    "--hedge", action="store_true", help="応答が p95 より遅ければ同じリクエストをもう1本送る"
+)
+parser.add_argument(
+    "--parser", choices=BACKENDS, default=DEFAULT_BACKEND, help="HTML抽出のバックエンド"
+)
+parser.add_argument(
+    "--incremental",
+    action="store_true",
+    help="差分クロール（--crawl を含む）：内容が変わったページだけ解析し、変更が無ければExcelも作り直さない",
+)
+parser.add_argument(
+    "--stream",
+    action="store_true",
+    help="解析したそばから1行ずつExcelに書き出す（件数が増えてもメモリが増えない）",
+)
+parser.add_argument(
+    "--excel-engine", choices=ENGINES, default="openpyxl", help="--stream 時の書き込みエンジン"
+)
+args = parser.parse_args()
+
+# 引数なし → これまで通りトップページ1枚（20冊）だけ
+# --crawl   → 一覧50ページ＋詳細ページを並行取得（約1000冊）
+#   例：python scraping_03_to_excel.py --crawl --concurrency 20
+# --incremental → --crawl ＋ 前回の状態（output/crawl_state.sqlite3）と比べて差分だけ処理
+# --stream  → DataFrame を作らず、書籍レコードを届いた順に output/books_data.xlsx へ追記
+
 # =========================================
 # ① HTML取得
 # =========================================
-url = "https://books.toscrape.com/"
-response = requests.get(url)
+url = args.url
 
 # 「Books to Scrape」は練習用サイト。商用利用禁止ですが学習目的ならOK。
 #  本番案件ではここに「企業の製品ページ」「不動産情報」「求人データ」などが入ります。
 
-print("Status Code:", response.status_code)
-soup = BeautifulSoup(response.text, "html.parser")
+# 接続を使い回すクライアント（同時数ぶんの接続をプールしておく）
+# タイムアウト・再試行・ヘッジの設定（遅い1ページで巡回全体が止まらないように）
+policy = FetchPolicy(read_timeout=args.timeout, retries=args.retries, hedge=args.hedge)
+client = FetchClient(pool_size=args.concurrency, rate=args.rate, burst=args.burst, policy=policy)
+
+# ストリーミング出力：書き込み専用ブックを先に開いておき、解析したレコードをすぐ追記する
+writer = None
+if args.stream:
+    writer = StreamingBookWriter(
+        os.path.join("output", "books_data.xlsx"), engine=args.excel_engine
+    )
+
+if args.crawl or args.incremental:
+    # 差分クロール：ページごとの内容ハッシュと抽出結果を SQLite に保存しておき、
+    # 次回は「ハッシュが同じページ＝変わっていない」として解析を省略する
+    state = CrawlState(os.path.join("output", "crawl_state.sqlite3")) if args.incremental else None
+    result = crawl(
+        url,
+        concurrency=args.concurrency,
+        follow_details=not args.no_details,
+        fetch=functools.partial(fetch_html, use_cache=not args.no_cache, client=client),
+        parser=args.parser,
+        state=state,
+        on_records=writer.write_many if writer else None,
+    )
+    print(
+        f"▶ 巡回完了: {result.pages} ページ / {result.elapsed:.1f} 秒"
+        f"（{result.pages_per_sec:.1f} pages/sec）"
+    )
+    print("▶ 通信統計:", client.stats())
+    if state is not None:
+        print(f"▶ 差分: 変更あり {result.changed} ページ / 解析を省略 {result.skipped} ページ")
+        state.close()
+    records = result.records
+else:
+    response = fetch(url, use_cache=not args.no_cache, client=client)
+    print("Status Code:", response.status_code)
+    records = extract_books(response.text, backend=args.parser)
+    if writer is not None:
+        writer.write_many(records)
+        records = []
 
 # response.text はページ全体のHTML文字列。
-# BeautifulSoup() でHTMLを「ツリー構造」に変換。
-# "html.parser" はPython標準のHTMLパーサー。軽量で学習には最適。
+# extract_books() は BeautifulSoup でHTMLを「ツリー構造」に変換して書籍を取り出す関数。
+# ただしページ全体ではなく、<article class="product_pod">（1冊分の枠）だけをツリー化します。
+# （SoupStrainer で「パースする前に」不要なタグを捨てるので、速くてメモリも少ない）
 
 # 💡豆知識
 #  他に "lxml" などの高速パーサーもあります。商用案件ではこちらを指定することが多いです。
+#  → --parser lxml で切り替え可能（pip install lxml が必要）
 
 
 # =========================================
 # ② 書籍タイトルと価格を抽出
 # =========================================
-titles = [h3.get_text() for h3 in soup.find_all("h3")]
-
-# 「Â£」を「£」に変換して文字化けを防止
-prices = [
-    p.get_text().replace("Â", "") for p in soup.find_all("p", class_="price_color")
-]
-
-# 🔹 ポイント
-# .find_all("h3") → <h3> タグをすべて抽出（＝書籍タイトル）。
-# .find_all("p", class_="price_color") → <p class="price_color"> を抽出（＝価格）。
-# .get_text() → タグの中身の文字列だけを取得。
-# .replace("Â", "") → 文字化けした「Â」を削除して「£」を正しく表示。
+# どちらのモードも同じ形（書籍タイトル・価格）のレコードを返すので、列ごとに取り出すだけ
+titles = [r["書籍タイトル"] for r in records]
+prices = [r["価格"] for r in records]
+
+# 🔹 ポイント（extract_books() の中でやっていること）
+# 1冊分の <article> ごとに、
+# <h3> の中のリンク文字列 → 書籍タイトル
+# <p class="price_color"> → 価格
+# をセットで取り出します（h3 と価格を別々に find_all するより、行ずれが起きにくい）。
+# 💡 以前は .replace("Â", "") で文字化けした「Â」を1件ずつ消していましたが、
+#    今は fetch() がHTMLの <meta charset="UTF-8"> を見て正しくデコードするので不要です。
 
 # 💡実務Tip
 # HTML構造を確認して、必要なクラス名・タグ名を探すことがスクレイピングのコツ。
@@ -51,6 +150,7 @@ prices = [
 # ③ DataFrameに整理
 # =========================================
 df = pd.DataFrame({"書籍タイトル": titles, "価格": prices})
+# 💡 --stream のときはレコードをもう書き出してあるので、ここは空の表になります（⑤で保存するだけ）
 
 # 🔹 ポイント
 # pandas.DataFrame() は表形式データを扱うクラス。
@@ -60,6 +160,14 @@ df = pd.DataFrame({"書籍タイトル": titles, "価格": prices})
 # 💡実務Tip
 #  ここで len(titles) と len(prices) を比較して数が一致しているか確認するのも良い習慣です。
 
+# 価格「£51.77」を、通貨（GBP）と数値（51.77）の2列に分ける
+df = normalize_prices(df)
+
+# 🔹 ポイント
+# 文字列のままだと、合計や平均を出すたびに「£」を外して数値に直す必要があります。
+# normalize_prices() は .str.extract() と pd.to_numeric() で列全体を一括変換するので、
+# for文を使わずに10万行でもすぐ終わります。Excel上でもそのまま数値として集計できます。
+
 # =========================================
 # ④ 出力フォルダとExcelファイル名を指定
 # =========================================
@@ -77,8 +185,23 @@ output_path = os.path.join(output_dir, "books_data.xlsx")
 # =========================================
 # ⑤ Excelに出力
 # =========================================
-df.to_excel(output_path, index=False, engine="openpyxl")
-print(f"✅ Excelファイルを出力しました: {output_path}")
+if args.incremental and result.changed == 0 and os.path.exists(output_path):
+    # どのページも変わっていなければ、前回のExcelがそのまま最新
+    if writer is not None:
+        writer.discard()  # 書きかけのファイルを捨てて、前回のファイルを残す
+    print(f"▶ 変更が無いため、Excelの再作成をスキップしました: {output_path}")
+elif writer is not None:
+    # ストリーミング出力：行はもう書き終わっているので、保存して閉じるだけ
+    writer.close()
+    print(
+        f"✅ Excelファイルを出力しました: {output_path}"
+        f"（{writer.rows} 行 / {writer.sheets} シート・ストリーミング）"
+    )
+else:
+    # 変更があれば、今回の結果（変わったページは新しく解析した行、
+    # 変わっていないページは保存済みの行）をまとめて書き出す
+    df.to_excel(output_path, index=False, engine="openpyxl")
+    print(f"✅ Excelファイルを出力しました: {output_path}")
 
 # 🔹 ポイント
 # to_excel() → openpyxl エンジンでExcelファイルを作成。
@@ -97,7 +220,7 @@ print(f"✅ Excelファイルを出力しました: {output_path}")
 # ⑥ 実行確認用メッセージ
 # =========================================
 print("✅ 書籍データをExcelに出力しました！")
-print(f"出力先: {output_file}")
+print(f"出力先: {output_path}")
 
 # 🔹 ポイント
 # ログ出力として、処理完了を明示。
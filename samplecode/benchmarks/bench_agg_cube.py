@@ -0,0 +1,92 @@
+# bench_agg_cube.py
+# ========================================
+# groupby_summary.py の5つの集計を、「groupby を5回」と「集計キューブ（SalesCube）1回」で比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_agg_cube.py
+#   python samplecode/benchmarks/bench_agg_cube.py --rows 1000000 --departments 50
+#
+# 方式	内容
+# groupby ×5	部署の平均・部署の合計・月の合計・部署×月の合計・pivot_table を、それぞれ df から計算
+# キューブ	SalesCube.from_frame() で部署×月の合計・件数を1回だけ出し、5つともそこから作る
+#
+# 💡 部署は category（schema_loader で読んだときと同じ型）、月は int32 で測ります。
+# 💡 2つの方式の5つの結果が、すべて一致することも確かめます。
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "csv_practice"))
+from agg_cube import SalesCube  # noqa: E402
+
+
+def make_frame(rows: int, departments: int, seed: int = 0) -> pd.DataFrame:
+    """部署・月・売上の DataFrame（groupby_summary.py で「月」の列を足したあとと同じ形）。"""
+    rng = np.random.default_rng(seed)
+    names = [f"部署{i:03d}" for i in range(departments)]
+    return pd.DataFrame(
+        {
+            "部署": pd.Categorical.from_codes(rng.integers(0, departments, rows), categories=names),
+            "月": rng.integers(1, 13, rows).astype("int32"),
+            "売上": rng.integers(10_000, 500_000, rows),
+        }
+    )
+
+
+def five_scans(df: pd.DataFrame) -> list:
+    return [
+        df.groupby("部署", observed=True)["売上"].mean(),
+        df.groupby("部署", observed=True)["売上"].sum(),
+        df.groupby("月")["売上"].sum(),
+        df.groupby(["部署", "月"], observed=True)["売上"].sum(),
+        pd.pivot_table(df, index="部署", columns="月", values="売上", aggfunc="sum", observed=True),
+    ]
+
+
+def one_cube(df: pd.DataFrame) -> list:
+    cube = SalesCube.from_frame(df, dims=["部署", "月"], value="売上")
+    return [
+        cube.mean("部署"),
+        cube.sum("部署"),
+        cube.sum("月"),
+        cube.sum(["部署", "月"]),
+        cube.pivot(index="部署", columns="月", aggfunc="sum"),
+    ]
+
+
+def best_of(func, df: pd.DataFrame, repeat: int) -> tuple[float, list]:
+    """repeat 回実行して、いちばん速かった秒数と結果を返す。"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="集計：groupby ×5 vs 集計キューブ")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="行数")
+    parser.add_argument("--departments", type=int, default=3, help="部署の数")
+    parser.add_argument("--repeat", type=int, default=3, help="くり返す回数（いちばん速い回を表示）")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows, args.departments)
+    print(f"▶ {args.rows:,} 行、部署 {args.departments} × 12か月")
+
+    scans_sec, expected = best_of(five_scans, df, args.repeat)
+    cube_sec, actual = best_of(one_cube, df, args.repeat)
+    same = all(a.equals(e) for a, e in zip(actual, expected))
+    print(f"{'方式':<12} {'秒':>8}")
+    print(f"{'groupby ×5':<12} {scans_sec:>8.3f}")
+    print(f"{'キューブ':<12} {cube_sec:>8.3f}   {scans_sec / cube_sec:.1f} 倍")
+    print("✅ 5つの結果が一致" if same else "⚠ 結果が一致しません")
+
+
+if __name__ == "__main__":
+    main()
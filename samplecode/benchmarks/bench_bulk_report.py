@@ -0,0 +1,68 @@
+# bench_bulk_report.py
+# ========================================
+# 顧客別レポートを何冊も作るとき、1秒あたり何冊作れるかを測る
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_bulk_report.py
+#   python samplecode/benchmarks/bench_bulk_report.py --reports 2000 --jobs 1 2 4 8
+#
+# 方式	内容
+# 1冊ずつ作る	Workbook() で書式・グラフを組み立てて値を入れ、wb.save()（create_excel_file.py と同じ作り方）
+# テンプレート	bulk_report.bulk_generate()（テンプレートのコピーにデータのセルだけを書き込む）。jobs ごとに測る
+#
+# 💡 「1冊ずつ作る」は遅いので、--reports の一部（--baseline-reports 冊）だけで測って冊/秒を比べます。
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bulk_report import SHEET, build_template, bulk_generate, report_edits, sample_reports, template_workbook  # noqa: E402
+
+
+def from_scratch(reports: dict, out_dir: Path, year: int) -> int:
+    for name, rows in reports.items():
+        wb = template_workbook()
+        ws = wb[SHEET]
+        for ref, value in report_edits(name, year, rows).items():
+            ws[ref] = value
+        wb.save(out_dir / f"{name}.xlsx")
+    return len(reports)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="顧客別レポートの一括作成：冊/秒")
+    parser.add_argument("--reports", type=int, default=1000, help="作るレポートの冊数")
+    parser.add_argument("--baseline-reports", type=int, default=100, help="「1冊ずつ作る」で測る冊数")
+    parser.add_argument("--jobs", type=int, nargs="+", help="試すプロセス数（既定：1, 2, 4, … コア数まで）")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    jobs_list = args.jobs or sorted({1, cores} | {2**i for i in range(1, cores.bit_length()) if 2**i <= cores})
+    reports = sample_reports(args.reports)
+    print(f"▶ CPUコア数: {cores}　レポート: {args.reports:,} 冊")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'方式':<16} {'冊数':>7} {'秒':>8} {'冊/秒':>8}")
+        few = dict(list(reports.items())[: args.baseline_reports])
+        out = Path(tmp, "scratch")
+        out.mkdir()
+        started = time.perf_counter()
+        count = from_scratch(few, out, 2024)
+        elapsed = time.perf_counter() - started
+        print(f"{'1冊ずつ作る':<16} {count:>7,} {elapsed:>8.2f} {count / elapsed:>8.0f}")
+
+        template = build_template(Path(tmp, "template.xlsx"))
+        for jobs in jobs_list:
+            started = time.perf_counter()
+            files = bulk_generate(template, reports, Path(tmp, f"jobs{jobs}"), 2024, jobs)
+            elapsed = time.perf_counter() - started
+            label = f"テンプレート jobs={jobs}"
+            print(f"{label:<16} {len(files):>7,} {elapsed:>8.2f} {len(files) / elapsed:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
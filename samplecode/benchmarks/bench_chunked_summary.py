@@ -0,0 +1,77 @@
+# bench_chunked_summary.py
+# ========================================
+# 大きな売上CSVの月別集計を、「丸ごと読む」と「chunksize 行ずつ読む」で時間・最大メモリを比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_chunked_summary.py
+#   python samplecode/benchmarks/bench_chunked_summary.py --rows 20000000 --chunksize 100000 1000000
+#
+# 方式	内容
+# 丸ごと	csv_monthly_summary.py と同じ（pd.read_csv → groupby("月")）
+# chunksize=N	chunked_summary.monthly_sales_chunked()（N 行ずつ読んで部分合計を足す）
+#
+# 💡 最大メモリ（最大RSS）は方式ごとに別のプロセスで測ります（前の方式のメモリが混ざらないように）。
+#    丸ごとの方は行数に比例して増え、chunksize の方は行数を増やしてもほとんど変わりません。
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "csv_practice"))
+from benchmarks.bench_columnar_io import make_sales_csv  # noqa: E402
+from chunked_summary import monthly_sales_chunked  # noqa: E402
+
+
+def whole(path: Path) -> pd.DataFrame:
+    df = pd.read_csv(path)
+    df["日付"] = pd.to_datetime(df["日付"])
+    df["月"] = df["日付"].dt.month
+    return df.groupby("月")["売上金額"].sum().reset_index()
+
+
+def run(chunksize: int | None, path: str, results) -> None:
+    """子プロセスで1方式を実行し、(秒, 最大RSS KB, 結果) を返す。"""
+    started = time.perf_counter()
+    result = whole(Path(path)) if chunksize is None else monthly_sales_chunked(path, chunksize)
+    elapsed = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, rss // (1024 if sys.platform == "darwin" else 1), result))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="月別集計：丸ごと読む vs chunksize 行ずつ読む")
+    parser.add_argument("--rows", type=int, default=5_000_000, help="CSVの行数")
+    parser.add_argument("--chunksize", type=int, nargs="+", default=[100_000, 1_000_000], help="試す chunksize")
+    parser.add_argument("--skip-whole", action="store_true", help="丸ごと読む方式を測らない（メモリが足りないとき）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "sales.csv")
+        make_sales_csv(path, args.rows)
+        print(f"▶ CSV: {args.rows:,} 行、{path.stat().st_size / 1024 / 1024:.0f} MB")
+
+        methods = ([] if args.skip_whole else [None]) + args.chunksize
+        context = multiprocessing.get_context("spawn")
+        print(f"{'方式':<18} {'秒':>8} {'最大RSS MB':>11}")
+        baseline = None
+        for chunksize in methods:
+            results = context.Queue()
+            process = context.Process(target=run, args=(chunksize, str(path), results))
+            process.start()
+            elapsed, rss_kb, result = results.get()
+            process.join()
+            label = "丸ごと" if chunksize is None else f"chunksize={chunksize:,}"
+            same = "" if baseline is None or result.equals(baseline) else "  ⚠ 結果が一致しません"
+            baseline = result if baseline is None else baseline
+            print(f"{label:<18} {elapsed:>8.2f} {rss_kb / 1024:>11.0f}{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# bench_excel_chart_batch.py
+# ========================================
+# 何百もの部署のグラフを作るとき、「まとめずにグラフ化」と「max_points でまとめてからグラフ化」で
+# 作成時間・ファイルサイズ・グラフの点の数を比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_excel_chart_batch.py
+#   python samplecode/benchmarks/bench_excel_chart_batch.py --departments 500 --days 730 --max-points 52
+#
+# 方式	内容
+# まとめない	全部の行をそのままグラフにする（1グラフの点＝日数）
+# まとめる	max_points 個以下にまとめた「集計」シートをグラフにする（元データも残す）
+# まとめる＋元データなし	keep_raw=False（ファイルに入るのは集計した行だけ）
+#
+# 💡 Excel で開く時間は、おおよそ「グラフの点の総数」と「ファイルサイズ」で決まります。
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from excel_chart_batch import build_group_charts, sample_groups  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="部署別グラフの一括作成：まとめる・まとめない")
+    parser.add_argument("--departments", type=int, default=300, help="部署の数")
+    parser.add_argument("--days", type=int, default=365, help="1部署あたりの日数（行数）")
+    parser.add_argument("--max-points", type=int, default=52, help="まとめるときの点の数の上限")
+    args = parser.parse_args()
+
+    groups = sample_groups(args.departments, args.days)
+    print(f"▶ {args.departments} 部署 × {args.days} 日 = {args.departments * args.days:,} 行")
+    methods = [
+        ("まとめない", {}),
+        ("まとめる", {"max_points": args.max_points}),
+        ("まとめる＋元データなし", {"max_points": args.max_points, "keep_raw": False}),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'方式':<14} {'秒':>7} {'MB':>6} {'グラフの点の総数':>14}")
+        for i, (label, options) in enumerate(methods):
+            out = Path(tmp, f"charts{i}.xlsx")
+            started = time.perf_counter()
+            ranges = build_group_charts(out, groups.items(), "日付", ["売上", "利益"], **options)
+            elapsed = time.perf_counter() - started
+            points = sum(r.points for r in ranges.values())
+            print(f"{label:<14} {elapsed:>7.2f} {out.stat().st_size / 1024 / 1024:>6.1f} {points:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# bench_indexed_query.py
+# ========================================
+# 同じ社員名簿に何千回も「抽出・並び替え」をするとき、
+# df を毎回全部見る方式（filter_and_sort.py の元の書き方）と IndexedTable（索引）を比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_indexed_query.py
+#   python samplecode/benchmarks/bench_indexed_query.py --rows 100000 --queries 5000
+#
+# 問い合わせ	df で書くと
+# 部署が一致	df[df["部署"] == 部署]
+# 給与の範囲	df[df["給与"].between(下限, 下限 + 4000)]
+# 部署＋給与の上位10人	df[df["部署"] == 部署].sort_values("給与", ascending=False).head(10)
+#
+# 💡 部署は 200 種類（1つの部署は全体の 0.5%）。索引を作る時間は別に表示します。
+# 💡 全部の問い合わせで、2つの方式の結果が一致することも確かめます。
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "csv_practice"))
+from indexed_query import IndexedTable  # noqa: E402
+
+
+def make_staff(rows: int, departments: int, seed: int = 0) -> pd.DataFrame:
+    """名前・部署・年齢・給与の表（sample.csv と同じ形。部署は category）。"""
+    rng = np.random.default_rng(seed)
+    names = [f"部署{i:03d}" for i in range(departments)]
+    return pd.DataFrame(
+        {
+            "名前": pd.array([f"社員{i:07d}" for i in range(rows)], dtype="string"),
+            "部署": pd.Categorical.from_codes(rng.integers(0, departments, rows), categories=names),
+            "年齢": rng.integers(20, 65, rows),
+            "給与": rng.integers(200, 1_000, rows) * 1_000,
+        }
+    )
+
+
+QUERIES = {
+    "部署が一致": (
+        lambda df, d, pay: df[df["部署"] == d],
+        lambda t, d, pay: t.select({"部署": d}),
+    ),
+    "給与の範囲": (
+        lambda df, d, pay: df[df["給与"].between(pay, pay + 4_000)],
+        lambda t, d, pay: t.select({"給与": (pay, pay + 4_000)}),
+    ),
+    "部署＋給与の上位10人": (
+        lambda df, d, pay: df[df["部署"] == d].sort_values("給与", ascending=False, kind="stable").head(10),
+        lambda t, d, pay: t.select({"部署": d}, order_by="給与", ascending=False, limit=10),
+    ),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="抽出・並び替え：毎回全部見る vs 索引")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="社員の数")
+    parser.add_argument("--departments", type=int, default=200, help="部署の数")
+    parser.add_argument("--queries", type=int, default=1_000, help="問い合わせの回数（種類ごと）")
+    args = parser.parse_args()
+
+    df = make_staff(args.rows, args.departments)
+    started = time.perf_counter()
+    table = IndexedTable(df)
+    print(f"▶ {args.rows:,} 行、索引を作る時間 {time.perf_counter() - started:.2f} 秒")
+
+    rng = np.random.default_rng(1)
+    departments = rng.choice(df["部署"].cat.categories, args.queries)
+    pays = rng.integers(200, 1_000, args.queries) * 1_000
+    params = [(str(d), int(pay)) for d, pay in zip(departments, pays)]
+    print(f"{'問い合わせ':<14} {'全部見る 秒':>11} {'索引 秒':>9} {'倍':>7}")
+    for name, (scan, indexed) in QUERIES.items():
+        scan_sec = index_sec = 0.0
+        same = True
+        for d, pay in params:  # 結果は1回ずつ比べて捨てる（全部ためるとメモリが足りなくなる）
+            started = time.perf_counter()
+            expected = scan(df, d, pay)
+            scan_sec += time.perf_counter() - started
+            started = time.perf_counter()
+            actual = indexed(table, d, pay)
+            index_sec += time.perf_counter() - started
+            same = same and actual.equals(expected) and actual.index.equals(expected.index)
+        mark = "" if same else "  ⚠ 結果が一致しません"
+        print(f"{name:<14} {scan_sec:>11.2f} {index_sec:>9.2f} {scan_sec / index_sec:>7.1f}{mark}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# bench_kakeibo_batch.py
+# ========================================
+# 複数の家計簿をまとめて集計するとき、プロセス数を増やすとどれだけ速くなるかを測る
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_kakeibo_batch.py
+#   python samplecode/benchmarks/bench_kakeibo_batch.py --files 16 --rows 50000 --jobs 1 2 4 8
+#
+# 列	内容
+# jobs	同時に動かすプロセス数（kakeibo_batch.batch_totals の jobs）
+# 秒	全ブックの部分合計を求めて、まとめ終わるまでの時間
+# 倍率	jobs=1 のときと比べて何倍速いか（理想はコア数まで jobs と同じ数字）
+#
+# 💡 CPUのコア数より多い jobs は速くなりません（このマシンのコア数を最初に表示します）。
+# 💡 どの jobs でも、まとめた結果が jobs=1 と一致することも確かめます。
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.bench_kakeibo_stream import make_ledger  # noqa: E402
+from kakeibo_batch import batch_totals, merge_totals  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="複数家計簿の集計：プロセス数と時間")
+    parser.add_argument("--files", type=int, default=8, help="家計簿の数")
+    parser.add_argument("--rows", type=int, default=20_000, help="1ブックあたりの行数")
+    parser.add_argument("--jobs", type=int, nargs="+", help="試すプロセス数（既定：1, 2, 4, … コア数まで）")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    jobs_list = args.jobs or sorted({1, cores} | {2**i for i in range(1, cores.bit_length()) if 2**i <= cores})
+    print(f"▶ CPUコア数: {cores}　家計簿: {args.files} 冊 × {args.rows:,} 行")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = [Path(tmp, f"member{i:02d}.xlsx") for i in range(args.files)]
+        for i, path in enumerate(files):
+            make_ledger(path, args.rows, seed=i)
+
+        print(f"{'jobs':>5} {'秒':>8} {'倍率':>6}")
+        base_time = base_totals = None
+        for jobs in jobs_list:
+            started = time.perf_counter()
+            partials, errors = batch_totals(files, jobs=jobs)
+            merged = merge_totals(list(partials.values()))
+            elapsed = time.perf_counter() - started
+            base_time = base_time or elapsed
+            same = "" if base_totals is None or merged == base_totals else "  ⚠ 結果が一致しません"
+            base_totals = base_totals or merged
+            print(f"{jobs:>5} {elapsed:>8.2f} {base_time / elapsed:>6.2f}{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# bench_kakeibo_stream.py
+# ========================================
+# 100万行の家計簿で、カテゴリ別合計の「最小コード方式」と「ストリーミング方式」を比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_kakeibo_stream.py
+#   python samplecode/benchmarks/bench_kakeibo_stream.py --rows 200000 --baseline
+#
+# 方式	内容
+# 最小コード	load_workbook(data_only=True) で全体を展開 → ws[f"B{r}"] / ws[f"D{r}"] で1セルずつ（--baseline 時のみ）
+# ストリーミング	kakeibo_stream.category_totals()（read_only ＋ iter_rows(values_only=True)）
+#
+# 💡 方式ごとに新しいプロセスで実行し、そのプロセスの最大メモリ（RSS）を測ります。
+# 💡 家計簿の生成には時間がかかるので、--ledger で同じファイルを使い回せます（無ければ作る）。
+# 💡 read_only でも共有文字列（sharedStrings：セルの文字列の一覧）だけは最初に全部読み込みます。
+#    このベンチの「内容」列は全行ちがう文字列なので、その分だけ行数に応じてメモリが増えます。
+
+import argparse
+import multiprocessing
+import random
+import resource
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from kakeibo_stream import INPUT_SHEET, add_amount, category_totals  # noqa: E402
+
+CATEGORIES = ["食費", "日用品", "交通費", "住居費", "光熱費", "通信費", "医療費", "趣味", "交際費", "教育費"]
+
+
+def make_ledger(path: Path, rows: int, seed: int = 0) -> None:
+    """日付 / カテゴリ / 内容 / 金額 の家計簿を書き込み専用モードで作る。"""
+    rng = random.Random(seed)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(INPUT_SHEET)
+    ws.append(["日付", "カテゴリ", "内容", "金額"])
+    start = date(2015, 1, 1)
+    for i in range(rows):
+        ws.append(
+            [
+                start + timedelta(days=i * 3650 // rows),
+                rng.choice(CATEGORIES),
+                f"明細{i}",
+                rng.randint(100, 20000),
+            ]
+        )
+    wb.save(path)
+
+
+def totals_min(path: Path) -> dict:
+    """kakeibo_category_sum_min.py と同じ読み方（比較用）。"""
+    wb = load_workbook(path, data_only=True)
+    ws_in = wb[INPUT_SHEET]
+    totals = {}
+    for r in range(2, ws_in.max_row + 1):
+        add_amount(totals, ws_in[f"B{r}"].value, ws_in[f"D{r}"].value)
+    return totals
+
+
+def run(method: str, path: str, results) -> None:
+    """子プロセスで1方式を実行し、(秒, 最大RSS KB, 結果) を返す。"""
+    func = totals_min if method == "最小コード" else category_totals
+    started = time.perf_counter()
+    totals = func(Path(path))
+    elapsed = time.perf_counter() - started
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    results.put((elapsed, rss // (1024 if sys.platform == "darwin" else 1), totals))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="家計簿のカテゴリ別合計：最小コード vs ストリーミング")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="家計簿の行数")
+    parser.add_argument("--ledger", type=Path, help="家計簿ファイル（無ければ作成して残す）")
+    parser.add_argument("--baseline", action="store_true", help="最小コード方式も計測する（遅い）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.ledger or Path(tmp, "ledger.xlsx")
+        created = not path.exists()
+        if created:
+            print(f"▶ 家計簿を作成中: {args.rows:,} 行 → {path}")
+            make_ledger(path, args.rows)
+        print(f"▶ 家計簿: {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        methods = (["最小コード"] if args.baseline else []) + ["ストリーミング"]
+        context = multiprocessing.get_context("spawn")
+        print(f"{'方式':<10} {'秒':>8} {'rows/sec':>10} {'最大RSS MB':>11}")
+        baseline = None
+        for method in methods:
+            results = context.Queue()
+            process = context.Process(target=run, args=(method, str(path), results))
+            process.start()
+            elapsed, rss_kb, totals = results.get()
+            process.join()
+            rows = args.rows if created else None  # 既存の家計簿を使うときは行数が分からない
+            speed = f"{rows / elapsed:>10,.0f}" if rows else f"{'-':>10}"
+            same = "" if baseline is None or totals == baseline else "  ⚠ 結果が一致しません"
+            baseline = baseline or totals
+            print(f"{method:<10} {elapsed:>8.2f} {speed} {rss_kb / 1024:>11.0f}{same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# bench_materialized_sales.py
+# ========================================
+# 履歴（CSV の行数）が増えたとき、部署×月の集計にかかる時間を比べる
+#   毎回全部読む（groupby_summary.py と同じ） vs 保存した集計に増えた行だけ足し込む（materialized_sales）
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_materialized_sales.py
+#   python samplecode/benchmarks/bench_materialized_sales.py --history 100000 1000000 --append 1000
+#
+# 方式	内容
+# 全部読む	pd.read_csv → 月を出す → SalesCube.from_frame（CSV 全体を毎回読む）
+# 足し込み	refresh_sales()：前回の offset から、書き足した --append 行だけを読んで SQLite に足し込む
+# 表示だけ	load_cube() → 部署の平均・合計・月の合計・ピボット（CSV は読まない）
+#
+# 💡 最初の全件集計（refresh_sales の "full"）は測る前に済ませておきます。
+# 💡 足し込んだ結果が、CSV を全部読んだ結果と一致することも確かめます。
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "csv_practice"))
+from agg_cube import SalesCube  # noqa: E402
+from materialized_sales import load_cube, refresh_sales  # noqa: E402
+
+DEPARTMENTS = ["営業", "開発", "総務", "経理", "人事"]
+
+
+def sales_rows(rows: int, seed: int) -> pd.DataFrame:
+    """日付・部署・売上の DataFrame（sample_sales.csv と同じ形）。"""
+    rng = np.random.default_rng(seed)
+    days = pd.date_range("2015-01-01", "2024-12-31").strftime("%Y-%m-%d").to_numpy()
+    return pd.DataFrame(
+        {
+            "日付": days[rng.integers(0, len(days), rows)],
+            "部署": np.array(DEPARTMENTS)[rng.integers(0, len(DEPARTMENTS), rows)],
+            "売上": rng.integers(10_000, 500_000, rows),
+        }
+    )
+
+
+def full_scan(path: Path) -> SalesCube:
+    df = pd.read_csv(path)
+    df["月"] = pd.to_datetime(df["日付"]).dt.month
+    return SalesCube.from_frame(df, dims=["部署", "月"], value="売上")
+
+
+def views(cube: SalesCube) -> list:
+    return [cube.mean("部署"), cube.sum("部署"), cube.sum("月"), cube.pivot(index="部署", columns="月")]
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="集計：毎回全部読む vs 増えた行だけ足し込む")
+    parser.add_argument("--history", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000], help="CSVの行数")
+    parser.add_argument("--append", type=int, default=1_000, help="1回に書き足す行数")
+    args = parser.parse_args()
+
+    print(f"{'履歴（行）':>12} {'全部読む 秒':>11} {'足し込み 秒':>11} {'表示だけ 秒':>11}")
+    for history in args.history:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp, "sample_sales.csv")  # schema_loader の SCHEMAS の型で読まれる
+            sales_rows(history, seed=0).to_csv(path, index=False)
+            refresh_sales(path)  # 最初の全件集計（ここは測らない）
+
+            sales_rows(args.append, seed=1).to_csv(path, mode="a", header=False, index=False)
+            scan_sec, expected = timed(full_scan, path)
+            append_sec, (cube, mode, rows) = timed(refresh_sales, path)
+            query_sec, actual = timed(lambda: views(load_cube(path.with_suffix(".agg.sqlite"))))
+
+            same = all(a.astype(float).equals(e.astype(float)) for a, e in zip(actual, views(expected)))
+            mark = "" if mode == "incremental" and rows == args.append and same else "  ⚠ 結果が一致しません"
+            print(f"{history:>12,} {scan_sec:>11.3f} {append_sec:>11.3f} {query_sec:>11.3f}{mark}")
+
+
+if __name__ == "__main__":
+    main()
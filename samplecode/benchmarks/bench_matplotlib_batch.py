@@ -0,0 +1,79 @@
+# bench_matplotlib_batch.py
+# ========================================
+# たくさんのグラフを PNG / SVG に書き出すとき、1秒あたり何枚描けるかを測る
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_matplotlib_batch.py
+#   python samplecode/benchmarks/bench_matplotlib_batch.py --charts 400 --format svg --jobs 1 2 4
+#
+# 方式	内容
+# 毎回 plt.subplots()	1枚ごとに図を作って tight_layout() → savefig() → plt.close()（よくある書き方）
+# 使い回し jobs=N	matplotlib_batch.render_batch()（プロセスごとに Figure を1つだけ作って描き直す）
+#
+# 💡 CPUのコア数より多い jobs は速くなりません（このマシンのコア数を最初に表示します）。
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from excel_chart_batch import sample_groups  # noqa: E402
+from matplotlib_batch import group_jobs, render_batch, use_cjk_font  # noqa: E402
+
+# pyplot は matplotlib_batch が Agg を指定した後に読み込む
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def with_pyplot(jobs_list) -> None:
+    for job in jobs_list:
+        fig, ax = plt.subplots(figsize=(8, 4.5), dpi=100)
+        x = range(len(job.values))
+        if job.kind == "bar":
+            ax.bar(x, job.values, color="orange")
+        else:
+            ax.plot(x, job.values, color="blue", marker="o", linestyle="-")
+        step = max(1, len(job.labels) // 12)
+        ax.set_xticks(list(x)[::step], [str(label) for label in job.labels[::step]], rotation=30, ha="right")
+        ax.set_title(job.title)
+        fig.tight_layout()
+        fig.savefig(job.out)
+        plt.close(fig)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="グラフの一括描画：枚/秒")
+    parser.add_argument("--charts", type=int, default=100, help="描く枚数（折れ線と棒が半分ずつ）")
+    parser.add_argument("--points", type=int, default=31, help="1枚あたりの点の数")
+    parser.add_argument("--format", choices=["png", "svg"], default="png", help="保存する形式")
+    parser.add_argument("--jobs", type=int, nargs="+", help="試すプロセス数（既定：1, 2, 4, … コア数まで）")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    jobs_options = args.jobs or sorted({1, cores} | {2**i for i in range(1, cores.bit_length()) if 2**i <= cores})
+    groups = {name: rows[: args.points] for name, rows in sample_groups((args.charts + 1) // 2, args.points).items()}
+    use_cjk_font()
+    print(f"▶ CPUコア数: {cores}　{args.charts} 枚 × {args.points} 点（{args.format}）")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'方式':<18} {'秒':>8} {'枚/秒':>8}")
+        jobs_list = group_jobs(groups, Path(tmp, "pyplot"), ["line", "bar"], [args.format])[: args.charts]
+        Path(tmp, "pyplot").mkdir()
+        started = time.perf_counter()
+        with_pyplot(jobs_list)
+        elapsed = time.perf_counter() - started
+        print(f"{'毎回 plt.subplots()':<18} {elapsed:>8.2f} {len(jobs_list) / elapsed:>8.1f}")
+
+        for jobs in jobs_options:
+            jobs_list = group_jobs(groups, Path(tmp, f"jobs{jobs}"), ["line", "bar"], [args.format])[: args.charts]
+            started = time.perf_counter()
+            files = render_batch(jobs_list, jobs)
+            elapsed = time.perf_counter() - started
+            label = f"使い回し jobs={jobs}"
+            print(f"{label:<18} {elapsed:>8.2f} {len(files) / elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bench_plot_downsample.py
+# ========================================
+# 何百万点の時系列を描くとき、「全部の点」「minmax」「lttb」で描く時間・ファイルサイズ・見た目の違いを比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_plot_downsample.py
+#   python samplecode/benchmarks/bench_plot_downsample.py --points 5000000 --skip-full
+#
+# 列	内容
+# 点	実際に描いた点の数
+# PNG秒 / SVG秒	減らす時間 ＋ 描いて保存する時間
+# PNG KB / SVG KB	保存したファイルの大きさ
+# 違うピクセル	全部の点で描いた PNG と比べて、色がはっきり違うピクセルの割合（見た目の違い）
+#
+# 💡 「全部の点」は遅いので、--skip-full で省略できます（そのときは違うピクセルは出しません）。
+# 💡 最後に、データが抜けている（NaN の）所がある売上でも、急増の点が消えないことを確かめます。
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from matplotlib_batch import use_cjk_font  # noqa: E402
+from plot_downsample import downsample, plot_series, sample_series  # noqa: E402
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+
+def draw(times, sales, method, out: Path):
+    fig = Figure(figsize=(8, 4.5), dpi=100)
+    FigureCanvasAgg(fig)  # 保存した PNG と同じピクセルを、あとで buffer_rgba() で取り出す
+    ax = fig.add_subplot()
+    started = time.perf_counter()
+    (line,) = plot_series(ax, times, sales, method=method, linewidth=0.8, color="blue")
+    ax.set_xlim(times[0], times[-1])
+    ax.set_ylim(sales.min(), sales.max())  # 軸の範囲を全方式でそろえて、ピクセルを比べられるようにする
+    fig.savefig(out)
+    elapsed = time.perf_counter() - started
+    pixels = np.asarray(fig.canvas.buffer_rgba())[..., :3].astype(int) if out.suffix == ".png" else None
+    return len(line.get_xdata()), elapsed, out.stat().st_size / 1024, pixels
+
+
+def check_gaps(points: int, width: int = 620) -> None:
+    """NaN の抜けがある売上に急増を5つ入れ、minmax・lttb で減らしても急増と抜けが残るかを表示する。"""
+    times, sales = sample_series(points, seed=1)
+    rng = np.random.default_rng(1)
+    for start in rng.choice(points - points // 50, size=5, replace=False):
+        sales[start : start + points // 100] = np.nan  # 店が閉まっていた時間など（全体の 1% ずつ）
+    spikes = np.linspace(points // 10, points - points // 10, 5).astype(int)
+    sales[spikes] = np.nanmax(sales) * 3  # ほかのどの点よりも大きい急増
+    sales[spikes[0] // 2] = np.nan  # 1つだけの NaN（累積和が NaN になる場合）
+    for method in ["minmax", "lttb"]:
+        index = downsample(times, sales, width, method)
+        kept = np.isin(spikes, index).all()
+        gaps = np.isnan(sales[index]).any()
+        print(f"{method:<8} NaN の抜けあり：急増 {'✅ 全部残る' if kept else '⚠ 消えた'}　抜け {'✅ 途切れる' if gaps else '⚠ つながる'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="大量の点の時系列：全部描く vs 減らしてから描く")
+    parser.add_argument("--points", type=int, default=1_000_000, help="点の数（1分ごとの売上）")
+    parser.add_argument("--skip-full", action="store_true", help="全部の点で描くのを省略（遅いので）")
+    args = parser.parse_args()
+
+    use_cjk_font()
+    times, sales = sample_series(args.points)
+    methods = ([] if args.skip_full else [("全部の点", None)]) + [("minmax", "minmax"), ("lttb", "lttb")]
+    print(f"▶ {args.points:,} 点")
+    print(f"{'方式':<8} {'点':>10} {'PNG秒':>7} {'PNG KB':>8} {'SVG秒':>7} {'SVG KB':>9} {'違うピクセル':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        reference = None
+        for label, method in methods:
+            points, png_time, png_kb, pixels = draw(times, sales, method, Path(tmp, f"{label}.png"))
+            _, svg_time, svg_kb, _ = draw(times, sales, method, Path(tmp, f"{label}.svg"))
+            if method is None:
+                reference = pixels
+            # 各色の差が 64 を超えるピクセルを「はっきり違う」と数える（アンチエイリアスの細かい差は数えない）
+            diff = "-" if reference is None else f"{(np.abs(pixels - reference).max(axis=2) > 64).mean():.3%}"
+            print(f"{label:<8} {points:>10,} {png_time:>7.2f} {png_kb:>8.0f} {svg_time:>7.2f} {svg_kb:>9,.0f} {diff:>10}")
+    check_gaps(args.points)
+
+
+if __name__ == "__main__":
+    main()
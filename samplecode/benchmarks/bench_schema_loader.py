@@ -0,0 +1,101 @@
+# bench_schema_loader.py
+# ========================================
+# 1000万行の売上CSVを、「型を推測して読む」と「型を決めて読む（schema_loader）」で
+# 読み込み時間・最大メモリ・DataFrame の大きさを比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_schema_loader.py
+#   python samplecode/benchmarks/bench_schema_loader.py --rows 2000000
+#
+# 方式	内容
+# 推測	pd.read_csv(path) → pd.to_datetime(df["日付"])（csv_practice のスクリプトと同じ）
+# スキーマ（c）	read_csv_typed(path, schema, engine="c")：dtype 指定・部署と商品名は category・日付は書式つき＋キャッシュ
+# スキーマ（pyarrow）	read_csv_typed(path, schema, engine="pyarrow")：pyarrow.csv で読む
+#
+# 💡 最大メモリ（最大RSS）は方式ごとに別のプロセスで測ります。
+# 💡 全方式で、部署×月の売上合計が一致することも確かめます。
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "csv_practice"))
+from schema_loader import CsvSchema, read_csv_typed  # noqa: E402
+
+SCHEMA = CsvSchema({"部署": "category", "商品名": "category", "売上金額": "int64"}, {"日付": "%Y-%m-%d"})
+DEPARTMENTS = ["営業", "開発", "総務", "経理", "人事", "企画", "製造", "物流"]
+
+
+def make_csv(path: Path, rows: int, seed: int = 0) -> None:
+    """日付・部署・商品名・売上金額の CSV を作る（NumPy で列ごとに作って pyarrow で書くので速い）。"""
+    rng = np.random.default_rng(seed)
+    days = np.datetime_as_string(np.arange(np.datetime64("2015-01-01"), np.datetime64("2025-01-01")))
+    products = np.array([f"商品{i:03d}" for i in range(200)])
+    table = pa.table(
+        {
+            "日付": days[rng.integers(0, len(days), rows)],
+            "部署": np.array(DEPARTMENTS)[rng.integers(0, len(DEPARTMENTS), rows)],
+            "商品名": products[rng.integers(0, len(products), rows)],
+            "売上金額": rng.integers(100, 50_000, rows),
+        }
+    )
+    pa_csv.write_csv(table, path)
+
+
+def load(method: str, path: Path) -> pd.DataFrame:
+    if method == "推測":
+        df = pd.read_csv(path)
+        df["日付"] = pd.to_datetime(df["日付"])
+        return df
+    return read_csv_typed(path, SCHEMA, engine="pyarrow" if "pyarrow" in method else "c")
+
+
+def run(method: str, path: str, results) -> None:
+    """子プロセスで1方式を実行し、(秒, 最大RSS KB, DataFrame のMB, 部署×月の合計) を返す。"""
+    started = time.perf_counter()
+    df = load(method, Path(path))
+    elapsed = time.perf_counter() - started
+    frame_mb = df.memory_usage(deep=True).sum() / 1024 / 1024
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    check = df.groupby([df["部署"].astype(str), df["日付"].dt.month])["売上金額"].sum()
+    results.put((elapsed, rss // (1024 if sys.platform == "darwin" else 1), frame_mb, check))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CSV の読み込み：型の推測 vs スキーマ")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="CSVの行数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp, "sales.csv")
+        context = multiprocessing.get_context("spawn")
+        # CSV は別のプロセスで作る（Linux の最大RSSは子プロセスに引き継がれるので、ここで大きな配列を作らない）
+        maker = context.Process(target=make_csv, args=(path, args.rows))
+        maker.start()
+        maker.join()
+        print(f"▶ CSV: {args.rows:,} 行、{path.stat().st_size / 1024 / 1024:.0f} MB")
+
+        print(f"{'方式':<16} {'秒':>8} {'最大RSS MB':>11} {'DataFrame MB':>13}")
+        baseline = None
+        for method in ["推測", "スキーマ（c）", "スキーマ（pyarrow）"]:
+            results = context.Queue()
+            process = context.Process(target=run, args=(method, str(path), results))
+            process.start()
+            elapsed, rss_kb, frame_mb, check = results.get()
+            process.join()
+            same = "" if baseline is None or check.equals(baseline) else "  ⚠ 結果が一致しません"
+            baseline = check if baseline is None else baseline
+            print(f"{method:<16} {elapsed:>8.2f} {rss_kb / 1024:>11.0f} {frame_mb:>13.0f}{same}")
+
+
+if __name__ == "__main__":
+    main()
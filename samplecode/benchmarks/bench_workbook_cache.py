@@ -0,0 +1,72 @@
+# bench_workbook_cache.py
+# ========================================
+# 同じブックを何度も読み込むとき、pd.read_excel と workbook_cache（Parquet のキャッシュ）を比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_workbook_cache.py
+#   python samplecode/benchmarks/bench_workbook_cache.py --rows 300000 --repeat 5
+#
+# 方式	内容
+# read_excel	毎回 pd.read_excel（XMLを毎回解析）
+# 1回目（保存）	WorkbookCache.read_excel の初回（解析 ＋ Parquet に保存）
+# 2回目以降	WorkbookCache.read_excel（更新時刻・サイズが同じなので Parquet を読むだけ）
+# 更新時刻だけ変更	ファイルを触っただけ（sha256 を計算して中身が同じと確認 → Parquet を読む）
+#
+# 💡 キャッシュは一時フォルダに作るので、samplecode/.workbook_cache には影響しません。
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.bench_kakeibo_stream import make_ledger  # noqa: E402
+from kakeibo_stream import INPUT_SHEET  # noqa: E402
+from workbook_cache import WorkbookCache  # noqa: E402
+
+
+def timed(func) -> tuple[float, pd.DataFrame]:
+    started = time.perf_counter()
+    df = func()
+    return time.perf_counter() - started, df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="pd.read_excel vs workbook_cache")
+    parser.add_argument("--rows", type=int, default=100_000, help="ブックの行数")
+    parser.add_argument("--repeat", type=int, default=3, help="2回目以降を何回測るか（最速を表示）")
+    parser.add_argument("--ledger", type=Path, help="ブック（無ければ作成して残す）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.ledger or Path(tmp, "ledger.xlsx")
+        if not path.exists():
+            print(f"▶ ブックを作成中: {args.rows:,} 行 → {path}")
+            make_ledger(path, args.rows)
+        print(f"▶ ブック: {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        with WorkbookCache(Path(tmp, "cache")) as cache:
+            plain, expected = timed(lambda: pd.read_excel(path, INPUT_SHEET))
+            first, _ = timed(lambda: cache.read_excel(path, INPUT_SHEET))
+            hit, df = min(timed(lambda: cache.read_excel(path, INPUT_SHEET)) for _ in range(args.repeat))
+            os.utime(path)  # 中身はそのまま、更新時刻だけ変える
+            touched, _ = timed(lambda: cache.read_excel(path, INPUT_SHEET))
+
+            print(f"{'方式':<16} {'秒':>8} {'倍率':>8}")
+            for label, seconds in [
+                ("read_excel", plain),
+                ("1回目（保存）", first),
+                ("2回目以降", hit),
+                ("更新時刻だけ変更", touched),
+            ]:
+                print(f"{label:<16} {seconds:>8.3f} {plain / seconds:>7.1f}x")
+            same = "一致" if df.equals(expected) else "⚠ 一致しません"
+            print(f"▶ キャッシュの表と read_excel の表: {same}（保存サイズ {cache.total_bytes() / 1024 / 1024:.1f} MB）")
+
+
+if __name__ == "__main__":
+    main()
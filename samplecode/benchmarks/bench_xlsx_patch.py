@@ -0,0 +1,87 @@
+# bench_xlsx_patch.py
+# ========================================
+# 大きなブックの B1 / D1 / F1 を書き換えて B1 を読み直す処理を、
+# 「load_workbook → save」と「xlsx_patch」で比べる
+# ========================================
+# 実行例：
+#   python samplecode/benchmarks/bench_xlsx_patch.py
+#   python samplecode/benchmarks/bench_xlsx_patch.py --rows 1000000 --ledger /tmp/ledger.xlsx --skip-openpyxl
+#
+# 方式	書き込み	読み直し
+# openpyxl	load_workbook(SRC) → ws["B1"] = … → wb.save(OUT)	load_workbook(OUT) → ws["B1"].value
+# xlsx_patch	patch_cells(SRC, {...}, OUT)	read_cell(OUT, "B1")
+#
+# 💡 xlsx_patch は「そのまま」コピーした zip メンバーの数も表示します（圧縮データが1バイトも変わっていないもの）。
+
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from benchmarks.bench_kakeibo_stream import make_ledger  # noqa: E402
+from xlsx_patch import patch_cells, read_cell  # noqa: E402
+
+EDITS = {"B1": 12345, "D1": "こんにちは openpyxl!", "F1": datetime(2025, 1, 1, 9, 0)}
+
+
+def with_openpyxl(src: Path, out: Path):
+    wb = load_workbook(src)
+    ws = wb.active
+    for ref, value in EDITS.items():
+        ws[ref] = value
+    wb.save(out)
+    started = time.perf_counter()
+    value = load_workbook(out).active["B1"].value
+    return value, time.perf_counter() - started
+
+
+def with_patch(src: Path, out: Path):
+    patch_cells(src, EDITS, out)
+    started = time.perf_counter()
+    value = read_cell(out, "B1")
+    return value, time.perf_counter() - started
+
+
+def unchanged_members(src: Path, out: Path) -> str:
+    """圧縮データまで同じ（CRC と圧縮後サイズが一致）メンバーの数 / 全メンバー数"""
+    with zipfile.ZipFile(src) as a, zipfile.ZipFile(out) as b:
+        after = {i.filename: (i.CRC, i.compress_size) for i in b.infolist()}
+        same = sum(after.get(i.filename) == (i.CRC, i.compress_size) for i in a.infolist())
+        return f"{same}/{len(a.infolist())}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="数セルの書き換え：load_workbook → save vs xlsx_patch")
+    parser.add_argument("--rows", type=int, default=100_000, help="ブックの行数")
+    parser.add_argument("--ledger", type=Path, help="ブック（無ければ作成して残す）")
+    parser.add_argument("--skip-openpyxl", action="store_true", help="load_workbook → save を測らない（遅いので）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = args.ledger or Path(tmp, "ledger.xlsx")
+        if not src.exists():
+            print(f"▶ ブックを作成中: {args.rows:,} 行 → {src}")
+            make_ledger(src, args.rows)
+        print(f"▶ ブック: {src.stat().st_size / 1024 / 1024:.1f} MB")
+        work = Path(tmp, "work.xlsx")
+        shutil.copy(src, work)  # 元のブックは書き換えない
+
+        methods = ([] if args.skip_openpyxl else [("openpyxl", with_openpyxl)]) + [("xlsx_patch", with_patch)]
+        print(f"{'方式':<11} {'書き込み秒':>10} {'読み直し秒':>10} {'B1':>7} {'同じメンバー':>12}")
+        for label, run in methods:
+            out = Path(tmp, f"{label}.xlsx")
+            started = time.perf_counter()
+            value, read_time = run(work, out)
+            total = time.perf_counter() - started
+            print(f"{label:<11} {total - read_time:>10.3f} {read_time:>10.3f} {value!s:>7} {unchanged_members(work, out):>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+# 顧客別レポートの一括作成（テンプレート方式）
+# 書式・見出し・グラフを入れた「ひな形（テンプレート）」のブックを1回だけ作り、
+# 顧客ごとにデータのセルだけを書き込んだコピーを、複数のプロセスで同時に作る。
+#
+# 使い方（ターミナルで実行）
+#   python samplecode/bulk_report.py 顧客別売上.csv --out reports/
+#   python samplecode/bulk_report.py 顧客別売上.csv --out reports/ --year 2024 --jobs 4
+#   python samplecode/bulk_report.py --sample 1000 --out reports/        ← 試し用のデータで作る
+#
+# 入力CSV（1行＝1顧客の1か月分）
+#   顧客名	月	売上	利益
+#   山田商店	1	120000	24000
+#   山田商店	2	150000	30000
+#
+# 💡 create_excel_file.py や excel_chart_basic.py のように Workbook() から1冊ずつ作ると、
+#    毎回「書式を作る → グラフを組み立てる → 全部をXMLにして zip に圧縮する」をくり返します。
+#    中身が違うのはデータのセルだけなので、それ以外はテンプレートのものをそのまま使い回せます。
+# 💡 書き込みは xlsx_patch.patch_cells() で行います。テンプレートのシートのXMLだけを書き換え、
+#    書式（styles.xml）やグラフ（xl/charts/chart1.xml）は圧縮されたまま1バイトも変えずにコピーします。
+#    データのセルの書式（桁区切りや罫線）は、テンプレートのセルに付けたものがそのまま残ります。
+
+import argparse
+import csv
+import os
+import random
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from openpyxl import Workbook
+from openpyxl.chart import BarChart, Reference
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+from xlsx_patch import Text, patch_cells
+
+SHEET = "月次レポート"
+TITLE = "顧客別 月次売上レポート"
+HEADERS = ["月", "売上", "利益"]
+MONTHS = 12  # テンプレートに用意するデータ行の数
+HEADER_ROW = 5
+FIRST_ROW = HEADER_ROW + 1  # データの1行目（6行目）
+CUSTOMER_CELL = "B2"
+YEAR_CELL = "B3"
+DEFAULT_OUT = Path("reports")
+
+
+# ---- 1) テンプレートを作る（1回だけ） ----
+def template_workbook(months: int = MONTHS) -> Workbook:
+    """書式・見出し・合計の数式・棒グラフを入れた、データが空のブックを作る。
+
+    データのセル（A6:C17）は値を入れずに書式だけ付けておく。
+    patch_cells() で値を書き込んでも、この書式（s="…"）はそのまま残る。
+    """
+    last = FIRST_ROW + months - 1
+    thin = Side(style="thin", color="999999")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = SHEET
+    ws["A1"] = TITLE
+    ws["A1"].font = Font(size=14, bold=True)
+    ws["A2"], ws["A3"] = "顧客名", "対象年"
+    ws[CUSTOMER_CELL].font = Font(bold=True)
+    ws[YEAR_CELL].alignment = Alignment(horizontal="left")
+
+    for col, name in enumerate(HEADERS, start=1):
+        cell = ws.cell(row=HEADER_ROW, column=col, value=name)
+        cell.font = Font(bold=True, color="FFFFFF")
+        cell.fill = PatternFill("solid", fgColor="4F81BD")
+        cell.alignment = Alignment(horizontal="center")
+        cell.border = border
+    for row in range(FIRST_ROW, last + 1):
+        for col in range(1, len(HEADERS) + 1):
+            cell = ws.cell(row=row, column=col)  # 値は入れない（書式だけのセル）
+            cell.border = border
+            cell.number_format = "@" if col == 1 else "#,##0"
+
+    total = last + 1
+    ws.cell(row=total, column=1, value="合計").font = Font(bold=True)
+    for col in (2, 3):
+        letter = "BC"[col - 2]
+        cell = ws.cell(row=total, column=col, value=f"=SUM({letter}{FIRST_ROW}:{letter}{last})")
+        cell.font = Font(bold=True)
+        cell.number_format = "#,##0"
+        cell.border = border
+    ws.column_dimensions["A"].width = 10
+    ws.column_dimensions["B"].width = 14
+    ws.column_dimensions["C"].width = 14
+
+    chart = BarChart()
+    chart.title = "月別売上・利益"
+    chart.x_axis.title = "月"
+    chart.y_axis.title = "金額（円）"
+    chart.add_data(Reference(ws, min_col=2, max_col=3, min_row=HEADER_ROW, max_row=last), titles_from_data=True)
+    chart.set_categories(Reference(ws, min_col=1, min_row=FIRST_ROW, max_row=last))
+    ws.add_chart(chart, "E2")
+    return wb
+
+
+def build_template(path, months: int = MONTHS) -> Path:
+    """テンプレートのブックを path に保存する。"""
+    path = Path(path)
+    template_workbook(months).save(path)
+    return path
+
+
+# 🔹 ポイント
+# テンプレートに入れるもの	見出し・書式・合計の数式・グラフ（どの顧客でも同じ部分）
+# 顧客ごとに書くもの	B2（顧客名）・B3（対象年）・A6:C17（月・売上・利益）だけ
+# Text(顧客名)	"=" で始まる顧客名も文字列のまま書く（数式として動かない）
+# グラフのデータ範囲	A6:C17 を指しているので、セルに値が入れば Excel で開いたときにグラフも描かれる
+
+
+# ---- 2) 1顧客分を書き込む（子プロセスで実行） ----
+def report_edits(customer: str, year, rows: list, months: int = MONTHS) -> dict:
+    """1顧客分の {セル番地: 値}。rows は [(月, 売上, 利益), …]（テンプレートの行数まで）。
+
+    顧客名と月は CSV から来る文字なので Text にする（"=…" で始まる名前を数式として書かない）。
+    """
+    if len(rows) > months:
+        raise ValueError(f"{customer}: {len(rows)} 行あります（テンプレートは {months} 行まで）")
+    edits = {CUSTOMER_CELL: Text(customer)}
+    if year is not None:
+        edits[YEAR_CELL] = year
+    # 余った行には何も書かない（None を書くとセルごと消えて、罫線などの書式もなくなる）
+    for row, (month, sales, profit) in enumerate(rows, start=FIRST_ROW):
+        edits[f"A{row}"] = Text(f"{month}月")
+        edits[f"B{row}"] = sales
+        edits[f"C{row}"] = profit
+    return edits
+
+
+def stamp(template: Path, out: Path, customer: str, year, rows: list, months: int = MONTHS) -> Path:
+    """テンプレートに1顧客分の値を書き込んだコピーを out に保存する。"""
+    return patch_cells(template, report_edits(customer, year, rows, months), out, sheet=SHEET)
+
+
+def _stamp_job(job) -> Path:
+    return stamp(*job)
+
+
+def safe_filename(name: str) -> str:
+    """ファイル名に使えない文字（\\ / : * ? " < > |）を _ に置き換える。"""
+    return re.sub(r'[\\/:*?"<>|]', "_", name).strip() or "_"
+
+
+def output_paths(names, out_dir: Path, suffix: str = ".xlsx") -> list[Path]:
+    """顧客名ごとの保存先。置き換えたあとの名前が重なったら _2, _3 … をつける（上書きしない）。
+
+    "A/B" と "A:B" はどちらも A_B になるので、2つ目は A_B_2.xlsx。
+    Windows・Mac では大文字と小文字を区別しないので、重なりも区別せずに数える。
+    suffix	ファイル名の最後につける文字（matplotlib_batch.py は "" にして、あとから種類と拡張子をつける）
+    """
+    used: set[str] = set()
+    paths = []
+    for name in names:
+        stem = base = safe_filename(str(name))
+        number = 1
+        while stem.casefold() in used:
+            number += 1
+            stem = f"{base}_{number}"
+        used.add(stem.casefold())
+        paths.append(Path(out_dir) / f"{stem}{suffix}")
+    return paths
+
+
+def bulk_generate(
+    template: Path,
+    reports: dict[str, list],
+    out_dir: Path,
+    year=None,
+    jobs: int | None = None,
+    months: int = MONTHS,
+) -> list[Path]:
+    """reports（{顧客名: [(月, 売上, 利益), …]}）の顧客ごとに1冊ずつ作り、作ったファイルの一覧を返す。"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    work = [
+        (template, out, name, year, rows, months)
+        for out, (name, rows) in zip(output_paths(reports, out_dir), reports.items())
+    ]
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(work) or 1))
+    if jobs == 1:  # 1プロセスなら、プロセスを起動する手間を省いてそのまま実行
+        return [_stamp_job(job) for job in work]
+    # 1冊は数ミリ秒で終わるので、何冊かずつまとめて渡してプロセス間のやり取りを減らす
+    chunksize = max(1, len(work) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(_stamp_job, work, chunksize=chunksize))
+
+
+# 🔹 ポイント
+# ProcessPoolExecutor	1冊ずつ別のプロセスで作る（zip の圧縮は CPU を使うので、スレッドより速い）
+# pool.map(chunksize=…)	数千冊でも、子プロセスへの受け渡しは「何冊かずつ」なので待ち時間が少ない
+# 子プロセスに渡すもの	テンプレートのパスと1顧客分の行だけ（ブックの中身は渡さない）
+
+
+# ---- 3) 入力データ ----
+def read_reports(csv_path) -> dict[str, list]:
+    """顧客名・月・売上・利益の CSV を {顧客名: [(月, 売上, 利益), …]}（月の順）にする。"""
+    reports: dict[str, list] = {}
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        for record in csv.DictReader(f):
+            row = (int(record["月"]), _number(record["売上"]), _number(record["利益"]))
+            reports.setdefault(record["顧客名"], []).append(row)
+    for rows in reports.values():
+        rows.sort()
+    return reports
+
+
+def _number(text: str):
+    value = float(text.replace(",", ""))
+    return int(value) if value.is_integer() else value
+
+
+def sample_reports(customers: int, seed: int = 0) -> dict[str, list]:
+    """試し用：顧客ごとに12か月分の売上・利益を乱数で作る。"""
+    rng = random.Random(seed)
+    reports = {}
+    for i in range(1, customers + 1):
+        base = rng.randint(50, 500) * 1000
+        rows = []
+        for month in range(1, 13):
+            sales = int(base * rng.uniform(0.7, 1.3))
+            rows.append((month, sales, int(sales * rng.uniform(0.1, 0.3))))
+        reports[f"顧客{i:05d}"] = rows
+    return reports
+
+
+# ---- 4) コマンドラインから実行 ----
+def main() -> None:
+    parser = argparse.ArgumentParser(description="テンプレートから顧客別レポートを一括作成")
+    parser.add_argument("csv", nargs="?", type=Path, help="顧客名・月・売上・利益の CSV")
+    parser.add_argument("--sample", type=int, help="CSV の代わりに、試し用のデータを N 顧客分作る")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="出力フォルダ")
+    parser.add_argument("--year", type=int, help="レポートに書く対象年")
+    parser.add_argument("--template", type=Path, help="テンプレートの保存先（既定：作業用の一時ファイル）")
+    parser.add_argument("--jobs", type=int, help="同時に動かすプロセス数（既定：CPUのコア数）")
+    args = parser.parse_args()
+
+    if args.csv is not None:
+        reports = read_reports(args.csv)
+    elif args.sample:
+        reports = sample_reports(args.sample)
+    else:
+        parser.error("CSV か --sample N を指定してください")
+    print(f"📂 顧客数: {len(reports)} 件")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = build_template(args.template or Path(tmp, "template.xlsx"))
+        started = time.perf_counter()
+        files = bulk_generate(template, reports, args.out, args.year, args.jobs)
+        elapsed = time.perf_counter() - started
+
+    print("✅ 完了:", args.out.resolve())
+    print(f"   {len(files)} 冊（{elapsed:.2f} 秒、{len(files) / elapsed:,.0f} 冊/秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# agg_cube.py
+# ========================================
+# いちばん細かい単位の「合計・件数」を1回だけ計算し、ほかの集計はすべてそこから作る（集計キューブ）
+# ========================================
+# groupby_summary.py は、同じ表に対して groupby を5回（部署の平均・部署の合計・月の合計・
+# 部署×月の合計・pivot_table）行います。1回ごとに全部の行を「どのグループか」に分け直すので、
+# 1000万行なら1000万行の処理を5回くり返すことになります。
+#
+# 使い方
+#   from agg_cube import SalesCube
+#   cube = SalesCube.from_frame(df, dims=["部署", "月"], value="売上")   ← 全部の行を見るのはここだけ
+#   cube.mean("部署")                 ← df.groupby("部署")["売上"].mean() と同じ
+#   cube.sum("月")                    ← df.groupby("月")["売上"].sum() と同じ
+#   cube.pivot("部署", "月")          ← pd.pivot_table(df, index="部署", columns="月", values="売上", aggfunc="sum") と同じ
+#
+# しくみ
+#   1) 部署×月（いちばん細かい単位）ごとに、売上の合計と件数を出す	全部の行を見るのは1回だけ（部署3つ×12か月なら36行の表）
+#   2) 「部署ごと」「月ごと」は、その小さな表をもう一度まとめる	合計は合計の合計、件数は件数の合計
+#   3) 平均は「合計 ÷ 件数」で出す	平均の平均にはしない（件数がちがうグループがあると値がずれる）
+#
+# 💡 合計・件数・平均は、細かい単位の結果を足し合わせても同じ答えになるので、キューブから作れます。
+#    中央値（median）のように、足し合わせられない集計はキューブからは作れません（元の表で groupby してください）。
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import pandas as pd
+
+MEASURES = ("sum", "count")
+
+
+@dataclass
+class SalesCube:
+    """dims の組み合わせごとの value の合計（sum）と件数（count）。
+
+    cells	index が dims（MultiIndex）、列が sum と count の小さな DataFrame
+    """
+
+    cells: pd.DataFrame
+    dims: tuple[str, ...]
+    value: str
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, dims: list[str], value: str) -> SalesCube:
+        """df を dims でグループに分けるのは、ここの1回だけ（合計と件数を同時に出す）。"""
+        dims = tuple(dims)
+        cells = df.groupby(list(dims), observed=True, sort=True)[value].agg(list(MEASURES))
+        return cls(cells, dims, value)
+
+    # ---- 1) まとめ直す（ロールアップ） ----
+    def rollup(self, by: str | list[str]) -> pd.DataFrame:
+        """by ごとの合計と件数。キューブ（小さな表）をまとめ直すだけで、元の行は見ない。"""
+        by = [by] if isinstance(by, str) else list(by)
+        unknown = [b for b in by if b not in self.dims]
+        if unknown:
+            raise KeyError(f"キューブにない列です: {', '.join(unknown)}（使える列: {', '.join(self.dims)}）")
+        if by == list(self.dims):
+            return self.cells
+        return self.cells.groupby(level=by, observed=True, sort=True).sum()
+
+    def sum(self, by: str | list[str]) -> pd.Series:
+        """df.groupby(by)[value].sum() と同じ。"""
+        return self.rollup(by)["sum"].rename(self.value)
+
+    def count(self, by: str | list[str]) -> pd.Series:
+        """df.groupby(by)[value].count() と同じ（空欄は数えない）。"""
+        return self.rollup(by)["count"].rename(self.value)
+
+    def mean(self, by: str | list[str]) -> pd.Series:
+        """df.groupby(by)[value].mean() と同じ。合計 ÷ 件数で出す。"""
+        totals = self.rollup(by)
+        return (totals["sum"] / totals["count"]).rename(self.value)
+
+    # ---- 2) ピボットテーブル ----
+    def pivot(self, index: str, columns: str, aggfunc: str = "sum") -> pd.DataFrame:
+        """pd.pivot_table(df, index=, columns=, values=value, aggfunc=) と同じ表（aggfunc は sum / count / mean）。"""
+        if aggfunc not in ("sum", "count", "mean"):
+            raise ValueError(f"aggfunc は sum / count / mean にしてください: {aggfunc}")
+        table = getattr(self, aggfunc)([index, columns]).unstack(columns)
+        table.columns.name = columns
+        return table
+
+
+# 🔹 ポイント
+# agg(["sum", "count"])	1回のグループ分けで、合計と件数を同時に出す（グループ分けがいちばん重い処理）
+# groupby(level=...)	MultiIndex の一部（部署だけ・月だけ）でまとめ直す。キューブは数十行なので一瞬
+# unstack(columns)	部署×月の縦長の表を、行＝部署・列＝月の表に並べ替える（pivot_table と同じ形）
+# observed=True	category の列で、データに無い組み合わせ（0件の部署×月）を作らない
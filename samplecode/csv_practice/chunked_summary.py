@@ -0,0 +1,113 @@
+# chunked_summary.py
+# ========================================
+# 何十GBもある売上CSVを、少しずつ（chunksize 行ずつ）読んで月別に集計する
+# ========================================
+# csv_monthly_summary.py は pd.read_csv() でCSVを丸ごとメモリに読んでから groupby("月") します。
+# レジ（POS）から出した何十GBのCSVだと、メモリが足りずに止まってしまいます。
+#
+# 使い方（ターミナルで実行）
+#   python samplecode/csv_practice/chunked_summary.py 売上_2024.csv
+#   python samplecode/csv_practice/chunked_summary.py 売上_2024.csv --chunksize 500000 --out 月別売上集計.xlsx
+#   python samplecode/csv_practice/csv_monthly_summary.py --chunksize 1000000   ← いつもの集計をこの方式で
+#
+# しくみ
+#   1) pd.read_csv(..., usecols=["日付", "売上金額"], chunksize=N)	使う2列だけを N 行ずつ読む
+#   2) かたまりごとに groupby("月").sum()	部分合計（最大12行）
+#   3) 部分合計を足し合わせる	月ごとの合計（csv_monthly_summary.py と同じ表）
+#
+# 💡 メモリに載るのは「N 行 × 2列」と「12行の部分合計」だけなので、CSV が何十GBでも
+#    使うメモリは chunksize で決まります（100万行で数十MB）。
+# 💡 合計の順番が変わるだけなので、金額が整数（円）なら結果は丸ごと読んだときと完全に一致します。
+#    小数の金額は、足す順番の違いで最後の桁がずれることがあります。
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DATE_COLUMN = "日付"
+AMOUNT_COLUMN = "売上金額"
+MONTH_COLUMN = "月"
+DEFAULT_CHUNKSIZE = 1_000_000
+
+
+# ---- 1) かたまりごとの部分合計 ----
+def chunk_totals(chunk: pd.DataFrame, date_col: str = DATE_COLUMN, amount_col: str = AMOUNT_COLUMN) -> pd.Series:
+    """1かたまり分の「月 → 売上金額の合計」（csv_monthly_summary.py と同じ計算）。"""
+    month = pd.to_datetime(chunk[date_col]).dt.month.rename(MONTH_COLUMN)
+    return chunk[amount_col].groupby(month).sum()
+
+
+def merge_partials(total: pd.Series | None, partial: pd.Series) -> pd.Series:
+    """部分合計どうしを月ごとに足す。
+
+    total.add(partial, fill_value=0) だと、片方にしか無い月があると小数（float）になってしまうので、
+    縦につないでから月ごとに sum() する（整数は整数のまま）。
+    """
+    if total is None:
+        return partial
+    return pd.concat([total, partial]).groupby(level=0).sum()
+
+
+# ---- 2) CSV を少しずつ読んで集計 ----
+def monthly_sales_chunked(
+    path,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    date_col: str = DATE_COLUMN,
+    amount_col: str = AMOUNT_COLUMN,
+    **read_kwargs,
+) -> pd.DataFrame:
+    """csv_monthly_summary.py の monthly_sales と同じ表（月・売上金額）を、chunksize 行ずつ読んで作る。
+
+    read_kwargs は pd.read_csv にそのまま渡す（encoding="cp932" など）。
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize は1以上にしてください")
+    total = None
+    with pd.read_csv(path, usecols=[date_col, amount_col], chunksize=chunksize, **read_kwargs) as reader:
+        for chunk in reader:
+            total = merge_partials(total, chunk_totals(chunk, date_col, amount_col))
+    if total is None:  # 見出しだけの空のCSV
+        total = pd.Series([], name=amount_col, dtype="int64", index=pd.Index([], name=MONTH_COLUMN, dtype="int32"))
+    return total.sort_index().rename(amount_col).reset_index()
+
+
+# 🔹 ポイント
+# usecols	使わない列（商品名など）は読み込まない。読む量もメモリも減る
+# chunksize	N 行ずつの DataFrame を順番に返す（with で使うと、途中でエラーになってもファイルを閉じる）
+# 部分合計	かたまりごとに最大12行。何千個あっても足し合わせるのは一瞬
+# 一致の確認	python chunked_summary.py sales_data.csv --check で、丸ごと読んだ結果と比べられる
+
+
+# ---- 3) コマンドラインから実行 ----
+def main() -> None:
+    parser = argparse.ArgumentParser(description="巨大な売上CSVを少しずつ読んで月別に集計")
+    parser.add_argument("csv", type=Path, help="売上CSV（日付・売上金額の列があるもの）")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="一度に読む行数")
+    parser.add_argument("--date", default=DATE_COLUMN, help="日付の列")
+    parser.add_argument("--amount", default=AMOUNT_COLUMN, help="金額の列")
+    parser.add_argument("--encoding", default="utf-8", help="CSVの文字コード（Excel で保存したCSVは cp932）")
+    parser.add_argument("--out", type=Path, help="結果を書き出す Excel（省略時は表示だけ）")
+    parser.add_argument("--check", action="store_true", help="丸ごと読んだ結果と一致するか確かめる（小さいCSV用）")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    monthly_sales = monthly_sales_chunked(args.csv, args.chunksize, args.date, args.amount, encoding=args.encoding)
+    elapsed = time.perf_counter() - started
+    print("=== 月別売上集計 ===")
+    print(monthly_sales)
+    print(f"（{args.chunksize:,} 行ずつ読んで {elapsed:.2f} 秒）")
+
+    if args.check:
+        df = pd.read_csv(args.csv, usecols=[args.date, args.amount], encoding=args.encoding)
+        df[MONTH_COLUMN] = pd.to_datetime(df[args.date]).dt.month
+        expected = df.groupby(MONTH_COLUMN)[args.amount].sum().reset_index()
+        print("✅ 丸ごと読んだ結果と一致" if monthly_sales.equals(expected) else "⚠ 丸ごと読んだ結果と一致しません")
+    if args.out is not None:
+        monthly_sales.to_excel(args.out, index=False)
+        print("✅ 出力:", args.out.resolve())
+
+
+if __name__ == "__main__":
+    main()
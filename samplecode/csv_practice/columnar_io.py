@@ -0,0 +1,185 @@
+# columnar_io.py
+# ========================================
+# Excel / CSV を Parquet・Arrow IPC（列ごとの形式）に変換し、メモリマップで読み直す
+# ========================================
+# 使い方（ターミナルで実行）
+#   python samplecode/csv_practice/columnar_io.py                 ← いつもの入力をまとめて変換
+#   python samplecode/csv_practice/columnar_io.py sales_data.csv --format arrow
+#   python samplecode/csv_practice/columnar_io.py 月別売上集計.xlsx --format both --out converted/
+#
+# 形式	特徴	読み直し方
+# .parquet	圧縮されて小さい。必要な列だけをファイルから読める	pq.read_table(columns=…, memory_map=True)
+# .arrow	圧縮なし（Arrow IPC）。メモリ上の形そのままなので、ほぼ読み込み時間ゼロ	pa.memory_map → ipc.open_file（コピーなし）
+#
+# 💡 xlsx は「zip に入った XML」、CSV は「ただの文字」なので、読むたびに文字を解析して型を決め直します。
+#    Parquet / Arrow は「列ごとに型付きのまま」保存するので、解析がいりません。
+# 💡 メモリマップ（memory map）は、ファイルをメモリのように直接見せる仕組みです。
+#    Arrow IPC なら、ファイルの中身をコピーせずにそのまま表として使えます（ゼロコピー）。
+#    使った列のページだけが実際に読み込まれるので、大きなファイルでも一部の列ならすぐ終わります。
+#
+# 集計スクリプトからは load_table("sales_data.csv", columns=[...]) で読む。
+# 変換済みのファイル（sales_data.arrow / sales_data.parquet）が元のファイルより新しければそちらを、
+# 無ければ（古ければ）これまでどおり CSV / Excel を読みます。
+
+from __future__ import annotations
+
+import argparse
+import glob
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from schema_loader import read_csv_typed
+
+HERE = Path(__file__).resolve().parent
+SAMPLECODE = HERE.parent
+ROOT = SAMPLECODE.parent
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+# 引数なしで実行したときに変換するファイル（無いものは飛ばす）
+DEFAULT_SOURCES = [
+    HERE / "*.csv",
+    HERE / "*.xlsx",
+    SAMPLECODE / "excel_merge" / "merged_sales.xlsx",
+    ROOT / "output" / "books_data.xlsx",  # python-scraping の step03 をリポジトリ直下で実行したとき
+    ROOT / "python-scraping" / "output" / "books_data.xlsx",
+]
+
+
+# ---- 1) 読み込み（CSV / Excel → Arrow の表） ----
+def read_source(path: Path, sheet: str | int | None = None) -> dict[str, pa.Table]:
+    """CSV は1つ、Excel はシートごとに {シート名: 表} を返す（CSV のキーは ""）。"""
+    if path.suffix.lower() == ".csv":
+        # pyarrow の CSV リーダーは複数スレッドで解析するので、pd.read_csv より速い
+        return {"": pa_csv.read_csv(path)}
+    sheets = pd.read_excel(path, sheet_name=sheet if sheet is not None else None)
+    if isinstance(sheets, pd.DataFrame):
+        sheets = {sheet: sheets}
+    return {str(name): _to_arrow(df) for name, df in sheets.items()}
+
+
+def _to_arrow(df: pd.DataFrame) -> pa.Table:
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # 1つの列に文字と数値が混ざっている（Excel ではよくある）→ その列は文字列にそろえる
+        mixed = {c: "string" for c in df.columns if df[c].dtype == object}
+        return pa.Table.from_pandas(df.astype(mixed), preserve_index=False)
+
+
+# ---- 2) 書き出し ----
+def write_table(table: pa.Table, path: Path) -> None:
+    """拡張子に合わせて Parquet か Arrow IPC で保存する（書き終わってから置き換える）。"""
+    part = path.with_name(path.name + ".part")
+    if path.suffix == ".arrow":
+        # 圧縮すると読むときに展開が必要になり、メモリマップのゼロコピーが使えないので圧縮しない
+        with pa.OSFile(str(part), "wb") as sink, ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        pq.write_table(table, part)
+    part.replace(path)
+
+
+def output_paths(src: Path, sheet_name: str, fmt: str, out_dir: Path | None, many_sheets: bool) -> list[Path]:
+    """sales_data.csv → sales_data.parquet、複数シートの Excel は 名前__シート名.parquet"""
+    stem = f"{src.stem}__{sheet_name}" if many_sheets else src.stem
+    folder = out_dir or src.parent
+    return [folder / (stem + FORMATS[f]) for f in (FORMATS if fmt == "both" else [fmt])]
+
+
+def convert(src, fmt: str = "parquet", out_dir: Path | None = None, sheet: str | int | None = None) -> list[Path]:
+    """1ファイルを変換して、書き出したファイルの一覧を返す。"""
+    src = Path(src)
+    tables = read_source(src, sheet)
+    if out_dir is not None:
+        out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, table in tables.items():
+        for path in output_paths(src, name, fmt, out_dir, len(tables) > 1):
+            write_table(table, path)
+            written.append(path)
+    return written
+
+
+# ---- 3) 読み直し（メモリマップ） ----
+def read_table(path, columns: list[str] | None = None) -> pa.Table:
+    """変換済みのファイルを読む。columns を指定すると、その列だけを読む。
+
+    .arrow	ファイルをメモリマップして、コピーせずに表として使う（列の選択もコピーなし）
+    .parquet	memory_map=True で開き、指定した列のデータだけを展開する
+    """
+    path = Path(path)
+    if path.suffix == ".arrow":
+        source = pa.memory_map(str(path), "r")
+        table = ipc.open_file(source).read_all()
+        return table.select(columns) if columns is not None else table
+    return pq.read_table(path, columns=columns, memory_map=True)
+
+
+def converted_path(src: Path) -> Path | None:
+    """src を変換したファイル（.arrow を優先）のうち、src より新しいものを返す。"""
+    mtime = src.stat().st_mtime if src.exists() else 0
+    for suffix in (".arrow", ".parquet"):
+        path = src.with_suffix(suffix)
+        if path.exists() and path.stat().st_mtime >= mtime:
+            return path
+    return None
+
+
+def load_table(src, columns: list[str] | None = None, **read_kwargs) -> pd.DataFrame:
+    """集計スクリプト用：変換済みがあればメモリマップで、無ければ CSV / Excel をそのまま読む。
+
+    read_kwargs は変換済みが無いときの pd.read_csv / pd.read_excel に渡す（sheet_name など）。
+    CSV は schema_loader.SCHEMAS に型があれば、その型で読む（日付は datetime64、部署などは category）。
+    """
+    src = Path(src)
+    converted = converted_path(src)
+    if converted is not None:
+        return read_table(converted, columns).to_pandas(date_as_object=False)  # 日付列は datetime64 に
+    if src.suffix.lower() == ".csv":
+        return read_csv_typed(src, usecols=columns, **read_kwargs)  # 型が決まっている CSV は推測せずに読む
+    df = pd.read_excel(src, **read_kwargs)
+    return df[columns] if columns is not None else df
+
+
+# 🔹 ポイント
+# pa.memory_map	ファイルをメモリとして見せる。読み込んだのと同じように使えるが、実際に読むのは触ったページだけ
+# ipc.open_file(...).read_all()	Arrow IPC の表を、メモリマップ上のデータを指したまま作る（コピーしない）
+# pq.read_table(columns=[...])	Parquet は列ごとに分かれて保存されているので、指定した列以外は読み飛ばす
+# to_pandas()	pandas で集計するときだけ DataFrame に変換する（ここで初めてコピーが起きる）
+
+
+# ---- 4) コマンドラインから実行 ----
+def default_sources() -> list[Path]:
+    found = []
+    for pattern in DEFAULT_SOURCES:
+        found += [Path(p) for p in sorted(glob.glob(str(pattern)))]
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Excel / CSV を Parquet・Arrow IPC に変換する")
+    parser.add_argument("files", nargs="*", type=Path, help="変換するファイル（省略時はいつもの入力）")
+    parser.add_argument("--format", choices=[*FORMATS, "both"], default="both", help="変換先の形式")
+    parser.add_argument("--out", type=Path, help="出力フォルダ（既定：元のファイルと同じ場所）")
+    parser.add_argument("--sheet", help="Excel のシート名（既定：全シート）")
+    args = parser.parse_args()
+
+    files = args.files or default_sources()
+    if not files:
+        raise SystemExit("⚠ 変換するファイルが見つかりません")
+    for src in files:
+        started = time.perf_counter()
+        written = convert(src, args.format, args.out, args.sheet)
+        elapsed = time.perf_counter() - started
+        sizes = ", ".join(f"{p.name}（{p.stat().st_size / 1024:,.0f} KB）" for p in written)
+        print(f"✅ {src.name} → {sizes}  {elapsed:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
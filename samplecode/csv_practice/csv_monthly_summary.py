@@ -1,16 +1,29 @@
+import argparse
+
 import pandas as pd
 
-# CSVファイルの読み込み
-df = pd.read_csv("sales_data.csv")
+from chunked_summary import monthly_sales_chunked
+from columnar_io import load_table
+
+parser = argparse.ArgumentParser(description="売上CSVの月別集計")
+parser.add_argument("--chunksize", type=int, help="この行数ずつ読んで集計する（メモリに載らない巨大なCSV用）")
+args = parser.parse_args()
+
+if args.chunksize:
+    # 巨大なCSV：chunksize 行ずつ読み、月ごとの部分合計を足し合わせる（結果は下と同じ表。chunked_summary.py）
+    monthly_sales = monthly_sales_chunked("sales_data.csv", args.chunksize)
+else:
+    # CSVファイルの読み込み（使う列だけ。変換済みの sales_data.arrow / .parquet があればそちらをメモリマップで読む）
+    df = load_table("sales_data.csv", columns=["日付", "売上金額"])
 
-# 日付をdatetime型に変換
-df["日付"] = pd.to_datetime(df["日付"])
+    # 日付をdatetime型に変換
+    df["日付"] = pd.to_datetime(df["日付"])
 
-# 月を抽出
-df["月"] = df["日付"].dt.month
+    # 月を抽出
+    df["月"] = df["日付"].dt.month
 
-# 月ごとに売上金額を集計
-monthly_sales = df.groupby("月")["売上金額"].sum().reset_index()
+    # 月ごとに売上金額を集計
+    monthly_sales = df.groupby("月")["売上金額"].sum().reset_index()
 
 # ① df.groupby("月")
 # 👉 「月」列をグループ化します。
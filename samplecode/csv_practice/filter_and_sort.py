@@ -1,7 +1,15 @@
-import pandas as pd
+from indexed_query import IndexedTable
+from schema_loader import read_csv_typed
 
-# CSVファイルを読み込む
-df = pd.read_csv("sample.csv")
+# CSVファイルを読み込む（列の型は schema_loader.py の SCHEMAS で決めてある。部署は category）
+df = read_csv_typed("sample.csv")
+
+# 索引をつける（部署はハッシュ索引、年齢・給与は並び順の索引。作るのはここの1回だけ）
+table = IndexedTable(df)
+
+# 💡 IndexedTable は indexed_query.py のクラスです。
+# ②③は df を毎回全部見る代わりに、索引から答えます（結果は同じ）。
+# 同じ表に何千回も抽出・並び替えをするときに速くなります。
 
 # === ① 特定の列を抽出 ===
 print("🟢 部署と給与の列だけを抽出")
@@ -12,21 +20,23 @@ print("-" * 40)
 
 # === ② 条件に合う行だけを抽出 ===
 print("🟡 営業部のデータだけ抽出")
-sales = df[df["部署"] == "営業"]
+sales = table.select({"部署": "営業"})  # df[df["部署"] == "営業"] と同じ
 print(sales)
 print("-" * 40)
 
 # “部署が営業の行だけ” を取り出しています。
 #  条件式（==, >, <, !=など）を自由に使えます。
+#  table.select({"年齢": (30, 39)}) → 30歳以上39歳以下（範囲も索引から探せます）
 
 # === ③ 並び替え ===
 print("🔵 年齢順に並び替え")
-sorted_df = df.sort_values("年齢")
+sorted_df = table.select(order_by="年齢")  # df.sort_values("年齢") と同じ
 print(sorted_df)
 print("-" * 40)
 
 # 年齢を昇順（小さい順）に並べます。
 # 降順にしたい場合は ascending=False をつけます。
+# 索引は「年齢の小さい順の行番号」を覚えているので、並べ替えの計算をしません。
 
 # === ④ 新しい列を追加 ===
 print("🟣 年収（給与×12）を追加")
@@ -0,0 +1,207 @@
+# indexed_query.py
+# ========================================
+# 同じ表に何千回も「抽出・並び替え」をするときは、先に索引（インデックス）を作っておく
+# ========================================
+# filter_and_sort.py の df[df["部署"] == "営業"] は、毎回全部の行と "営業" を比べます。
+# df.sort_values("年齢") も、毎回全部の行を並べ替えます。1回なら一瞬でも、
+# 100万人の表に何千回も問い合わせると、そのたびに100万行を見ることになります。
+#
+# 使い方
+#   from indexed_query import IndexedTable
+#   table = IndexedTable(df)                                        ← 索引を作るのはここの1回だけ
+#   table.select({"部署": "営業"})                                  ← df[df["部署"] == "営業"] と同じ
+#   table.select({"年齢": (30, 39)})                                ← 30歳以上39歳以下（None なら上限・下限なし）
+#   table.select({"部署": ["営業", "開発"]}, order_by="給与", ascending=False, limit=10)
+#
+# 索引	作る列	しくみ
+# ハッシュ索引	部署・名前など（category・文字）	値の一覧（ハッシュ表）と、値ごとにまとめた行番号。"営業" の行を一発で引く
+# 並び順の索引	年齢・給与・日付など（数値・日付）	値を小さい順に並べた配列と行番号。範囲は二分探索（searchsorted）で探す
+#
+# 💡 問い合わせのたびにかかるのは「条件に合う行の数」くらいの時間です（表全体の行数にはほぼよりません）。
+# 💡 結果は df の抽出・並び替えと同じ表（元の index のまま）。同じ値どうしは元の行の順に並びます
+#    （sort_values(kind="stable") と同じ）。数値の空欄（NaN）は、昇順でも降順でも最後です。
+# 💡 索引は作ったときの行を覚えています。行を足したり消したりしたら、IndexedTable を作り直してください
+#    （④のように列を足すだけなら、そのまま使えます）。
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class HashIndex:
+    """1列のハッシュ索引。"""
+
+    keys: pd.Index  # 値の一覧（種類）。get_loc でハッシュ表から何番目の値かを引く
+    order: np.ndarray  # 値ごとにまとめた行番号（同じ値の中は元の行の順）
+    starts: np.ndarray  # keys[i] の行は order[starts[i]:starts[i + 1]]
+
+    @classmethod
+    def build(cls, column: pd.Series) -> HashIndex:
+        codes, keys = pd.factorize(column)  # 空欄は -1
+        order = np.argsort(codes, kind="stable")
+        counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+        skip = int((codes < 0).sum())  # -1（空欄）は order の先頭に並ぶので飛ばす
+        starts = np.concatenate([[0], np.cumsum(counts)]) + skip
+        return cls(pd.Index(np.asarray(keys, dtype=object)), order, starts)  # category も値そのものの一覧にする
+
+    def get(self, values: list) -> list[np.ndarray]:
+        """values のそれぞれに一致する行番号（元の行の順）。無い値は飛ばす。"""
+        found = []
+        for value in values:
+            try:
+                i = self.keys.get_loc(value)
+            except KeyError:
+                continue
+            found.append(self.order[self.starts[i] : self.starts[i + 1]])
+        return found
+
+
+@dataclass
+class SortedIndex:
+    """1列の並び順の索引。"""
+
+    values: np.ndarray  # 小さい順に並べた値（空欄は最後）
+    order: np.ndarray  # values の順に並べた行番号（同じ値は元の行の順）
+    rank: np.ndarray  # 行ごとの順位（同じ値は同じ順位）
+    valid: int  # 空欄でない値の数（values[:valid] が空欄以外）
+
+    @classmethod
+    def build(cls, column: pd.Series) -> SortedIndex:
+        values = column.to_numpy()
+        order = np.argsort(values, kind="stable")
+        ordered = values[order]
+        rank = np.empty(len(values), dtype=np.int64)
+        rank[order] = np.searchsorted(ordered, ordered, side="left")
+        valid = len(values) - int(column.isna().sum())
+        return cls(ordered, order, rank, valid)
+
+    def between(self, low=None, high=None) -> np.ndarray:
+        """low 以上 high 以下の行番号（元の行の順）。None はその側に制限なし。"""
+        start = 0 if low is None else np.searchsorted(self.values[: self.valid], self._bound(low), side="left")
+        stop = self.valid if high is None else np.searchsorted(self.values[: self.valid], self._bound(high), side="right")
+        return np.sort(self.order[start:stop])
+
+    def sort(self, rows: np.ndarray, ascending: bool = True, limit: int | None = None) -> np.ndarray:
+        """rows（元の行の順）を、この列の値の順に並べ替える（limit があれば先頭の limit 行だけ）。同じ値は元の行の順のまま。"""
+        key = self.rank[rows]
+        if not ascending:
+            key = np.where(key < self.valid, -key, self.valid)  # 大きい順。空欄（順位が valid 以上）は最後
+        # 「順位 × 行数 ＋ 何番目の行か」にすると、同じ値でもキーが全部ちがうので、速い（安定でない）並べ替えが使える
+        key = key * len(rows) + np.arange(len(rows))
+        if limit is not None and limit < len(rows):
+            top = np.argpartition(key, limit - 1)[:limit] if limit > 0 else np.array([], dtype=np.int64)
+            return rows[top[np.argsort(key[top])]]
+        return rows[np.argsort(key)]
+
+    def _bound(self, value):
+        return np.asarray(value, dtype=self.values.dtype)  # "2025-01-01" のような文字も日付の列なら日付にする
+
+
+# 🔹 ポイント
+# pd.factorize	列を「値の一覧」と「各行が何番目の値か」に分ける。番号で並べれば、同じ値の行がひとかたまりになる
+# np.argsort(kind="stable")	値の順に並べた行番号。同じ値は元の行の順（sort_values と同じ結果にするため）
+# np.searchsorted	並べた配列の中で、low・high が入る位置を二分探索で探す（100万行でも20回くらいの比較）
+# rank	「この行は何番目に小さいか」。抽出した行だけを並べ替えるときに、値を比べ直さずに済む
+# np.argpartition	上位 limit 件だけを先に選び、その中だけを並べる（全部を並べ替えない）
+
+
+class IndexedTable:
+    """DataFrame に索引をつけて、抽出・並び替えを索引から答える。
+
+    hash_columns	ハッシュ索引を作る列（省略時は category と True/False の列）
+    sorted_columns	並び順の索引を作る列（省略時は数値・日付の列）
+    ここに無い列（名前のような文字の列など）の索引は、その列を初めて条件や並び替えに使ったときに作る。
+    """
+
+    def __init__(self, df: pd.DataFrame, hash_columns: list[str] | None = None, sorted_columns: list[str] | None = None):
+        self.df = df
+        self._hash: dict[str, HashIndex] = {}
+        self._sorted: dict[str, SortedIndex] = {}
+        if hash_columns is None and sorted_columns is None:
+            sorted_columns = [c for c in df.columns if _is_ordered(df[c])]
+            hash_columns = [
+                c for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(df[c])
+            ]
+        for col in hash_columns or []:
+            self._hash[col] = HashIndex.build(df[col])
+        for col in sorted_columns or []:
+            self._sorted[col] = SortedIndex.build(df[col])
+
+    # ---- 1) 索引（無ければ作る） ----
+    def hash_index(self, col: str) -> HashIndex:
+        if col not in self._hash:
+            self._hash[col] = HashIndex.build(self.df[col])
+        return self._hash[col]
+
+    def sorted_index(self, col: str) -> SortedIndex:
+        if col not in self._sorted:
+            if not _is_ordered(self.df[col]):
+                raise TypeError(f"{col} は数値・日付の列ではないので、範囲や並び替えの索引は作れません")
+            self._sorted[col] = SortedIndex.build(self.df[col])
+        return self._sorted[col]
+
+    # ---- 2) 問い合わせ ----
+    def lookup(self, col: str, condition) -> np.ndarray:
+        """1つの条件に合う行番号（元の行の順）。
+
+        condition	値（== と同じ）・リストや集合（isin と同じ）・(下限, 上限) のタプル（以上・以下）
+        """
+        if isinstance(condition, tuple):
+            low, high = condition
+            return self.sorted_index(col).between(low, high)
+        values = list(condition) if isinstance(condition, (list, set, frozenset)) else [condition]
+        if col in self._hash or not _is_ordered(self.df[col]):
+            found = self.hash_index(col).get(values)
+        else:
+            found = [self.sorted_index(col).between(v, v) for v in values]
+        if not found:
+            return np.array([], dtype=np.int64)
+        return found[0] if len(found) == 1 else np.unique(np.concatenate(found))
+
+    def rows(self, where: dict | None = None) -> np.ndarray | None:
+        """where のすべての条件に合う行番号（元の行の順）。条件が無ければ None（全部の行）。"""
+        result = None
+        for col, condition in (where or {}).items():
+            found = self.lookup(col, condition)
+            result = found if result is None else np.intersect1d(result, found, assume_unique=True)
+            if len(result) == 0:
+                break  # もう1行も残っていない
+        return result
+
+    def select(
+        self,
+        where: dict | None = None,
+        order_by: str | None = None,
+        ascending: bool = True,
+        columns: list[str] | None = None,
+        limit: int | None = None,
+    ) -> pd.DataFrame:
+        """where の条件で抽出し、order_by の順に並べた表（df の行をそのまま取り出したもの）。"""
+        rows = self.rows(where)
+        if order_by is not None:
+            index = self.sorted_index(order_by)
+            if rows is None and ascending:
+                rows = index.order  # 全部の行の昇順は、索引の順そのもの（並べ替えなし）
+            else:
+                rows = index.sort(np.arange(len(self.df)) if rows is None else rows, ascending, limit)
+        if limit is not None:
+            rows = np.arange(min(limit, len(self.df))) if rows is None else rows[:limit]
+        result = self.df if rows is None else self.df.iloc[rows]
+        return result if columns is None else result[columns]
+
+
+def _is_ordered(column: pd.Series) -> bool:
+    """並び順の索引を作る列か（数値・日付。True/False は値が2つだけなのでハッシュ索引にする）。"""
+    return (
+        pd.api.types.is_numeric_dtype(column) and not pd.api.types.is_bool_dtype(column)
+    ) or pd.api.types.is_datetime64_any_dtype(column)
+
+
+# 🔹 ポイント
+# select(where=..., order_by=...)	df[条件].sort_values(列) と同じ結果を、全部の行を見ずに作る
+# np.intersect1d	条件が2つ以上なら、それぞれに合う行番号の「共通部分」を取る
+# iloc[行番号]	索引で見つけた行だけを取り出す（元の index はそのまま）
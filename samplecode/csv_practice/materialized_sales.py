@@ -0,0 +1,246 @@
+# materialized_sales.py
+# ========================================
+# 部署×月の売上（合計・件数）を SQLite に保存しておき、CSV に書き足された行だけを足し込む
+# ========================================
+# groupby_summary.py のような集計を数分ごとに実行すると、そのたびに sample_sales.csv を最初から全部読みます。
+# CSV は「下に行を書き足していく」だけなので、前回までの行をもう一度読む必要はありません。
+#
+# 使い方（ターミナルで実行）
+#   python samplecode/csv_practice/materialized_sales.py sample_sales.csv           ← 増えた行を足し込んで表示
+#   python samplecode/csv_practice/materialized_sales.py sample_sales.csv --full    ← 最初から集計し直す
+#
+#   from materialized_sales import refresh_sales, load_cube
+#   cube, mode, rows = refresh_sales("sample_sales.csv")   ← 増えた行だけ読む（戻り値は agg_cube.SalesCube）
+#   cube = load_cube("sample_sales.agg.sqlite")           ← CSV は読まずに、保存した集計だけを使う
+#   cube.sum("部署") / cube.mean("部署") / cube.pivot("部署", "月")
+#
+# 保存先（<CSV名>.agg.sqlite）の表
+#   cells	部署・月ごとの売上の合計（total）と件数（count）。部署3つ×12か月なら36行
+#   source	前回読み終えた位置（offset：ファイルの先頭から何バイト目か）、見出し行と offset 直前のハッシュ、
+#   	ファイルの更新時刻とサイズ、集計に使った列
+#
+# 次回の動き（kakeibo_checkpoint.py と同じ考え方）
+#   1. 更新時刻とサイズが前回と同じ → CSV を開かずに、保存した集計をそのまま使う
+#   2. 見出し行と offset 直前の 4KB が前回と同じ → offset まで読み飛ばし、後ろに増えた行だけを集計して足し込む
+#   3. 違う（ファイルが短くなった・作り直された） → 最初から全部集計し直す
+#
+# 💡 集計を表示するときに読むのは cells（数十行）だけなので、CSV が何年分に増えても速さは変わりません。
+# 💡 足し込みと offset の保存は1つのトランザクションで行います。途中で止まっても「足したのに offset が古い」
+#    （次回2回足してしまう）ことはありません。
+# 💡 行の終わり（改行）まで書かれた行だけを集計します。書きかけの最後の行は、次回に集計されます。
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import sqlite3
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from agg_cube import SalesCube
+from schema_loader import read_csv_typed, schema_for
+
+DATE_COLUMN = "日付"
+GROUP_COLUMN = "部署"
+VALUE_COLUMN = "売上"
+MONTH_COLUMN = "月"
+TAIL_BYTES = 4096  # 前回の続きかどうかを確かめるのに使う、offset 直前のバイト数
+BLOCK_BYTES = 64 << 20  # 一度に読むバイト数（64MB）。初回の全件集計でもメモリはこれくらいで済む
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS cells (
+    grp TEXT NOT NULL,
+    month INTEGER NOT NULL,
+    total NUMERIC NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (grp, month)
+);
+CREATE TABLE IF NOT EXISTS source (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    columns TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    header_hash TEXT NOT NULL,
+    tail_hash TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+"""
+UPSERT_SQL = """
+INSERT INTO cells (grp, month, total, count) VALUES (?, ?, ?, ?)
+ON CONFLICT (grp, month) DO UPDATE SET total = total + excluded.total, count = count + excluded.count
+"""
+
+
+def store_path(path) -> Path:
+    """sample_sales.csv → sample_sales.agg.sqlite"""
+    return Path(path).with_suffix(".agg.sqlite")
+
+
+def connect(db) -> sqlite3.Connection:
+    con = sqlite3.connect(db)
+    con.executescript(SCHEMA_SQL)
+    return con
+
+
+# ---- 1) 保存した集計を読む（CSV は読まない） ----
+def load_cube(db, group_col: str = GROUP_COLUMN, value_col: str = VALUE_COLUMN) -> SalesCube:
+    """保存した cells から SalesCube を作る。読むのは部署×月の数十行だけ。"""
+    con = db if isinstance(db, sqlite3.Connection) else connect(db)
+    try:
+        cells = pd.read_sql_query("SELECT grp, month, total, count FROM cells ORDER BY grp, month", con)
+    finally:
+        if con is not db:
+            con.close()
+    cells = cells.rename(columns={"grp": group_col, "month": MONTH_COLUMN, "total": "sum"})
+    cells = cells.set_index([group_col, MONTH_COLUMN])
+    return SalesCube(cells, (group_col, MONTH_COLUMN), value_col)
+
+
+# 🔹 ポイント
+# ON CONFLICT ... DO UPDATE	同じ部署・月の行があれば、合計と件数に足し込む（無ければ新しく作る）
+# load_cube	保存した合計・件数を agg_cube.SalesCube に戻す。平均もピボットもそこから作れる
+
+
+# ---- 2) 増えた行だけを読む ----
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _tail_hash(f, offset: int, start: int) -> str:
+    """offset の直前 TAIL_BYTES バイト（見出しより後ろ）のハッシュ。"""
+    begin = max(start, offset - TAIL_BYTES)
+    f.seek(begin)
+    return _digest(f.read(offset - begin))
+
+
+def _line_blocks(f, start: int, end: int):
+    """start〜end のバイトを、行の途中で切れないかたまりにして返す（改行で終わっていない最後の行は返さない）。"""
+    f.seek(start)
+    pending = b""
+    position = start
+    while position < end:
+        data = f.read(min(BLOCK_BYTES, end - position))
+        if not data:
+            break
+        position += len(data)
+        pending += data
+        cut = pending.rfind(b"\n") + 1
+        if cut:
+            yield pending[:cut]
+            pending = pending[cut:]
+
+
+def _block_cube(path: Path, header: bytes, block: bytes, group_col: str, date_col: str, value_col: str) -> SalesCube:
+    """見出し行＋増えた行のかたまりを読み、部署×月の合計・件数にする。"""
+    columns = [date_col, group_col, value_col]
+    buffer = io.BytesIO(header + block)
+    schema = schema_for(path)  # 型は schema_loader の SCHEMAS から（部署は category、日付は書式つき＋キャッシュで変換）
+    df = read_csv_typed(buffer, schema, usecols=columns) if schema else pd.read_csv(buffer, usecols=columns)
+    df[MONTH_COLUMN] = pd.to_datetime(df[date_col]).dt.month
+    return SalesCube.from_frame(df, dims=[group_col, MONTH_COLUMN], value=value_col)
+
+
+def refresh_sales(
+    path,
+    db=None,
+    full: bool = False,
+    group_col: str = GROUP_COLUMN,
+    date_col: str = DATE_COLUMN,
+    value_col: str = VALUE_COLUMN,
+) -> tuple[SalesCube, str, int]:
+    """CSV に増えた行を保存先（省略時は <CSV名>.agg.sqlite）に足し込み、集計全体を返す。
+
+    戻り値：(cube, モード, 今回集計した行数)
+    モード	"unchanged"（ファイルが前回のまま）/ "incremental"（増えた行だけ）/ "full"（全件）
+    """
+    path = Path(path)
+    columns = ",".join([group_col, date_col, value_col])
+    con = connect(db or store_path(path))
+    try:
+        stat = path.stat()
+        saved = con.execute(
+            "SELECT offset, header_hash, tail_hash, mtime_ns, size FROM source WHERE id = 1 AND columns = ?",
+            (columns,),
+        ).fetchone()
+        if saved is not None and not full and saved[3:] == (stat.st_mtime_ns, stat.st_size):
+            return load_cube(con, group_col, value_col), "unchanged", 0
+
+        with open(path, "rb") as f:
+            header = f.readline()
+            if not header.endswith(b"\n"):
+                raise ValueError(f"{path} に見出し行（改行で終わる1行目）がありません")
+            start = len(header)
+            mode = "full"
+            if saved is not None and not full:
+                offset, header_hash, tail_hash = saved[:3]
+                # 前回の続きか：ファイルが短くなっていない・見出しが同じ・offset の直前が同じ
+                if (
+                    offset <= stat.st_size
+                    and _digest(header) == header_hash
+                    and _tail_hash(f, offset, start) == tail_hash
+                ):
+                    mode, start = "incremental", offset
+
+            rows = 0
+            offset = start
+            with con:  # ここから保存まで1つのトランザクション（エラーなら何も変わらない）
+                if mode == "full":
+                    con.execute("DELETE FROM cells")
+                for block in _line_blocks(f, start, stat.st_size):
+                    cube = _block_cube(path, header, block, group_col, date_col, value_col)
+                    con.executemany(
+                        UPSERT_SQL,
+                        # tolist() で NumPy の数を Python の int / float に直してから渡す
+                        [
+                            (str(grp), int(month), total, count)
+                            for (grp, month), total, count in zip(
+                                cube.cells.index, cube.cells["sum"].tolist(), cube.cells["count"].tolist()
+                            )
+                        ],
+                    )
+                    rows += block.count(b"\n")
+                    offset += len(block)
+                con.execute(
+                    "INSERT OR REPLACE INTO source VALUES (1, ?, ?, ?, ?, ?, ?)",
+                    (columns, offset, _digest(header), _tail_hash(f, offset, len(header)), stat.st_mtime_ns, stat.st_size),
+                )
+        return load_cube(con, group_col, value_col), mode, rows
+    finally:
+        con.close()
+
+
+# 🔹 ポイント
+# offset	前回読み終えた位置。f.seek(offset) でそこまで一気に飛ぶ（前の行は読まない）
+# _tail_hash	offset 直前の 4KB だけを比べる（前回の部分を全部ハッシュすると、履歴が長いほど遅くなる）
+# with con:	cells への足し込みと source の更新をまとめて確定（途中でエラーならロールバック）
+# 行数	集計した行数は改行の数で数える（空欄の行も含む）
+
+
+# ---- 3) コマンドラインから実行 ----
+def main() -> None:
+    parser = argparse.ArgumentParser(description="部署×月の売上を SQLite に保存し、増えた行だけを足し込む")
+    parser.add_argument("csv", type=Path, help="売上CSV（日付・部署・売上の列があるもの）")
+    parser.add_argument("--db", type=Path, help="保存先（既定：<CSV名>.agg.sqlite）")
+    parser.add_argument("--full", action="store_true", help="保存した集計を使わずに、最初から集計し直す")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    cube, mode, rows = refresh_sales(args.csv, args.db, full=args.full)
+    elapsed = time.perf_counter() - started
+    print(f"🔁 {mode}: {rows:,} 行を集計（{elapsed:.3f} 秒、保存先: {args.db or store_path(args.csv)}）")
+
+    print("① 部署ごとの平均売上")
+    print(cube.mean(GROUP_COLUMN))
+    print("② 部署ごとの売上合計")
+    print(cube.sum(GROUP_COLUMN))
+    print("③ 月ごとの売上合計")
+    print(cube.sum(MONTH_COLUMN))
+    print("⑤ ピボットテーブル表示")
+    print(cube.pivot(index=GROUP_COLUMN, columns=MONTH_COLUMN))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# schema_loader.py
+# ========================================
+# 列の型（スキーマ）を決めてから CSV を読む：型の推測をやめて、速く・少ないメモリで読む
+# ========================================
+# pd.read_csv("sample_sales.csv") は、全部の列について「数値か？日付か？文字か？」を推測します。
+# さらに pd.to_datetime(df["日付"]) は書式を知らないので、1行ずつ書式を調べながら変換します。
+# 1000万行になると、この「推測」と「同じ文字列を何度も作ること」に時間とメモリの大半を使います。
+#
+# 使い方
+#   from schema_loader import read_csv_typed
+#   df = read_csv_typed("sample_sales.csv")                    ← 下の SCHEMAS から型を決めて読む
+#   df = read_csv_typed("sales_data.csv", usecols=["日付", "売上金額"], engine="pyarrow")
+#
+# 型	使う列	なぜ速い・小さいか
+# category	部署・商品名など「種類が少ない」文字の列	文字列は種類の数だけ持ち、各行は番号（int8 など）だけ
+# Int64 / float64	売上・給与など	推測しないので、途中で型が変わって読み直すことがない（Int64 は空欄があっても読める整数）
+# 日付（書式つき）	日付	"%Y-%m-%d" のように書式を決めて、同じ日付の文字列は1回だけ変換する（キャッシュ）
+#
+# 💡 engine="pyarrow" にすると、pyarrow の CSV リーダー（複数スレッド）で読み、日付の変換も pyarrow が行います。
+#    結果の DataFrame は engine="c"（pandas の標準）と同じ型・同じ値になります。
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class CsvSchema:
+    """CSV の列の型。dtypes にない列は pandas の推測にまかせる。
+
+    dtypes	{列名: "Int64" / "int64" / "float64" / "category" / "string"}
+    	"Int64" は空欄があっても読める整数。空欄が無ければ、読んだあとふつうの int64 にする
+    	（"int64" は空欄があると読めないので、空欄が無いとわかっている列だけに使う）
+    dates	{列名: 日付の書式（"%Y-%m-%d" など）}
+    """
+
+    dtypes: dict = field(default_factory=dict)
+    dates: dict = field(default_factory=dict)
+
+    def columns(self) -> list[str]:
+        return [*self.dates, *self.dtypes]
+
+
+# csv_practice の CSV の型（ファイル名で探す。同じ形の大きなCSVは schema= で渡す）
+SALES_SCHEMA = CsvSchema({"商品名": "category", "売上金額": "Int64"}, {"日付": "%Y-%m-%d"})
+DEPT_SALES_SCHEMA = CsvSchema({"部署": "category", "売上": "Int64"}, {"日付": "%Y-%m-%d"})
+STAFF_SCHEMA = CsvSchema({"名前": "string", "部署": "category", "年齢": "Int64", "給与": "Int64"})
+SCHEMAS = {
+    "sales_data.csv": SALES_SCHEMA,
+    "sample_sales.csv": DEPT_SALES_SCHEMA,
+    "sample.csv": STAFF_SCHEMA,
+}
+
+
+def schema_for(path) -> CsvSchema | None:
+    """ファイル名から SCHEMAS の型を探す（無ければ None）。"""
+    return SCHEMAS.get(Path(path).name)
+
+
+# ---- 1) 日付の変換（同じ文字列は1回だけ） ----
+# 書式ごとの {日付の文字列: 変換した日付}。chunksize で何回読んでも、同じ日付は変換し直さない
+_DATE_CACHE: dict[str, dict] = {}
+DATE_CACHE_LIMIT = 1_000_000  # これを超えたら一度空にする（日付＋時刻のように種類が多い列でメモリが増えすぎないように）
+
+
+def parse_dates(values: pd.Series, fmt: str) -> pd.Series:
+    """文字列（または category）の日付の列を、書式 fmt で datetime64 に変換する。
+
+    まず「種類」だけを取り出し（1000万行でも日付の種類は数千）、キャッシュに無いものだけ pd.to_datetime する。
+    空欄は NaT になる。書式に合わない値があれば ValueError。
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.to_numpy(), values.cat.categories  # read_csv がもう種類に分けてある
+    else:
+        codes, uniques = pd.factorize(values)
+    cache = _DATE_CACHE.setdefault(fmt, {})
+    missing = [u for u in uniques if u not in cache]
+    if missing:
+        if len(cache) + len(missing) > DATE_CACHE_LIMIT:
+            cache.clear()
+        cache.update(zip(missing, pd.to_datetime(pd.Index(missing), format=fmt).to_numpy()))
+    parsed = np.array([cache[u] for u in uniques], dtype="datetime64[us]")
+    result = parsed[codes] if len(parsed) else np.full(len(codes), np.datetime64("NaT"), dtype="datetime64[us]")
+    result[codes == -1] = np.datetime64("NaT")  # 空欄
+    return pd.Series(result, index=values.index, name=values.name)
+
+
+# 🔹 ポイント
+# pd.factorize	列を「種類の一覧」と「各行が何番目の種類か（codes）」に分ける
+# 変換するのは種類だけ	1000万行・3650日なら、pd.to_datetime は3650個だけ
+# parsed[codes]	番号で並べ直すだけで、全行の日付ができる（NumPy なので一瞬）
+
+
+# ---- 2) 型を決めて読む ----
+def read_csv_typed(
+    path,
+    schema: CsvSchema | None = None,
+    usecols: list[str] | None = None,
+    engine: str = "c",
+    **read_kwargs,
+) -> pd.DataFrame:
+    """schema（省略時はファイル名から探す）の型で CSV を読む。
+
+    engine	"c"（pandas の標準）か "pyarrow"（pyarrow.csv で読む。複数スレッド）
+    read_kwargs	engine="c" のとき pd.read_csv にそのまま渡す（encoding など）
+    schema が見つからなければ、いつもの pd.read_csv(usecols=...) と同じ。
+    """
+    schema = schema or schema_for(path)
+    if schema is None:
+        return pd.read_csv(path, usecols=usecols, **read_kwargs)
+    wanted = set(usecols) if usecols is not None else None
+    dtypes = {c: t for c, t in schema.dtypes.items() if wanted is None or c in wanted}
+    dates = {c: f for c, f in schema.dates.items() if wanted is None or c in wanted}
+
+    if engine == "pyarrow":
+        if read_kwargs:
+            raise TypeError(f"engine='pyarrow' では使えない引数です: {', '.join(read_kwargs)}")
+        df = _read_pyarrow(path, usecols, dtypes, dates)
+    elif engine == "c":
+        # 日付は category として読む（同じ文字列を1つにまとめてから、種類だけ変換する）
+        df = pd.read_csv(path, usecols=usecols, dtype={**dtypes, **{c: "category" for c in dates}}, **read_kwargs)
+        for col, fmt in dates.items():
+            df[col] = parse_dates(df[col], fmt)
+    else:
+        raise ValueError(f"engine は c か pyarrow にしてください: {engine}")
+    return _settle_ints(df, dtypes)
+
+
+def _settle_ints(df: pd.DataFrame, dtypes: dict) -> pd.DataFrame:
+    """"Int64" の列：空欄があれば Int64（空欄は <NA>）、無ければ今までどおりの int64 にそろえる。"""
+    for col, kind in dtypes.items():
+        if kind == "Int64":
+            values = df[col].astype("Int64")  # pyarrow は空欄があると float64 で返すので、いったん Int64 に
+            df[col] = values if values.hasnans else values.astype("int64")
+    return df
+
+
+def _read_pyarrow(path, usecols, dtypes: dict, dates: dict) -> pd.DataFrame:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+
+    arrow_types = {
+        "Int64": pa.int64(),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "string": pa.string(),
+        "category": pa.dictionary(pa.int32(), pa.string()),  # to_pandas() で category になる
+    }
+    column_types = {c: arrow_types[t] for c, t in dtypes.items()}
+    column_types.update({c: pa.timestamp("us") for c in dates})
+    options = pa_csv.ConvertOptions(
+        column_types=column_types,
+        include_columns=usecols,
+        timestamp_parsers=sorted(set(dates.values())),  # 日付の列は、この書式のどれかで変換する
+    )
+    df = pa_csv.read_csv(path, convert_options=options).to_pandas()
+    for col, kind in dtypes.items():
+        if kind == "category":
+            # 種類の並びを engine="c" と同じ（文字の順）にそろえる
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+        elif kind == "string":
+            df[col] = df[col].astype("string")  # 空欄の表し方（NA）も engine="c" とそろえる
+    return df
+
+
+# 🔹 ポイント
+# dtype={...}	型を決めて渡すと、pandas は推測も読み直しもしない
+# "Int64"	大文字の I は「空欄（<NA>）を持てる整数」。"int64" のまま空欄を読むとエラーになる
+# "category"	「営業」「開発」のような文字列を種類の数だけ持つ。1000万行でも文字列は数個
+# engine="pyarrow"	pyarrow.csv で読み、日付も timestamp_parsers の書式で pyarrow が変換する
+# schema_for()	ファイル名で型を探す。columnar_io.load_table() も CSV を読むときにこれを使う
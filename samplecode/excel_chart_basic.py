@@ -194,3 +194,13 @@ ws.add_chart(chart, "E2")
 # 保存
 wb.save("sales_chart.xlsx")
 print("✅ Excelファイルを作成しました：sales_chart.xlsx")
+
+# ---- 参考：部署ごとのグラフを何百個も作りたいとき ----
+# ここでは Reference(ws, min_col=2, max_col=2, min_row=1, max_row=6) のように範囲を手で書いています。
+# 部署が何百、データが何万行になると、範囲を手で決めるのは無理なので、
+# excel_chart_batch.py では「書いた行の位置」から部署ごとの Reference を作り、1回の保存で全部のグラフを作ります。
+#
+#   from excel_chart_batch import build_group_charts
+#   build_group_charts("部署別グラフ.xlsx", {"営業": [("1月", 100, 20), ...], "開発": [...]}.items(), "月", ["売上", "利益"])
+#
+# 点が多すぎる部署は max_points=52 のように指定すると、まとめてからグラフにします（ファイルが小さく、開くのも速い）。
@@ -0,0 +1,316 @@
+# samplecode/excel_chart_batch.py
+# 部署ごと（グループごと）のグラフを、1回の書き込みでまとめて作る
+# excel_chart_basic.py は「5行のデータに棒グラフ1つ」を Reference の範囲を手で書いて作っています。
+# ここでは、何百もの部署 × 何万行のデータでも、書いた行の位置から Reference の範囲を自動で決めます。
+#
+# 使い方（ターミナルで実行）
+#   python samplecode/excel_chart_batch.py 部署別売上.csv --group 部署 --category 日付 --values 売上 利益
+#   python samplecode/excel_chart_batch.py 部署別売上.csv --group 部署 --category 日付 --values 売上 --kind line --max-points 60
+#   python samplecode/excel_chart_batch.py --sample 300 --out 部署別グラフ.xlsx        ← 試し用のデータで作る
+#
+# 出力シート
+#   グラフ	部署ごとのグラフを、横に per_row 個ずつ並べる
+#   集計	（--max-points を超えた部署だけ）まとめた行。その部署のグラフはこちらを指す
+#   データ	全部署の元データ（部署ごとに続けて書くので、1つの部署は必ず連続した行になる）
+#
+# 💡 Workbook(write_only=True) は、行を書いたらすぐファイルに流すので、何万行でもメモリがほとんど増えません。
+#    そのかわり「後からセルを読む」ことはできないので、部署ごとの開始行・終了行は書きながら数えておきます。
+# 💡 1つのグラフに何千個も点があると、ファイルが大きくなり、Excel で開くのも遅くなります（見た目もつぶれる）。
+#    max_points を指定すると、それより長い部署は連続した行を max_points 個以下にまとめてからグラフにします。
+
+import argparse
+import csv
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.chart import BarChart, LineChart, Reference, Series
+from openpyxl.chart.shapes import GraphicalProperties
+from openpyxl.drawing.line import LineProperties
+from openpyxl.styles import Alignment, Font, NamedStyle, PatternFill
+from openpyxl.utils import get_column_letter
+
+CHART_SHEET = "グラフ"
+SUMMARY_SHEET = "集計"
+DATA_SHEET = "データ"
+DEFAULT_OUT = Path("部署別グラフ.xlsx")
+COLORS = ["4F81BD", "C0504D", "9BBB59", "8064A2", "F79646", "4BACC6"]  # 系列ごとの色（Excel の標準の並び）
+AGGREGATES = {"sum": sum, "mean": lambda values: sum(values) / len(values), "max": max, "min": min}
+
+
+@dataclass
+class ChartLayout:
+    """グラフの種類・大きさ・並べ方。全部署で同じものを使う。"""
+
+    kind: str = "bar"  # "bar"（棒）か "line"（折れ線）
+    width: float = 15.0  # cm（openpyxl の既定と同じ）
+    height: float = 7.5
+    per_row: int = 2  # 横に並べる数
+    rows_per_chart: int = 16  # 1つのグラフが縦に使うセルの行数（height 7.5cm ≒ 15行 ＋ すき間1行）
+    cols_per_chart: int = 9  # 横に使うセルの列数
+    y_title: str | None = None
+    styles: list = field(default_factory=list)  # 系列ごとの見た目（GraphicalProperties）。空なら COLORS から作る
+
+    def anchor(self, index: int) -> str:
+        """index 番目のグラフを置く左上のセル（A1, J1, A17, J17, …）。"""
+        row = index // self.per_row * self.rows_per_chart + 1
+        col = index % self.per_row * self.cols_per_chart
+        return f"{get_column_letter(col + 1)}{row}"
+
+
+@dataclass
+class GroupRange:
+    """1部署分のデータが、どのシートの何行目から何行目に書かれたか。"""
+
+    sheet: str
+    first_row: int
+    last_row: int
+    points: int  # グラフの点の数（まとめた後）
+    raw_rows: int  # 元データの行数
+
+
+# ---- 1) 長い系列をまとめる ----
+def downsample(rows: list, max_points: int, agg: str = "sum") -> list:
+    """rows（[(カテゴリ, 値1, 値2, …), …]）を、連続した行ごとに max_points 個以下にまとめる。
+
+    カテゴリは「最初〜最後」（日付なら 2024-01-01〜2024-01-07）、値は agg（sum / mean / max / min）でまとめる。
+    """
+    if max_points is None or len(rows) <= max_points:
+        return rows
+    func = AGGREGATES[agg]
+    size = math.ceil(len(rows) / max_points)
+    merged = []
+    for start in range(0, len(rows), size):
+        chunk = rows[start : start + size]
+        first, last = chunk[0][0], chunk[-1][0]
+        label = f"{_label(first)}〜{_label(last)}" if len(chunk) > 1 else first
+        merged.append((label, *(func([row[i] for row in chunk]) for i in range(1, len(chunk[0])))))
+    return merged
+
+
+def _label(value) -> str:
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+# 🔹 ポイント
+# まとめ方	size = ceil(行数 / max_points) 行ずつ。点の数は必ず max_points 以下になる
+# agg	sum（期間の合計：売上など）・mean（平均：単価や気温など）・max / min
+# 元データ	「データ」シートにはまとめる前の行をそのまま残す（グラフだけが「集計」シートを指す）
+
+
+# ---- 2) 書き込みとグラフ作成（1回の書き込みで全部署） ----
+def _shared_styles(wb: Workbook) -> tuple[str, str]:
+    """見出しと数値セルの名前付きスタイルを1回だけ登録する（セルごとに Font などを作らない）。"""
+    header = NamedStyle(name="グラフ見出し")
+    header.font = Font(bold=True, color="FFFFFF")
+    header.fill = PatternFill("solid", fgColor="4F81BD")
+    header.alignment = Alignment(horizontal="center")
+    number = NamedStyle(name="グラフ数値", number_format="#,##0")
+    for style in (header, number):
+        wb.add_named_style(style)
+    return header.name, number.name
+
+
+def _series_styles(layout: ChartLayout, kind: str, count: int) -> list:
+    """系列ごとの見た目。全部のグラフで同じオブジェクトを使い回す。"""
+    if layout.styles:
+        return layout.styles
+    styles = []
+    for i in range(count):
+        color = COLORS[i % len(COLORS)]
+        if kind == "line":
+            styles.append(GraphicalProperties(ln=LineProperties(solidFill=color, w=15875)))  # 1.25pt
+        else:
+            styles.append(GraphicalProperties(solidFill=color, ln=LineProperties(solidFill=color)))
+    return styles
+
+
+def _make_chart(layout: ChartLayout, title: str, x_title: str):
+    chart = LineChart() if layout.kind == "line" else BarChart()
+    chart.title = title
+    chart.x_axis.title = x_title
+    chart.y_axis.title = layout.y_title
+    chart.width, chart.height = layout.width, layout.height
+    return chart
+
+
+def build_group_charts(
+    out,
+    groups,
+    category: str,
+    values: list[str],
+    group_label: str = "部署",
+    layout: ChartLayout | None = None,
+    max_points: int | None = None,
+    agg: str = "sum",
+    keep_raw: bool = True,
+) -> dict[str, GroupRange]:
+    """groups（(部署名, [(カテゴリ, 値1, 値2, …), …]) の並び。dict.items() でも可）を書き、部署ごとにグラフを作る。
+
+    category / values	見出し（横軸のカテゴリ列と、グラフにする数値列）
+    max_points	部署の行数がこれを超えたら、まとめてからグラフにする（None ならまとめない）
+    keep_raw	False なら「データ」シートを書かない（グラフが指すのは「集計」シートだけになる）
+    戻り値：{部署名: グラフが指している範囲}
+    """
+    layout = layout or ChartLayout()
+    if max_points is not None and max_points < 1:
+        raise ValueError("max_points は1以上にしてください")
+    if agg not in AGGREGATES:
+        raise ValueError(f"agg は {', '.join(AGGREGATES)} のどれかにしてください")
+    if not keep_raw and max_points is None:
+        raise ValueError("keep_raw=False のときは max_points を指定してください（グラフが指すデータが無くなります）")
+
+    wb = Workbook(write_only=True)
+    header_style, number_style = _shared_styles(wb)
+    charts_ws = wb.create_sheet(CHART_SHEET)
+    summary_ws = wb.create_sheet(SUMMARY_SHEET) if max_points is not None else None
+    data_ws = wb.create_sheet(DATA_SHEET) if keep_raw else None
+    styles = _series_styles(layout, layout.kind, len(values))
+
+    headers = [group_label, category, *values]
+    next_row = {}
+    for ws in (summary_ws, data_ws):
+        if ws is not None:
+            ws.freeze_panes = "A2"
+            ws.append([_styled(ws, name, header_style) for name in headers])
+            next_row[ws.title] = 2
+
+    def write(ws, name, rows) -> tuple[int, int]:
+        first = next_row[ws.title]
+        for row in rows:
+            ws.append([name, row[0], *(_styled(ws, v, number_style) for v in row[1:])])
+        next_row[ws.title] = first + len(rows)
+        return first, first + len(rows) - 1
+
+    ranges = {}
+    for name, rows in groups:
+        rows = list(rows)
+        if not rows:
+            continue
+        raw = write(data_ws, name, rows) if data_ws is not None else None
+        shown = downsample(rows, max_points, agg) if max_points is not None else rows
+        if shown is rows and raw is not None:
+            target, (first, last) = DATA_SHEET, raw
+        else:
+            target, (first, last) = SUMMARY_SHEET, write(summary_ws, name, shown)
+
+        # 書いた行の位置から Reference を作る（B列＝カテゴリ、C列から右＝数値）
+        ref_ws = wb[target]
+        chart = _make_chart(layout, str(name), category)
+        for offset, (title, style) in enumerate(zip(values, styles)):
+            series = Series(Reference(ref_ws, min_col=3 + offset, min_row=first, max_row=last), title=title)
+            series.graphicalProperties = style
+            if layout.kind == "line":
+                series.smooth = False
+            chart.series.append(series)
+        chart.set_categories(Reference(ref_ws, min_col=2, min_row=first, max_row=last))
+        charts_ws.add_chart(chart, layout.anchor(len(ranges)))
+        ranges[name] = GroupRange(target, first, last, len(shown), len(rows))
+
+    wb.save(out)
+    return ranges
+
+
+def _styled(ws, value, style: str):
+    """数値と見出しだけ名前付きスタイルを付けたセルにする（文字や日付はそのまま書く）。"""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return value
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+# 🔹 ポイント
+# Workbook(write_only=True)	行を append() した順にファイルへ流す。何万行でもメモリは一定
+# 開始行・終了行	部署ごとに「何行書いたか」を数えて Reference(min_row=…, max_row=…) を決める（手で書かない）
+# NamedStyle	見出し・数値の書式を1回だけ登録し、全セルから名前で参照する（styles.xml も1つ分で済む）
+# GraphicalProperties	系列の色は全グラフで同じオブジェクトを使い回す
+# グラフの位置	ChartLayout.anchor() が A1, J1, A17, J17, … と格子状に並べる
+
+
+# ---- 3) 入力データ ----
+def read_groups(csv_path, group: str, category: str, values: list[str]) -> dict[str, list]:
+    """CSV を {部署名: [(カテゴリ, 値1, 値2, …), …]} にする（部署は最初に出てきた順、行は CSV の順）。"""
+    groups: dict[str, list] = {}
+    with open(csv_path, encoding="utf-8-sig", newline="") as f:
+        for record in csv.DictReader(f):
+            row = (_category(record[category]), *(_number(record[v]) for v in values))
+            groups.setdefault(record[group], []).append(row)
+    return groups
+
+
+def _category(text: str):
+    try:
+        return date.fromisoformat(text)
+    except ValueError:
+        return text
+
+
+def _number(text: str):
+    value = float(text.replace(",", "") or 0)
+    return int(value) if value.is_integer() else value
+
+
+def sample_groups(departments: int, days: int = 365, seed: int = 0) -> dict[str, list]:
+    """試し用：部署ごとに days 日分の（日付, 売上, 利益）を乱数で作る。"""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    groups = {}
+    for i in range(1, departments + 1):
+        base = rng.randint(50, 500) * 100
+        rows = []
+        for d in range(days):
+            sales = int(base * rng.uniform(0.6, 1.4))
+            rows.append((start + timedelta(days=d), sales, int(sales * rng.uniform(0.1, 0.3))))
+        groups[f"部署{i:03d}"] = rows
+    return groups
+
+
+# ---- 4) コマンドラインから実行 ----
+def main() -> None:
+    parser = argparse.ArgumentParser(description="部署ごとのグラフをまとめて作る")
+    parser.add_argument("csv", nargs="?", type=Path, help="入力CSV")
+    parser.add_argument("--sample", type=int, help="CSV の代わりに、試し用のデータを N 部署分作る")
+    parser.add_argument("--group", default="部署", help="グループ（部署）の列")
+    parser.add_argument("--category", default="日付", help="横軸にする列")
+    parser.add_argument("--values", nargs="+", default=["売上", "利益"], help="グラフにする数値の列")
+    parser.add_argument("--kind", choices=["bar", "line"], default="bar", help="グラフの種類")
+    parser.add_argument("--max-points", type=int, help="1つのグラフの点の数の上限（超えたらまとめる）")
+    parser.add_argument("--agg", choices=list(AGGREGATES), default="sum", help="まとめ方")
+    parser.add_argument("--no-raw", action="store_true", help="元データのシートを書かない（--max-points と一緒に）")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="出力ブック")
+    args = parser.parse_args()
+
+    if args.csv is not None:
+        groups = read_groups(args.csv, args.group, args.category, args.values)
+    elif args.sample:
+        groups = sample_groups(args.sample)
+    else:
+        parser.error("CSV か --sample N を指定してください")
+
+    started = time.perf_counter()
+    ranges = build_group_charts(
+        args.out,
+        groups.items(),
+        args.category,
+        args.values,
+        group_label=args.group,
+        layout=ChartLayout(kind=args.kind),
+        max_points=args.max_points,
+        agg=args.agg,
+        keep_raw=not args.no_raw,
+    )
+    elapsed = time.perf_counter() - started
+    merged = sum(r.points < r.raw_rows for r in ranges.values())
+    print("✅ 完了:", args.out.resolve())
+    print(f"   {len(ranges)} 部署のグラフ（うち {merged} 部署はまとめてからグラフ化）")
+    print(f"   {args.out.stat().st_size / 1024 / 1024:.1f} MB、{elapsed:.2f} 秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,16 @@
 import pandas as pd
 import os
 import glob
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from workbook_cache import read_excel  # noqa: E402
 
 # ライブラリ	主な役割	今回の使い方
 # pandas	データを表形式で扱う（表計算ライブラリ）	各Excelを読み込み・結合・出力
 # os	ファイルやフォルダ操作	フォルダパスを作る（os.path.join()）
 # glob	ファイル検索を自動化	「sales_*.xlsx」という条件で一括取得
+# workbook_cache	読み込んだ表のキャッシュ	2回目からは、変わっていないExcelを解析せずに読む
 
 # フォルダパスを指定
 folder_path = "samplecode/excel_merge"
@@ -45,7 +50,7 @@ all_data = []
 
 # 各ファイルを順番に処理
 for file in excel_files:
-    df = pd.read_excel(file)
+    df = read_excel(file)  # pd.read_excel(file) と同じ表（前回と同じファイルならキャッシュから）
     df["元ファイル名"] = os.path.basename(file)  # ファイル名を追加
     all_data.append(df)
 
@@ -53,8 +58,10 @@ for file in excel_files:
 # for file in excel_files:
 # → 取得したファイルを1つずつ順番に取り出す。
 
-# pd.read_excel(file)
+# read_excel(file)
 # → ExcelファイルをDataFrame（表形式）として読み込み。
+#   中身は pd.read_excel(file) ですが、読み込んだ表を samplecode/.workbook_cache に保存しておき、
+#   次回ファイルが変わっていなければXMLを解析せずに保存済みの表を返します（月次の再集計が速くなる）。
 
 # df["元ファイル名"] = os.path.basename(file)
 # → 各行に「このデータはどのファイルから来たのか」を記録する列を追加。
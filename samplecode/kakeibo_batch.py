@@ -0,0 +1,170 @@
+# 家計簿：カテゴリ別合計（複数ブックまとめ版）
+# 家族ひとりずつ・1年ずつ分かれた家計簿をまとめて集計する版。
+# ブックごとの集計（部分合計）を別々のプロセスで同時に行い、最後に足し合わせて1枚の集計シートにする。
+#
+# 使い方（ターミナルで実行）
+#   python samplecode/kakeibo_batch.py "家計簿/*.xlsx"
+#   python samplecode/kakeibo_batch.py "家計簿/**/*.xlsx" --out 家族まとめ.xlsx --per-file
+#   python samplecode/kakeibo_batch.py "家計簿/*_2023.xlsx" "家計簿/*_2024.xlsx" --jobs 4 --incremental
+#
+# 出力シート
+#   カテゴリ別合計	全ブックを足し合わせたカテゴリ別合計
+#   ファイル別	（--per-file のとき）カテゴリ × ブックの表。右端に合計
+#
+# 💡 部分合計は {カテゴリ: 金額} の dict なので、足し算するだけでまとめられます（順番を変えても結果は同じ）。
+#    ブックどうしは独立しているので、CPUのコア数だけプロセスを増やせば、ほぼコア数に比例して速くなります。
+# 💡 まとめる順番は「終わった順」ではなく「ファイル名の順」。何度実行しても同じ並びの集計シートになります。
+
+import argparse
+import glob
+import os
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from openpyxl import Workbook
+
+from kakeibo_stream import (
+    AMOUNT_COLUMN,
+    CATEGORY_COLUMN,
+    INPUT_SHEET,
+    OUTPUT_SHEET,
+    category_totals,
+    fill_summary,
+)
+
+BREAKDOWN_SHEET = "ファイル別"
+DEFAULT_OUT = Path("家計簿まとめ_カテゴリ別合計.xlsx")
+
+
+# ---- 1) 対象のブックを集める ----
+def collect_files(patterns: list[str], exclude: Path | None = None) -> list[Path]:
+    """glob パターン（** も可）に一致する .xlsx を、重複なし・名前順で返す。"""
+    files = set()
+    for pattern in patterns:
+        for name in glob.glob(pattern, recursive=True):
+            path = Path(name)
+            if path.suffix.lower() == ".xlsx" and not path.name.startswith("~$"):  # ~$ は Excel の一時ファイル
+                files.add(path)
+    if exclude is not None:
+        files = {f for f in files if f.resolve() != exclude.resolve()}  # 前回の出力を集計しない
+    return sorted(files)
+
+
+# ---- 2) 1ブック分の部分合計（子プロセスで実行） ----
+def file_totals(path: Path, sheet: str, category: str, amount: str, incremental: bool = False) -> dict:
+    """1ブックのカテゴリ別合計（部分合計）を返す。"""
+    if incremental:
+        from kakeibo_checkpoint import incremental_totals
+
+        return incremental_totals(path, sheet, category, amount)[0]
+    return category_totals(path, sheet, category, amount)
+
+
+def merge_totals(partials: list[dict]) -> dict:
+    """部分合計を足し合わせる（カテゴリは最初に出てきた順）。"""
+    merged = {}
+    for totals in partials:
+        for cat, total in totals.items():
+            merged[cat] = merged.get(cat, 0.0) + total
+    return merged
+
+
+def batch_totals(
+    files: list[Path],
+    sheet: str = INPUT_SHEET,
+    category: str = CATEGORY_COLUMN,
+    amount: str = AMOUNT_COLUMN,
+    jobs: int | None = None,
+    incremental: bool = False,
+) -> tuple[dict[Path, dict], dict[Path, str]]:
+    """ブックごとの部分合計をプロセスプールで求める。
+
+    戻り値：({ブック: 部分合計}, {読めなかったブック: 理由})。どちらもファイルの順番どおり。
+    """
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(files) or 1))
+    args = (sheet, category, amount, incremental)
+    partials, errors = {}, {}
+    if jobs == 1:  # 1プロセスなら、プロセスを起動する手間を省いてそのまま実行
+        results = [_collect(lambda: file_totals(path, *args)) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = [pool.submit(file_totals, path, *args) for path in files]
+            results = [_collect(future.result) for future in futures]
+    for path, (totals, error) in zip(files, results):
+        if error is None:
+            partials[path] = totals
+        else:
+            errors[path] = error
+    return partials, errors
+
+
+# 読めないブック（シートが無い・見出しが違う・壊れている）が1つあっても、残りは集計を続ける
+_SKIPPABLE = (KeyError, ValueError, OSError, zipfile.BadZipFile)
+
+
+def _collect(get):
+    """get() の結果を (部分合計, None)、読めなければ (None, 理由) で返す。"""
+    try:
+        return get(), None
+    except _SKIPPABLE as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+# 🔹 ポイント
+# ProcessPoolExecutor	ブックを1つずつ別のプロセスに渡して同時に集計（openpyxl の解析は CPU を使うので、スレッドより速い）
+# 子プロセスから返すもの	部分合計の dict だけ（行データは返さない）→ プロセス間のやり取りはごくわずか
+# pool.submit → future.result()	ファイルの順番で結果を受け取る。失敗したブックは理由だけ記録して先へ進む
+
+
+# ---- 3) 集計結果を書き出す ----
+def fill_breakdown(ws, partials: dict[Path, dict], merged: dict) -> None:
+    """カテゴリ × ブックの表（右端に合計）を書く。"""
+    names = list(partials)
+    ws.append(["カテゴリ"] + [path.name for path in names] + ["合計金額"])
+    for cat, total in merged.items():
+        ws.append([cat] + [round(partials[path].get(cat, 0.0), 2) for path in names] + [round(total, 2)])
+
+
+def write_batch_summary(out_path, merged: dict, partials: dict[Path, dict] | None = None) -> None:
+    """まとめた集計（と、あればファイル別の表）を新しいブックに書き出す。"""
+    wb = Workbook(write_only=True)
+    fill_summary(wb.create_sheet(OUTPUT_SHEET), merged)
+    if partials is not None:
+        fill_breakdown(wb.create_sheet(BREAKDOWN_SHEET), partials, merged)
+    wb.save(out_path)
+
+
+# ---- 4) コマンドラインから実行 ----
+def main() -> None:
+    parser = argparse.ArgumentParser(description="複数の家計簿をまとめてカテゴリ別に合計")
+    parser.add_argument("patterns", nargs="+", help='対象ブックの glob パターン（例 "家計簿/*.xlsx"）')
+    parser.add_argument("--sheet", default=INPUT_SHEET, help="入力シート名")
+    parser.add_argument("--category", default=CATEGORY_COLUMN, help="カテゴリ列の見出し")
+    parser.add_argument("--amount", default=AMOUNT_COLUMN, help="金額列の見出し")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="出力ブック")
+    parser.add_argument("--per-file", action="store_true", help="ファイル別の内訳シートも書き出す")
+    parser.add_argument("--jobs", type=int, help="同時に動かすプロセス数（既定：CPUのコア数）")
+    parser.add_argument("--incremental", action="store_true", help="ブックごとのチェックポイントで増えた行だけ集計")
+    args = parser.parse_args()
+
+    files = collect_files(args.patterns, exclude=args.out)
+    if not files:
+        raise SystemExit(f"⚠ 対象のブックが見つかりません: {args.patterns}")
+    print(f"📂 対象ファイル数: {len(files)} 件")
+
+    started = time.perf_counter()
+    partials, errors = batch_totals(files, args.sheet, args.category, args.amount, args.jobs, args.incremental)
+    merged = merge_totals(list(partials.values()))
+    elapsed = time.perf_counter() - started
+    for path, reason in errors.items():
+        print(f"⚠ スキップ: {path}（{reason}）")
+
+    write_batch_summary(args.out, merged, partials if args.per_file else None)
+    print("✅ 完了:", args.out.resolve())
+    print(f"   {len(partials)} ブック → {len(merged)} カテゴリ（集計 {elapsed:.2f} 秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@
 #   A1:D1 = 日付 / カテゴリ / 内容 / 金額 のヘッダ、
 #   2行目以降にデータがある想定。
 # 出力：同じブック内に「カテゴリ別合計」シートを新規作成して書き出す。
+# 💡 何年分もの大きな家計簿では、read_only で1行ずつ流し読みする kakeibo_stream.py を使う。
 
 from pathlib import Path
 from openpyxl import load_workbook
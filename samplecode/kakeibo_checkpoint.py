@@ -0,0 +1,375 @@
+# 家計簿：カテゴリ別合計（差分集計版）
+# 家計簿は「下に行を書き足していく」だけなので、前回集計した行はもう一度集計する必要がありません。
+# 前回の集計結果を「チェックポイント」としてブックの横に保存しておき、次回は増えた行だけを集計します。
+#
+# チェックポイント（<家計簿名>.checkpoint.json）に保存する内容
+#   last_row	前回集計した最後の行番号
+#   prefix_bytes / prefix_hash	前回集計した行（シートXMLの <row>…</row> の並び）のバイト数と sha256
+#   sst_bytes / sst_hash	共有文字列（sharedStrings.xml）の前回までの部分のバイト数と sha256
+#   totals	前回までのカテゴリ別合計
+#   mtime_ns / size	前回のファイルの更新時刻とサイズ
+#
+# 次回の動き
+#   1. 更新時刻とサイズが前回と同じ → ファイルを開かずに totals をそのまま使う
+#   2. 前回集計した部分のハッシュが同じ → その部分は読み飛ばし、後ろに増えた行だけを集計
+#   3. ハッシュが違う（途中の行が書き換えられた・並べ替えられた） → 最初から全部集計し直す
+#
+# 💡 xlsx の中身は zip に入った XML です。openpyxl（read_only でも）は、行を飛ばすにも
+#    前の行のXMLを1つずつ解析します。ここではシートのXMLをバイト列のまま読み、
+#    前回の部分はハッシュを取るだけにして、増えた部分だけからカテゴリ列・金額列のセルを探します。
+
+import hashlib
+import json
+import os
+import re
+import zipfile
+from dataclasses import asdict, dataclass, field
+from html import unescape
+from itertools import chain
+from pathlib import Path, PurePosixPath
+from xml.etree import ElementTree as ET
+
+from kakeibo_stream import AMOUNT_COLUMN, CATEGORY_COLUMN, INPUT_SHEET, add_amount, find_columns
+
+CHUNK = 1 << 20  # zip から一度に読むバイト数（1MB）
+
+# シートXMLの目印（"x:row" のような名前空間の接頭辞付きでも見つかるようにしておく）
+SHEET_DATA_OPEN = re.compile(rb"<(?:\w+:)?sheetData\b[^>]*?(/?)>")
+SHEET_DATA_CLOSE = re.compile(rb"</(?:\w+:)?sheetData>")
+ROW_END = re.compile(rb"</(?:\w+:)?row>")
+ROW_NUMBER = re.compile(rb"<(?:\w+:)?row\b[^>]*?\br=\"(\d+)\"")
+CELL = re.compile(rb"<(?:\w+:)?c\b([^>]*?)(?:/>|>(.*?)</(?:\w+:)?c>)", re.S)
+CELL_REF = re.compile(rb"\br=\"([A-Z]+)(\d+)\"")
+CELL_TYPE = re.compile(rb"\bt=\"(\w+)\"")
+VALUE = re.compile(rb"<(?:\w+:)?v>(.*?)</(?:\w+:)?v>", re.S)
+TEXT = re.compile(rb"<(?:\w+:)?t(?:\s[^>]*)?>(.*?)</(?:\w+:)?t>", re.S)
+FIRST_SI = re.compile(rb"<(?:\w+:)?si\b")
+SST_CLOSE = re.compile(rb"</(?:\w+:)?sst>")
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+
+@dataclass
+class Checkpoint:
+    sheet: str
+    category: str
+    amount: str
+    category_col: str  # カテゴリ列の列記号（例 "B"）
+    amount_col: str
+    last_row: int = 1
+    prefix_bytes: int = 0
+    prefix_hash: str = ""
+    sst_bytes: int = 0
+    sst_hash: str = ""
+    totals: list = field(default_factory=list)  # [[カテゴリ, 合計], ...]（出現順を保つためリスト）
+    mtime_ns: int = 0
+    size: int = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "Checkpoint | None":
+        try:
+            return cls(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None  # 無い・壊れている → 全件集計からやり直す
+
+    def save(self, path: Path) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(asdict(self), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)  # 書きかけのチェックポイントが残らないよう、最後に置き換える
+
+
+def checkpoint_path(path: Path) -> Path:
+    return path.with_suffix(".checkpoint.json")
+
+
+# ---- 1) zip の中から、シートと共有文字列のXMLを探して読む ----
+def part_names(zf: zipfile.ZipFile, sheet: str) -> tuple[str, str | None]:
+    """(シートXMLのパス, sharedStrings.xml のパス or None) を返す。"""
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets, sst = {}, None
+    for rel in rels.iter(f"{PKG_REL_NS}Relationship"):
+        target = rel.get("Target")
+        name = target.lstrip("/") if target.startswith("/") else str(PurePosixPath("xl", target))
+        targets[rel.get("Id")] = name
+        if rel.get("Type", "").endswith("/sharedStrings"):
+            sst = name
+    for node in ET.fromstring(zf.read("xl/workbook.xml")).iter():
+        if node.tag.endswith("}sheet") and node.get("name") == sheet:
+            return targets[node.get(f"{REL_NS}id")], sst
+    raise KeyError(f"シート {sheet} がありません")
+
+
+def _chunks(zf: zipfile.ZipFile, name: str):
+    with zf.open(name) as f:
+        while chunk := f.read(CHUNK):
+            yield chunk
+
+
+def _between(zf: zipfile.ZipFile, name: str, start: re.Pattern, close: re.Pattern, inclusive=False):
+    """XMLのうち、start の目印から close の目印の直前までのバイト列を少しずつ返す。"""
+    chunks = _chunks(zf, name)
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        m = start.search(pending)
+        if m:
+            break
+    else:
+        return
+    if m.groups() and m.group(1):  # <sheetData/>：中身が無い
+        return
+    pending = pending[m.start() if inclusive else m.end() :]
+    for chunk in chain([b""], chunks):
+        pending += chunk
+        m = close.search(pending)
+        if m:
+            yield pending[: m.start()]
+            return
+        if len(pending) > 64:  # 目印がチャンクの境目で切れても見つかるよう、末尾は残しておく
+            yield pending[:-64]
+            pending = pending[-64:]
+    raise ValueError(f"{name} の終わりが見つかりません")
+
+
+class _Digest:
+    """読んだバイト数と sha256 を同時に数える。"""
+
+    def __init__(self):
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def update(self, data: bytes) -> None:
+        self.hasher.update(data)
+        self.size += len(data)
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+
+def _skip(pieces, n: int, digest: _Digest):
+    """先頭 n バイトを digest に通して読み飛ばし、残りのイテレータを返す。"""
+    pieces = iter(pieces)
+    for piece in pieces:
+        need = n - digest.size
+        if len(piece) >= need:
+            digest.update(piece[:need])
+            return chain([piece[need:]], pieces)
+        digest.update(piece)
+    return iter(())
+
+
+def _row_blocks(pieces, digest: _Digest):
+    """行の並びを「</row> で終わるかたまり」に区切って返す（セルが途中で切れないように）。"""
+    pending = b""
+    for piece in pieces:
+        digest.update(piece)
+        pending += piece
+        ends = [m.end() for m in ROW_END.finditer(pending)]
+        if ends:
+            yield pending[: ends[-1]]
+            pending = pending[ends[-1] :]
+    if pending.strip():
+        yield pending
+
+
+# ---- 2) セルの値 ----
+def _cell_value(attrs: bytes, inner: bytes | None):
+    """セルの値。共有文字列は ("s", 番号) のまま返し、最後にまとめて文字列に直す。"""
+    if not inner:
+        return None
+    m = CELL_TYPE.search(attrs)
+    t = m.group(1) if m else b"n"
+    if t == b"inlineStr":
+        return unescape(b"".join(TEXT.findall(inner)).decode("utf-8"))
+    v = VALUE.search(inner)
+    if v is None:
+        return None
+    text = v.group(1).decode("utf-8")
+    if t == b"s":
+        return ("s", int(text))
+    if t == b"b":
+        return text == "1"
+    if t in (b"str", b"e"):
+        return unescape(text)
+    return int(text) if text.lstrip("-").isdigit() else float(text)
+
+
+def column_pattern(col: bytes) -> re.Pattern:
+    """r="B123" のように、指定した列のセルだけに一致する正規表現（属性の順番は問わない）。"""
+    return re.compile(
+        rb"<(?:\w+:)?c\b((?=[^>]*?\br=\"" + col + rb"(\d+)\")[^>]*?)(?:/>|>(.*?)</(?:\w+:)?c>)", re.S
+    )
+
+
+def _column_cells(block: bytes, pattern: re.Pattern) -> dict[int, object]:
+    """かたまりの中から、指定した列のセルだけを {行番号: 値} で返す。"""
+    return {int(m.group(2)): _cell_value(m.group(1), m.group(3)) for m in pattern.finditer(block)}
+
+
+def _shared_strings(zf: zipfile.ZipFile, name: str | None, wanted: set[int]) -> dict[int, str]:
+    """sharedStrings.xml から、必要な番号の文字列だけを取り出す（全部そろったら読むのをやめる）。"""
+    found: dict[int, str] = {}
+    if not wanted or name is None:
+        return found
+    index, last = 0, max(wanted)
+    parser = ET.XMLPullParser(events=("end",))
+    for chunk in _chunks(zf, name):
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag.rsplit("}", 1)[-1] != "si":
+                continue
+            if index in wanted:
+                # <si><t>食費</t></si> か、書式付きの <si><r><t>食</t></r><r><t>費</t></r></si>
+                # （ふりがな <rPh><t>ショクヒ</t></rPh> は値に含めない）
+                parts = []
+                for child in elem:
+                    kind = child.tag.rsplit("}", 1)[-1]
+                    if kind == "t":
+                        parts.append(child.text or "")
+                    elif kind == "r":
+                        parts += [t.text or "" for t in child if t.tag.rsplit("}", 1)[-1] == "t"]
+                found[index] = "".join(parts)
+            elem.clear()
+            index += 1
+            if index > last:
+                return found
+    return found
+
+
+def _sst_state(zf: zipfile.ZipFile, name: str | None, limit: int | None = None) -> tuple[int, str]:
+    """共有文字列の <si>…</si> の並び（先頭 limit バイト）について (バイト数, sha256) を返す。"""
+    digest = _Digest()
+    if name is not None:
+        pieces = _between(zf, name, FIRST_SI, SST_CLOSE, inclusive=True)
+        if limit is None:
+            for piece in pieces:
+                digest.update(piece)
+        else:
+            _skip(pieces, limit, digest)
+    return digest.size, digest.hexdigest()
+
+
+# ---- 3) 集計 ----
+def _header(zf, sst_name, block: bytes, category: str, amount: str) -> tuple[bytes, bytes]:
+    """1行目の見出しから、カテゴリ列・金額列の列記号を決める。"""
+    first_row = block[: ROW_END.search(block).end()]
+    cells = {}
+    for m in CELL.finditer(first_row):
+        ref = CELL_REF.search(m.group(1))
+        if ref:
+            cells[ref.group(1)] = _cell_value(m.group(1), m.group(2))
+    strings = _shared_strings(zf, sst_name, {v[1] for v in cells.values() if isinstance(v, tuple)})
+    labels = [strings.get(v[1]) if isinstance(v, tuple) else v for v in cells.values()]
+    cat_i, amt_i = find_columns(tuple(labels), [category, amount])
+    cols = list(cells)
+    return cols[cat_i], cols[amt_i]
+
+
+def _aggregate(zf, sst_name, blocks, cat_col: bytes, amt_col: bytes, after_row: int):
+    """after_row より後の行を、カテゴリ（共有文字列は番号のまま）ごとに合計する。"""
+    raw: dict = {}
+    pending = []  # 金額が共有文字列として入っていた行（最後に文字列に直す）
+    last_row = after_row
+    cat_cells, amt_cells = column_pattern(cat_col), column_pattern(amt_col)
+    for block in blocks:
+        amounts = _column_cells(block, amt_cells)
+        for row, cat in _column_cells(block, cat_cells).items():
+            if row <= after_row or cat is None or cat == "":
+                continue
+            amt = amounts.get(row)
+            if isinstance(amt, tuple):
+                pending.append((cat, amt[1]))
+                raw.setdefault(cat, 0.0)
+            else:
+                raw[cat] = raw.get(cat, 0.0) + float(amt or 0)
+        rows = ROW_NUMBER.findall(block)
+        if rows:
+            last_row = max(last_row, int(rows[-1]))
+
+    # 共有文字列の番号を文字列に直して、最小コードと同じルールで合計し直す
+    wanted = {k[1] for k in raw if isinstance(k, tuple)} | {i for _, i in pending}
+    strings = _shared_strings(zf, sst_name, wanted)
+
+    def text(value):
+        return strings.get(value[1]) if isinstance(value, tuple) else value
+
+    totals: dict = {}
+    for key, total in raw.items():
+        add_amount(totals, text(key), total)
+    for key, index in pending:
+        add_amount(totals, text(key), strings.get(index))
+    return totals, last_row
+
+
+def incremental_totals(
+    path,
+    sheet: str = INPUT_SHEET,
+    category: str = CATEGORY_COLUMN,
+    amount: str = AMOUNT_COLUMN,
+    checkpoint: Path | None = None,
+) -> tuple[dict, str, int]:
+    """チェックポイントを使ってカテゴリ別合計を返し、チェックポイントを更新する。
+
+    戻り値：(totals, モード, 今回集計した行数)
+    モード	"unchanged"（ファイルが前回のまま）/ "incremental"（増えた行だけ）/ "full"（全件）
+    """
+    path = Path(path)
+    checkpoint = checkpoint or checkpoint_path(path)
+    stat = path.stat()
+    saved = Checkpoint.load(checkpoint)
+    if saved is not None and (saved.sheet, saved.category, saved.amount) != (sheet, category, amount):
+        saved = None  # 集計の条件が変わった → 使えない
+    if saved is not None and (saved.mtime_ns, saved.size) == (stat.st_mtime_ns, stat.st_size):
+        return dict(saved.totals), "unchanged", 0
+
+    with zipfile.ZipFile(path) as zf:
+        sheet_part, sst_name = part_names(zf, sheet)
+        rows = _between(zf, sheet_part, SHEET_DATA_OPEN, SHEET_DATA_CLOSE)
+        digest = _Digest()
+        mode = "full"
+        if saved is not None:
+            # 前回集計した部分が、バイト単位で前回と同じかを確かめる（セルの解析はしない）
+            rest = _skip(rows, saved.prefix_bytes, digest)
+            same_rows = digest.size == saved.prefix_bytes and digest.hexdigest() == saved.prefix_hash
+            same_sst = _sst_state(zf, sst_name, saved.sst_bytes) == (saved.sst_bytes, saved.sst_hash)
+            if same_rows and same_sst:
+                mode = "incremental"
+                rows = rest
+            else:  # 途中が書き換えられている → 最初から読み直す
+                rows = _between(zf, sheet_part, SHEET_DATA_OPEN, SHEET_DATA_CLOSE)
+                digest = _Digest()
+
+        blocks = _row_blocks(rows, digest)
+        if mode == "incremental":
+            base, after_row = dict(saved.totals), saved.last_row
+            cat_col, amt_col = saved.category_col.encode(), saved.amount_col.encode()
+        else:
+            base, after_row = {}, 1  # 1行目は見出し
+            first = next(blocks, b"")
+            if not ROW_END.search(first):
+                raise ValueError(f"シート {sheet} に見出し行がありません")
+            cat_col, amt_col = _header(zf, sst_name, first, category, amount)
+            blocks = chain([first], blocks)
+
+        new_totals, last_row = _aggregate(zf, sst_name, blocks, cat_col, amt_col, after_row)
+        totals = base
+        for cat, total in new_totals.items():
+            totals[cat] = totals.get(cat, 0.0) + total
+        sst_bytes, sst_hash = _sst_state(zf, sst_name)
+
+    Checkpoint(
+        sheet=sheet,
+        category=category,
+        amount=amount,
+        category_col=cat_col.decode(),
+        amount_col=amt_col.decode(),
+        last_row=last_row,
+        prefix_bytes=digest.size,
+        prefix_hash=digest.hexdigest(),
+        sst_bytes=sst_bytes,
+        sst_hash=sst_hash,
+        totals=[[cat, total] for cat, total in totals.items()],
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+    ).save(checkpoint)
+    return totals, mode, last_row - after_row
@@ -0,0 +1,172 @@
+# 家計簿：カテゴリ別合計（ストリーミング版）
+# kakeibo_category_sum_min.py と同じ集計を、何年分もの大きな家計簿でも一定のメモリで行う版。
+#
+# 最小コードとの違い
+#   最小コード	load_workbook(FILE) でブック全体をメモリに展開 → ws_in[f"B{r}"] で1セルずつ取り出す
+#   この版	read_only=True で開き、iter_rows(values_only=True) で1行ずつ「値だけ」を流し読み
+#
+# 使い方（ターミナルで実行）
+#   python samplecode/kakeibo_stream.py
+#   python samplecode/kakeibo_stream.py 家計簿2023.xlsx --sheet 明細 --out 集計.xlsx
+#   python samplecode/kakeibo_stream.py 家計簿2023.xlsx --in-place   ← 入力ブックに集計シートを追加
+#   python samplecode/kakeibo_stream.py 家計簿2023.xlsx --incremental   ← 前回から増えた行だけ集計（kakeibo_checkpoint.py）
+#   python samplecode/kakeibo_stream.py 家計簿2023.xlsx --cache   ← 2回目からは解析済みの表（workbook_cache.py）を使う
+#
+# 出力：既定では入力とは別のブック（<入力名>_カテゴリ別合計.xlsx）に「カテゴリ別合計」シートを書き出す。
+
+import argparse
+from pathlib import Path
+
+from openpyxl import Workbook, load_workbook
+
+# ---- 1) 既定の入力ブック・シート名・列名（最小コードと同じ） ----
+FILE = Path("samplecode/sample_created.xlsx")
+INPUT_SHEET = "テストシート"
+OUTPUT_SHEET = "カテゴリ別合計"
+CATEGORY_COLUMN = "カテゴリ"
+AMOUNT_COLUMN = "金額"
+
+
+# ---- 2) 見出し名から列の位置を探す ----
+def find_columns(header: tuple, names: list[str]) -> list[int]:
+    """見出し行の中から、names の各列が何番目（0始まり）にあるかを返す。"""
+    labels = [str(v).strip() if v is not None else "" for v in header]
+    missing = [name for name in names if name not in labels]
+    if missing:
+        raise ValueError(f"見出しに {missing} がありません（見出し: {labels}）")
+    return [labels.index(name) for name in names]
+
+
+# 💡 列を "B" や "D" のように文字で決め打ちすると、列を1つ挿入しただけで別の列を集計してしまいます。
+#    1行目の見出し（カテゴリ・金額）から位置を探せば、列の並びが変わっても正しく集計できます。
+
+
+# ---- 3) 1行ずつ流し読みしてカテゴリ別に合計 ----
+def add_amount(totals: dict, cat, amt) -> None:
+    """1行分を totals に足し込む（最小コードと同じルール）。"""
+    if not cat:  # カテゴリ空はスキップ
+        return
+    totals[cat] = totals.get(cat, 0.0) + float(amt or 0)  # None/空は0として扱う
+
+
+def iter_category_amounts(ws, category: str = CATEGORY_COLUMN, amount: str = AMOUNT_COLUMN):
+    """シートの2行目以降を (カテゴリ, 金額) の組で1行ずつ返すジェネレーター。"""
+    header = next(ws.iter_rows(max_row=1, values_only=True), None)
+    if header is None:  # 空のシート
+        return
+    cat_i, amt_i = find_columns(header, [category, amount])
+    # 必要な列（右端の列）までに絞って読む。足りないセルは None で埋められる
+    for row in ws.iter_rows(min_row=2, max_col=max(cat_i, amt_i) + 1, values_only=True):
+        yield row[cat_i], row[amt_i]
+
+
+def category_totals(
+    path,
+    sheet: str = INPUT_SHEET,
+    category: str = CATEGORY_COLUMN,
+    amount: str = AMOUNT_COLUMN,
+) -> dict:
+    """ブックを read_only で開き、1回の走査でカテゴリ別合計を返す。"""
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        totals = {}
+        for cat, amt in iter_category_amounts(wb[sheet], category, amount):
+            add_amount(totals, cat, amt)
+        return totals
+    finally:
+        wb.close()  # read_only のブックはファイルを開いたままなので、必ず閉じる
+
+
+def cached_category_totals(
+    path,
+    sheet: str = INPUT_SHEET,
+    category: str = CATEGORY_COLUMN,
+    amount: str = AMOUNT_COLUMN,
+) -> dict:
+    """workbook_cache の表からカテゴリ別合計を返す（ブックが前回と同じならXMLを解析しない）。"""
+    from workbook_cache import read_excel
+
+    df = read_excel(path, sheet)
+    cat_i, amt_i = find_columns(tuple(df.columns), [category, amount])
+    # pandas は空のセルを NaN にするので、最小コードと同じく None に戻してから足し込む
+    cats, amts = (df.iloc[:, i].astype(object).where(df.iloc[:, i].notna(), None).tolist() for i in (cat_i, amt_i))
+    totals = {}
+    for cat, amt in zip(cats, amts):
+        add_amount(totals, cat, amt)
+    return totals
+
+
+# read_only=True の意味
+# セルをまとめてメモリに展開せず、シートのXMLを先頭から少しずつ読みながら1行ずつ返すモードです。
+# 100万行でもメモリはほぼ一定。そのかわり ws["B2"] のような「好きな場所を読む」使い方は遅く、書き込みもできません。
+#
+# iter_rows(values_only=True)
+# Cellオブジェクトを作らず、(日付, カテゴリ, 内容, 金額) のような「値のタプル」をそのまま返します。
+# 読み終わった行は捨てられるので、行数が10倍になってもメモリは増えません（時間は行数に比例）。
+
+
+# ---- 4) 集計結果を書き出す ----
+def fill_summary(ws, totals: dict) -> None:
+    ws.append(["カテゴリ", "合計金額"])
+    for cat, total in totals.items():
+        ws.append([cat, round(total, 2)])
+
+
+def write_summary(totals: dict, out_path, sheet: str = OUTPUT_SHEET) -> None:
+    """集計結果だけの新しいブックを書き出す（書き込み専用モードなので速い）。"""
+    wb = Workbook(write_only=True)
+    fill_summary(wb.create_sheet(sheet), totals)
+    wb.save(out_path)
+
+
+def write_summary_in_place(totals: dict, path, sheet: str = OUTPUT_SHEET) -> None:
+    """入力ブックに集計シートを追加して上書き保存する（最小コードと同じ出力先）。
+
+    💡 シートを追加するにはブック全体を読み込み直す必要があるため、大きなブックでは時間がかかります。
+    """
+    wb = load_workbook(path)
+    if sheet in wb.sheetnames:
+        del wb[sheet]
+    fill_summary(wb.create_sheet(sheet), totals)
+    wb.save(path)
+
+
+def default_output(path: Path) -> Path:
+    return path.with_name(f"{path.stem}_{OUTPUT_SHEET}.xlsx")
+
+
+# ---- 5) コマンドラインから実行 ----
+def main() -> None:
+    parser = argparse.ArgumentParser(description="家計簿のカテゴリ別合計（ストリーミング版）")
+    parser.add_argument("file", nargs="?", type=Path, default=FILE, help="入力ブック")
+    parser.add_argument("--sheet", default=INPUT_SHEET, help="入力シート名")
+    parser.add_argument("--category", default=CATEGORY_COLUMN, help="カテゴリ列の見出し")
+    parser.add_argument("--amount", default=AMOUNT_COLUMN, help="金額列の見出し")
+    parser.add_argument("--out", type=Path, help="出力ブック（既定：<入力名>_カテゴリ別合計.xlsx）")
+    parser.add_argument("--in-place", action="store_true", help="入力ブックに集計シートを追加する")
+    parser.add_argument("--incremental", action="store_true", help="チェックポイントを使い、増えた行だけ集計する")
+    parser.add_argument("--cache", action="store_true", help="解析済みの表をキャッシュして、2回目から使う")
+    args = parser.parse_args()
+
+    if args.incremental:
+        from kakeibo_checkpoint import checkpoint_path, incremental_totals
+
+        totals, mode, rows = incremental_totals(args.file, args.sheet, args.category, args.amount)
+        print(f"🔁 {mode}: {rows:,} 行を集計（チェックポイント: {checkpoint_path(args.file)}）")
+    elif args.cache:
+        totals = cached_category_totals(args.file, args.sheet, args.category, args.amount)
+    else:
+        totals = category_totals(args.file, args.sheet, args.category, args.amount)
+    if args.in_place:
+        write_summary_in_place(totals, args.file)
+        out = args.file
+    else:
+        out = args.out or default_output(args.file)
+        write_summary(totals, out)
+
+    print("✅ 完了:", Path(out).resolve())
+    print(f"   入力シート: {args.sheet}  → 出力シート: {OUTPUT_SHEET}（{len(totals)} カテゴリ）")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,14 @@ import matplotlib.pyplot as plt
 # 👉 Excelで言うと「グラフ作成ツール」を呼び出した状態です。
 
 # 日本語フォントを設定（Mac用）
-plt.rcParams["font.family"] = "Hiragino Sans"
+plt.rcParams["font.family"] = ["Hiragino Sans", "Yu Gothic", "Noto Sans CJK JP", "IPAexGothic", "DejaVu Sans"]
 
 # macOS では 'Hiragino Sans' が最も安全で綺麗に日本語を表示できます。
 # これを設定しないと、UserWarning: Glyph missing... が出てしまうことがあります。
+# リストにしておくと、前から順に「このマシンにあるフォント」が使われます（Windows は Yu Gothic、Linux は Noto など）。
+# 💡 画面のない Linux サーバーで何百枚も PNG / SVG に書き出すときは matplotlib_batch.py を使います
+#    （Agg バックエンド・日本語フォントの自動検出・Figure の使い回し・プロセスプール）。
+# 💡 何百万点もある時系列は、plot_downsample.plot_series(ax, x, y) で図の横幅ぶんの点に減らしてから描きます。
 
 # データを用意
 months = ["1月", "2月", "3月", "4月", "5月"]
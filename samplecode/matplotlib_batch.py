@@ -0,0 +1,256 @@
+# samplecode/matplotlib_batch.py
+# 画面のない Linux サーバーでも、たくさんのグラフを PNG / SVG にまとめて書き出す
+# matplotlib_basic.py は plt.show() で画面に表示し、フォントも Mac の "Hiragino Sans" 決め打ちなので、
+# 画面のないバッチ用のサーバー（Linux）ではそのままでは動きません。
+#
+# 使い方（ターミナルで実行）
+#   python samplecode/matplotlib_batch.py 部署別売上.csv --group 部署 --category 日付 --values 売上 --out charts/
+#   python samplecode/matplotlib_batch.py --sample 200 --kind both --format png svg --jobs 4
+#
+# このモジュールがすること
+#   Agg バックエンド	画面を使わずに、メモリ上で画像を描く（matplotlib.use("Agg")。pyplot も使わない）
+#   日本語フォント	候補の一覧から、このマシンにある日本語フォントを探して rcParams に設定（結果はファイルに保存）
+#   Figure の使い回し	プロセスごとに Figure を1つだけ作り、グラフごとに ax.clear() して描き直す
+#   プロセスプール	グラフを何枚かずつ子プロセスに渡して、同時に描く（描画は CPU を使うのでスレッドより速い）
+#
+# 💡 フォントが1つも見つからないときは、英数字だけ DejaVu Sans で描きます（日本語は □ になる）。
+#    Linux なら `sudo apt install fonts-noto-cjk` などで入れるか、
+#    環境変数 MPL_CJK_FONT にフォントファイル（.ttf / .otf / .ttc）のパスを指定してください。
+
+import argparse
+import json
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")  # pyplot より先に指定する（画面が無くても動く）
+
+from matplotlib import font_manager  # noqa: E402
+from matplotlib.backends.backend_agg import FigureCanvasAgg  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+
+from plot_downsample import plot_series  # noqa: E402
+
+# 上から順に探す（Mac・Windows・Linux でよく入っている日本語フォント）
+CJK_FONTS = [
+    "Hiragino Sans",
+    "Hiragino Kaku Gothic ProN",
+    "Yu Gothic",
+    "Meiryo",
+    "Noto Sans CJK JP",
+    "Noto Sans JP",
+    "Source Han Sans JP",
+    "IPAexGothic",
+    "IPAGothic",
+    "TakaoGothic",
+    "VL Gothic",
+    "MS Gothic",
+]
+FALLBACK_FONT = "DejaVu Sans"  # matplotlib に必ず入っている（英数字用）
+FONT_CACHE = Path(matplotlib.get_cachedir()) / "cjk_fonts.json"
+DEFAULT_OUT = Path("charts")
+
+
+# ---- 1) 日本語フォントを探す（結果はファイルに保存して使い回す） ----
+@lru_cache(maxsize=None)
+def resolve_cjk_fonts(candidates: tuple[str, ...] = tuple(CJK_FONTS)) -> list[str]:
+    """このマシンにある日本語フォントの名前を、candidates の順で返す（無ければ空のリスト）。
+
+    前回の結果（FONT_CACHE）が同じ候補・同じ matplotlib で、フォントファイルも残っていればそれを使う。
+    """
+    extra = os.environ.get("MPL_CJK_FONT")
+    if extra:
+        font_manager.fontManager.addfont(extra)  # 指定されたフォントファイルを候補に足す
+    key = {"matplotlib": matplotlib.__version__, "candidates": list(candidates), "extra": extra}
+    try:
+        cached = json.loads(FONT_CACHE.read_text(encoding="utf-8"))
+        if cached["key"] == key and all(Path(p).exists() for p in cached["paths"]):
+            return cached["fonts"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    installed = {}
+    for entry in font_manager.fontManager.ttflist:
+        installed.setdefault(entry.name, entry.fname)
+    names = [font_manager.FontProperties(fname=extra).get_name()] if extra else []
+    names += [name for name in candidates if name in installed and name not in names]
+    try:
+        FONT_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        FONT_CACHE.write_text(
+            json.dumps({"key": key, "fonts": names, "paths": [installed.get(n, extra) for n in names]}),
+            encoding="utf-8",
+        )
+    except OSError:
+        pass  # 保存できなくても、次回また探すだけ
+    return names
+
+
+def use_cjk_font() -> list[str]:
+    """見つかった日本語フォント（＋英数字用の DejaVu Sans）を rcParams に設定し、その一覧を返す。
+
+    matplotlib は font.family の一覧を前から順に試し、文字が無ければ次のフォントで描く。
+    """
+    fonts = resolve_cjk_fonts()
+    matplotlib.rcParams["font.family"] = [*fonts, FALLBACK_FONT]
+    if not fonts:
+        # 日本語の1文字ごとに「Glyph missing」の警告が出るので止める（見つからないことは呼び出し側で1回知らせる）
+        warnings.filterwarnings("ignore", message="Glyph .* missing from font")
+    return fonts
+
+
+# 🔹 ポイント
+# font_manager.fontManager.ttflist	matplotlib が知っているフォントの一覧（matplotlib 自身もキャッシュしている）
+# FONT_CACHE	どの候補が見つかったかを保存。子プロセスごとに探し直さない
+# font.family をリストにする	日本語は Noto Sans CJK JP、英数字は DejaVu Sans のように、文字ごとに代わりのフォントを使う
+
+
+# ---- 2) 1枚分の描画 ----
+@dataclass
+class ChartJob:
+    """1枚のグラフ。out の拡張子（.png / .svg）で形式が決まる。"""
+
+    out: Path
+    kind: str  # "line" か "bar"
+    title: str
+    labels: list
+    values: list
+    xlabel: str = ""
+    ylabel: str = ""
+
+
+# プロセスごとに1つだけ作る Figure（大きさ・解像度ごと）
+_FIGURES: dict[tuple, tuple] = {}
+
+
+def _figure(size: tuple[float, float], dpi: int):
+    key = (size, dpi)
+    if key not in _FIGURES:
+        fig = Figure(figsize=size, dpi=dpi)  # pyplot を通さないので、閉じ忘れてもメモリが増えない
+        FigureCanvasAgg(fig)  # 描画先を Agg に固定（savefig のたびに描画先を切り替えない）
+        # 余白は最初に1回だけ決める（tight_layout() は文字の大きさを全部測り直すので、1枚ごとだと遅い）
+        fig.subplots_adjust(left=0.1, right=0.97, top=0.9, bottom=0.22)
+        _FIGURES[key] = (fig, fig.add_subplot())
+    return _FIGURES[key]
+
+
+def render(job: ChartJob, size: tuple[float, float] = (8, 4.5), dpi: int = 100) -> Path:
+    """job を描いて保存する。同じプロセスの2枚目からは Figure を作らず、描き直すだけ。"""
+    fig, ax = _figure(size, dpi)
+    ax.clear()
+    x = range(len(job.values))
+    if job.kind == "bar":
+        ax.bar(x, job.values, color="orange")
+    else:
+        # 点が図の横幅（ピクセル）より多ければ、ピークを残して減らしてから描く（plot_downsample.py）
+        plot_series(ax, x, job.values, color="blue", marker="o" if len(job.values) <= 50 else None, linestyle="-")
+        ax.grid(True)
+    # 横軸のラベルは、多すぎると重なるので最大12個に間引く
+    step = max(1, len(job.labels) // 12)
+    ax.set_xticks(list(x)[::step], [str(label) for label in job.labels[::step]], rotation=30, ha="right")
+    ax.set_title(job.title)
+    ax.set_xlabel(job.xlabel)
+    ax.set_ylabel(job.ylabel)
+    job.out.parent.mkdir(parents=True, exist_ok=True)
+    fig.savefig(job.out)
+    return job.out
+
+
+# ---- 3) まとめて描く ----
+_RENDER_OPTIONS: dict = {}
+
+
+def _init_worker(options: dict) -> None:
+    """子プロセスの最初に1回だけ：フォントの設定と描画オプションの受け取り。"""
+    use_cjk_font()
+    _RENDER_OPTIONS.update(options)
+
+
+def _render_job(job: ChartJob) -> Path:
+    return render(job, **_RENDER_OPTIONS)
+
+
+def render_batch(jobs_list: list[ChartJob], jobs: int | None = None, size=(8, 4.5), dpi: int = 100) -> list[Path]:
+    """グラフをまとめて描き、保存したファイルの一覧（jobs_list の順）を返す。"""
+    options = {"size": tuple(size), "dpi": dpi}
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(jobs_list) or 1))
+    if jobs == 1:  # 1プロセスなら、プロセスを起動する手間を省いてそのまま実行
+        _init_worker(options)
+        return [_render_job(job) for job in jobs_list]
+    chunksize = max(1, len(jobs_list) // (jobs * 8))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(options,)) as pool:
+        return list(pool.map(_render_job, jobs_list, chunksize=chunksize))
+
+
+def group_jobs(
+    groups: dict, out_dir: Path, kinds: list[str], formats: list[str], value: int = 0, ylabel: str = ""
+) -> list[ChartJob]:
+    """{部署名: [(カテゴリ, 値1, …), …]} から、部署 × 種類 × 形式ごとの ChartJob を作る。
+
+    ファイル名は bulk_report.output_paths() と同じ決め方（"営業/東京" → 営業_東京、"../外" → .._外。
+    大文字・小文字だけ違う名前や、置き換えて重なった名前には _2, _3 … をつける）。out_dir の外には書かない。
+    """
+    from bulk_report import output_paths  # 顧客別レポートと同じファイル名の決め方
+
+    jobs_list = []
+    for base, (name, rows) in zip(output_paths(groups, out_dir, suffix=""), groups.items()):
+        labels = [row[0] for row in rows]
+        values = [row[1 + value] for row in rows]
+        for kind in kinds:
+            for fmt in formats:
+                out = base.with_name(f"{base.name}_{kind}.{fmt}")
+                jobs_list.append(ChartJob(out, kind, str(name), labels, values, ylabel=ylabel))
+    return jobs_list
+
+
+# 🔹 ポイント
+# matplotlib.use("Agg")	画面（ウィンドウ）を使わない描画。plt.show() の代わりに fig.savefig() で保存
+# Figure(...) を直接作る	pyplot の「今の図」を使わないので、プロセスの中で何枚描いても図が溜まらない
+# ax.clear()	Figure と Axes は作り直さずに、中身だけ消して次のグラフを描く
+# initializer	子プロセスの最初に1回だけフォントを設定（グラフごとには探さない）
+# output_paths	部署名の / や : は _ に置き換え、重なった名前には _2 をつける（サブフォルダや --out の外に書かない）
+
+
+# ---- 4) コマンドラインから実行 ----
+def main() -> None:
+    from excel_chart_batch import read_groups, sample_groups  # 入力の形は excel_chart_batch.py と同じ
+
+    parser = argparse.ArgumentParser(description="たくさんのグラフを画面なしで PNG / SVG に書き出す")
+    parser.add_argument("csv", nargs="?", type=Path, help="入力CSV")
+    parser.add_argument("--sample", type=int, help="CSV の代わりに、試し用のデータを N 部署分作る")
+    parser.add_argument("--group", default="部署", help="グループ（部署）の列")
+    parser.add_argument("--category", default="日付", help="横軸にする列")
+    parser.add_argument("--values", default="売上", help="グラフにする数値の列")
+    parser.add_argument("--kind", choices=["line", "bar", "both"], default="line", help="グラフの種類")
+    parser.add_argument("--format", nargs="+", choices=["png", "svg"], default=["png"], help="保存する形式")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="出力フォルダ")
+    parser.add_argument("--dpi", type=int, default=100, help="PNG の解像度")
+    parser.add_argument("--jobs", type=int, help="同時に動かすプロセス数（既定：CPUのコア数）")
+    args = parser.parse_args()
+
+    if args.csv is not None:
+        groups = read_groups(args.csv, args.group, args.category, [args.values])
+    elif args.sample:
+        groups = {name: rows[:31] for name, rows in sample_groups(args.sample).items()}  # 1か月分
+    else:
+        parser.error("CSV か --sample N を指定してください")
+
+    fonts = use_cjk_font()
+    print("🔤 日本語フォント:", ", ".join(fonts) if fonts else "見つかりません（日本語は □ になります）")
+    kinds = ["line", "bar"] if args.kind == "both" else [args.kind]
+    jobs_list = group_jobs(groups, args.out, kinds, args.format, ylabel=args.values)
+
+    started = time.perf_counter()
+    files = render_batch(jobs_list, args.jobs, dpi=args.dpi)
+    elapsed = time.perf_counter() - started
+    print("✅ 完了:", args.out.resolve())
+    print(f"   {len(files)} 枚（{elapsed:.2f} 秒、{len(files) / elapsed:,.1f} 枚/秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
 # run_excel_io.py
+# 💡 セルの読み書きは xlsx_patch.py（zip の中の対象シートのXMLだけを書き換える）で行う。
+#    ブック全体を load_workbook → save しないので、巨大なブックでも数セルの読み書きはすぐ終わる。
+#    openpyxl で同じことをする流れは run_excel_io_annotated.py を参照。
 from __future__ import annotations
 from pathlib import Path
 from datetime import datetime
-from openpyxl import load_workbook, Workbook
+import zipfile
+
+from openpyxl import Workbook
+
+from xlsx_patch import book_parts, patch_cells, read_cell
 
 
 def log(*args):  # 見やすいログ関数
@@ -35,25 +42,26 @@ def main():
 
     ensure_src_exists()
 
-    # 既存ブックを開く
-    wb = load_workbook(SRC)
-    ws = wb.active
-    log("シート名:", ws.title)
-    log("実行前 A1:", ws["A1"].value, "/ 実行前 B1:", ws["B1"].value)
-
-    # 書き込み（常に上書き）
-    ws["B1"] = 12345
-    ws["D1"] = "こんにちは openpyxl!"
-    ws["F1"] = datetime.now()
-
-    # 別名保存
-    wb.save(OUT)
+    # 既存ブックのシート名（開いたときに選ばれているシート）
+    with zipfile.ZipFile(SRC) as zf:
+        parts = book_parts(zf)
+    log("シート名:", parts.sheets[min(parts.active, len(parts.sheets) - 1)][0])  # activeTab が範囲外なら最後のシート（wb.active と同じ）
+    log("実行前 A1:", read_cell(SRC, "A1"), "/ 実行前 B1:", read_cell(SRC, "B1"))
+
+    # 書き込み（常に上書き）して別名保存。対象シート以外のメンバーはそのままコピーされる
+    patch_cells(
+        SRC,
+        {
+            "B1": 12345,
+            "D1": "こんにちは openpyxl!",
+            "F1": datetime.now(),
+        },
+        OUT,
+    )
     log("✅ 保存完了:", OUT)
 
-    # 再読み込みで確認
-    wb2 = load_workbook(OUT)
-    ws2 = wb2.active
-    log("再読込後 B1:", ws2["B1"].value)
+    # 保存したブックから B1 だけを読んで確認
+    log("再読込後 B1:", read_cell(OUT, "B1"))
 
 
 if __name__ == "__main__":
@@ -94,6 +94,18 @@ def main() -> None:
     log("再読込後 B1:", ws2["B1"].value)
 
 
+# ---- 参考：巨大なブック（数百MB）で数セルだけ読み書きしたいとき ----
+# load_workbook → wb.save は「全セルを読み込んで、全セルを書き直す」ので、
+# 200MB のブックだと B1 を1つ変えるだけで数分かかります。
+# xlsx_patch.py は zip の中の対象シートのXMLだけを書き換え、ほかのメンバーはそのままコピーします。
+#
+#   from xlsx_patch import patch_cells, read_cell
+#   patch_cells(SRC, {"B1": 12345, "D1": "こんにちは openpyxl!", "F1": datetime.now()}, OUT)
+#   read_cell(OUT, "B1")  # → 12345（目的の行まで読んだら止まるので、ミリ秒で返る）
+#
+# run_excel_io.py はこちらの方法で同じ処理をしています。
+
+
 # ---- スクリプトのエントリーポイント（Pythonの定石） ----
 if __name__ == "__main__":
     try:
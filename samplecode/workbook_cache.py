@@ -0,0 +1,247 @@
+# workbook_cache.py
+# ========================================
+# 読み込んだシートを「列ごとの形式（Parquet）」で保存しておくキャッシュ
+# ========================================
+# pd.read_excel() や load_workbook() は、実行するたびに xlsx の中のXMLを最初から解析します。
+# ファイルが前回と同じなら、解析済みの表（DataFrame）を保存しておいて読み直すだけで済みます。
+#
+# 状態	動き
+# 更新時刻・サイズが前回と同じ	保存済みの Parquet を読む（XMLは解析しない）
+# 更新時刻だけ違う（コピー・上書き保存しただけ）	ファイルの sha256 を計算 → 中身が同じなら保存済みを使う
+# 中身が違う・初めて	pd.read_excel() で解析して、Parquet に保存する
+#
+# 💡 保存の仕組み（python-scraping の http_cache.py と同じ形）
+# - 表は「ファイルの sha256 ＋ シート名 ＋ 読み込みオプション」から作った名前で objects/ に保存
+#   （同じ中身のブックを別の場所にコピーしても、同じ保存ファイルを使う）
+# - パス → sha256・更新時刻・サイズの対応表は SQLite（index.sqlite3）に保存
+# - 合計サイズが max_bytes を超えたら、最後に使ってから一番時間が経ったものから削除（LRU）
+# 💡 Parquet は pyarrow が必要です。入っていない・Parquet にできない表（1つの列に文字と数値が
+#    混ざっているなど）は pickle で保存します。
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import pickle
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = Path(os.environ.get("WORKBOOK_CACHE_DIR", Path(__file__).resolve().parent / ".workbook_cache"))
+
+
+@dataclass
+class CacheEntry:
+    key: str  # ブックのパス ＋ シート名 ＋ 読み込みオプション
+    path: str
+    mtime_ns: int
+    size: int  # ブックのバイト数
+    file_hash: str  # ブックの sha256
+    object: str  # objects/ の中のファイル名
+    format: str  # "parquet" か "pickle"
+    object_size: int  # 保存したファイルのバイト数
+    last_access: float  # 最後に使った時刻（LRU用）
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class WorkbookCache:
+    """シートごとの DataFrame をディスクに保存するキャッシュ。
+
+    cache = WorkbookCache()
+    df = cache.read_excel("sales_2024_01.xlsx")  # 2回目からは Parquet を読むだけ
+
+    max_bytes	保存ファイルの合計サイズ上限。超えたら古いものから削除
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_CACHE_DIR, max_bytes: int = 500 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.hits = self.misses = 0
+        # kakeibo_batch.py のように複数プロセスから使っても、待ってから書き込めるよう timeout を長めに
+        self._db = sqlite3.connect(self.root / "index.sqlite3", timeout=30)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                file_hash TEXT NOT NULL,
+                object TEXT NOT NULL,
+                format TEXT NOT NULL,
+                object_size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_object ON entries(object)")
+        self._db.commit()
+
+    # ---- 読み取り ----
+    def read_excel(self, path, sheet_name: str | int = 0, **kwargs) -> pd.DataFrame:
+        """pd.read_excel(path, sheet_name, **kwargs) と同じ表を返す（ブックが前回と同じなら解析しない）。"""
+        if not isinstance(sheet_name, (str, int)):
+            raise TypeError("sheet_name はシート名か番号を1つ指定してください（複数シートは1つずつ読む）")
+        path = Path(path).resolve()
+        stat = path.stat()
+        options = repr((sheet_name, sorted(kwargs.items())))
+        key = f"{path}\n{options}"
+
+        entry = self._lookup(key)
+        file_hash = None
+        if entry is not None and (entry.mtime_ns, entry.size) != (stat.st_mtime_ns, stat.st_size):
+            file_hash = file_sha256(path)  # 更新時刻が変わっても、中身が同じなら使える
+            if file_hash != entry.file_hash:
+                entry = None
+        if entry is not None:
+            df = self._load(entry)
+            if df is not None:
+                self.hits += 1
+                self._touch(entry, stat)
+                return df
+
+        # 別の場所に同じ中身のブックがあって、すでに保存済みならそれを使う
+        file_hash = file_hash or file_sha256(path)
+        name = hashlib.sha256(f"{file_hash}\n{options}".encode()).hexdigest()
+        row = self._db.execute("SELECT * FROM entries WHERE object = ? LIMIT 1", (name,)).fetchone()
+        if row is not None:
+            shared = CacheEntry(*row)
+            df = self._load(shared)
+            if df is not None:
+                self.hits += 1
+                self._register(key, path, stat, file_hash, name, shared.format, shared.object_size)
+                return df
+
+        self.misses += 1
+        df = pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+        self._store(key, path, stat, file_hash, name, df)
+        return df
+
+    # ---- 書き込み ----
+    def _store(self, key: str, path: Path, stat, file_hash: str, name: str, df: pd.DataFrame) -> None:
+        data, fmt = _serialize(df)
+        target = self._object_path(name)
+        target.parent.mkdir(exist_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)  # 書きかけのファイルを読まれないよう、最後に置き換える
+        self._register(key, path, stat, file_hash, name, fmt, len(data))
+
+    def _register(self, key: str, path: Path, stat, file_hash: str, name: str, fmt: str, size: int) -> None:
+        """対応表に key → 保存ファイルを登録し、上限を超えていたら古いものを削除する。"""
+        with self._db:
+            old = self._db.execute("SELECT object FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, str(path), stat.st_mtime_ns, stat.st_size, file_hash, name, fmt, size, time.time()),
+            )
+            if old and old[0] != name:
+                self._drop_object_if_unused(old[0])
+            self._evict()
+
+    def total_bytes(self) -> int:
+        return self._total_bytes()
+
+    def clear(self) -> None:
+        with self._db:
+            for (name,) in self._db.execute("SELECT DISTINCT object FROM entries").fetchall():
+                self._object_path(name).unlink(missing_ok=True)
+            self._db.execute("DELETE FROM entries")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "WorkbookCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # ---- 内部処理 ----
+    def _lookup(self, key: str) -> CacheEntry | None:
+        row = self._db.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+        return CacheEntry(*row) if row else None
+
+    def _load(self, entry: CacheEntry) -> pd.DataFrame | None:
+        try:
+            data = self._object_path(entry.object).read_bytes()
+        except OSError:  # 保存ファイルが消えていたら、解析し直す
+            return None
+        if entry.format == "parquet":
+            return pd.read_parquet(io.BytesIO(data))
+        return pickle.loads(data)
+
+    def _touch(self, entry: CacheEntry, stat) -> None:
+        with self._db:
+            self._db.execute(
+                "UPDATE entries SET last_access = ?, mtime_ns = ?, size = ? WHERE key = ?",
+                (time.time(), stat.st_mtime_ns, stat.st_size, entry.key),
+            )
+
+    def _object_path(self, name: str) -> Path:
+        # 1フォルダにファイルが集中しないよう、先頭2文字でフォルダを分ける
+        return self.objects / name[:2] / name
+
+    def _total_bytes(self) -> int:
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(object_size), 0) FROM (SELECT DISTINCT object, object_size FROM entries)"
+        ).fetchone()
+        return row[0]
+
+    def _drop_object_if_unused(self, name: str) -> None:
+        used = self._db.execute("SELECT 1 FROM entries WHERE object = ? LIMIT 1", (name,)).fetchone()
+        if not used:
+            self._object_path(name).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """合計サイズが上限を超えていたら、最後に使った時刻が古い順に削除する（LRU）。"""
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, object, object_size FROM entries ORDER BY last_access").fetchall()
+        for key, name, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if not self._db.execute("SELECT 1 FROM entries WHERE object = ? LIMIT 1", (name,)).fetchone():
+                self._object_path(name).unlink(missing_ok=True)
+                total -= size
+
+
+def _serialize(df: pd.DataFrame) -> tuple[bytes, str]:
+    """Parquet にできればParquet、できなければ pickle のバイト列を返す。"""
+    try:
+        buffer = io.BytesIO()
+        df.to_parquet(buffer)
+        return buffer.getvalue(), "parquet"
+    except (ImportError, ValueError, TypeError):  # pyarrow が無い・型が混ざった列がある（ArrowInvalid など）
+        return pickle.dumps(df, protocol=pickle.HIGHEST_PROTOCOL), "pickle"
+
+
+# 🔹 ポイント
+# キー	ブックのパス ＋ シート名 ＋ read_excel のオプション（header や usecols が違えば別の表）
+# 更新時刻・サイズ	一致すれば sha256 も計算しない（いちばん速い道）
+# sha256	更新時刻が変わったときだけ計算。中身が同じなら解析しない
+# Parquet	列ごとに型（数値・日付・文字）を保ったまま保存できる。読み込みは read_excel の数十倍速い
+
+
+_default: WorkbookCache | None = None
+
+
+def read_excel(path, sheet_name: str | int = 0, **kwargs) -> pd.DataFrame:
+    """既定の場所（WORKBOOK_CACHE_DIR か samplecode/.workbook_cache）のキャッシュを使う pd.read_excel。"""
+    global _default
+    if _default is None:
+        _default = WorkbookCache()
+    return _default.read_excel(path, sheet_name, **kwargs)
@@ -0,0 +1,675 @@
+# xlsx_patch.py
+# ========================================
+# 巨大な .xlsx の「数セルだけ」を、ブック全体を開かずに読み書きする
+# ========================================
+# load_workbook(SRC) → ws["B1"] = … → wb.save(OUT) は、全シートの全セルを
+# Python のオブジェクトに展開してから、全部をもう一度XMLに書き直します。
+# 200MB のブックだと、B1 を1つ書き換えるだけで数分かかります。
+#
+# xlsx の中身は「XMLファイルを zip にまとめたもの」です。
+#   xl/workbook.xml	シート名の一覧
+#   xl/worksheets/sheet1.xml	シートのセル（<row r="1"><c r="B1"><v>12345</v></c></row>）
+#   xl/sharedStrings.xml	文字列セルの中身（セルには「何番目の文字列か」だけが入る）
+#   xl/styles.xml	表示形式（日付セルは「日付の表示形式」の番号を持つ）
+#
+# このモジュールがすること
+#   read_cell()	対象シートのXMLを先頭から流し読みし、目的の行まで来たらすぐ止める
+#   patch_cells()	対象シートのXMLと sharedStrings.xml だけを書き換え、他の zip メンバーは
+#   	圧縮されたままのバイト列を1バイトも変えずにコピーする
+#
+# 💡 書き換えたシートのXMLは、目的の行より後ろも「解析せずに」流して圧縮し直すだけです。
+#    時間は「そのシートのXMLの大きさ」で決まり、ほかのシートや画像の量には左右されません。
+# 💡 openpyxl が保存するときと同じく、数式の計算順序のキャッシュ（calcChain.xml）は削除します。
+#    Excel が次に開いたときに作り直します。
+
+from __future__ import annotations
+
+import os
+import posixpath
+import re
+import shutil
+import zipfile
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from pathlib import Path
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils import column_index_from_string, get_column_letter
+from openpyxl.utils.datetime import MAC_EPOCH, WINDOWS_EPOCH, from_excel, to_excel
+
+CHUNK = 1 << 20  # zip から一度に読むバイト数（1MB）
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+REF = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+SHEET_DATA_OPEN = re.compile(rb"<(?:(\w+):)?sheetData\b[^>]*?(/?)>")
+ROW_OR_END = re.compile(rb"<(?:\w+:)?row\b([^>]*?)(/?)>|</(?:\w+:)?sheetData>")
+ROW_END = re.compile(rb"</(?:\w+:)?row>")
+CELL = re.compile(rb"<(?:\w+:)?c\b([^>]*?)(?:/>|>(.*?)</(?:\w+:)?c>)", re.S)
+ATTR = re.compile(rb"\b(\w+)=\"([^\"]*)\"")
+VALUE = re.compile(rb"<(?:\w+:)?v>(.*?)</(?:\w+:)?v>", re.S)
+TEXT = re.compile(rb"<(?:\w+:)?t(?:\s[^>]*)?>(.*?)</(?:\w+:)?t>", re.S)
+DIMENSION = re.compile(rb"(<(?:\w+:)?dimension\b[^>]*?\bref=\")([^\"]*)(\")")
+SST_OPEN = re.compile(rb"<(?:\w+:)?sst\b([^>]*?)(/?)>")
+SST_CLOSE = re.compile(rb"</((?:\w+:)?)sst>")
+CELL_XFS_END = re.compile(rb"</(?:\w+:)?cellXfs>")
+CELL_XFS_COUNT = re.compile(rb"(<(?:\w+:)?cellXfs\b[^>]*?\bcount=\")\d+")
+WORKSHEET = re.compile(rb"<(?:(\w+):)?worksheet\b")
+CALC_CHAIN_TYPE = re.compile(rb"<Override\b[^>]*?calcChain[^>]*?/>|<Relationship\b[^>]*?/calcChain\"[^>]*?/>")
+ILLEGAL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")  # XMLに書けない制御文字
+
+# 日付を新しく書くときに使う組み込みの表示形式（BUILTIN_FORMATS の番号）
+DATE_FORMAT_IDS = {datetime: 22, date: 14, time: 21}  # m/d/yy h:mm / mm-dd-yy / h:mm:ss
+
+
+# ---- 1) ブックの構成（どのシートがどのXMLか） ----
+@dataclass
+class BookParts:
+    sheets: list  # [(シート名, シートXMLのパス), ...]（タブの順番）
+    active: int  # 開いたときに選ばれているシート（wb.active）の番号
+    shared_strings: str | None
+    styles: str | None
+    calc_chain: str | None
+    date1904: bool  # Mac の古い Excel の「1904年基準」の日付か
+
+    def sheet_part(self, sheet: str | None = None) -> str:
+        """シート名（None なら wb.active と同じシート）から、シートXMLのパスを返す。"""
+        if sheet is None:
+            return self.sheets[min(self.active, len(self.sheets) - 1)][1]
+        for name, part in self.sheets:
+            if name == sheet:
+                return part
+        raise KeyError(f"シート {sheet} がありません（シート: {[name for name, _ in self.sheets]}）")
+
+    @property
+    def epoch(self) -> datetime:
+        return MAC_EPOCH if self.date1904 else WINDOWS_EPOCH
+
+
+def book_parts(zf: zipfile.ZipFile) -> BookParts:
+    """workbook.xml とその関連付け（.rels）から、シートや共有文字列のXMLの場所を調べる。"""
+    targets, by_type = {}, {}
+    for rel in ET.fromstring(zf.read("xl/_rels/workbook.xml.rels")).iter(f"{PKG_REL_NS}Relationship"):
+        target = rel.get("Target")
+        name = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        targets[rel.get("Id")] = name
+        by_type[rel.get("Type", "").rsplit("/", 1)[-1]] = name
+    wb = ET.fromstring(zf.read("xl/workbook.xml"))
+    view = wb.find(f"{MAIN_NS}bookViews/{MAIN_NS}workbookView")
+    props = wb.find(f"{MAIN_NS}workbookPr")
+    return BookParts(
+        sheets=[(s.get("name"), targets[s.get(f"{REL_NS}id")]) for s in wb.iter(f"{MAIN_NS}sheet")],
+        active=int(view.get("activeTab", 0)) if view is not None else 0,
+        shared_strings=by_type.get("sharedStrings"),
+        styles=by_type.get("styles"),
+        calc_chain=by_type.get("calcChain"),
+        date1904=props is not None and props.get("date1904") in ("1", "true"),
+    )
+
+
+def split_ref(ref: str) -> tuple[int, int]:
+    """"B1" → (列番号 2, 行番号 1)"""
+    m = REF.match(ref)
+    if not m:
+        raise ValueError(f"セル番地の形式が正しくありません: {ref}")
+    return column_index_from_string(m.group(1).upper()), int(m.group(2))
+
+
+def _chunks(zf: zipfile.ZipFile, name: str):
+    with zf.open(name) as f:
+        while chunk := f.read(CHUNK):
+            yield chunk
+
+
+# ---- 2) 表示形式（日付かどうか） ----
+class _Styles:
+    """styles.xml の cellXfs（セルの書式の一覧）から、日付の表示形式の番号を調べる。"""
+
+    def __init__(self, xml: bytes | None):
+        self.xml = xml
+        self.formats, self.xf_formats = {}, []
+        self.added = False  # cellXfs に書式を足したか（足したら styles.xml も書き直す）
+        if xml is None:
+            return
+        root = ET.fromstring(xml)
+        for fmt in root.iter(f"{MAIN_NS}numFmt"):
+            self.formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+        xfs = root.find(f"{MAIN_NS}cellXfs")
+        self.xf_formats = [int(xf.get("numFmtId", 0)) for xf in (xfs if xfs is not None else [])]
+
+    def is_date(self, style: int) -> bool:
+        if not 0 <= style < len(self.xf_formats):
+            return False
+        fmt_id = self.xf_formats[style]
+        return is_date_format(self.formats.get(fmt_id) or BUILTIN_FORMATS.get(fmt_id, "General"))
+
+    def date_style(self, kind: type) -> int:
+        """日付用の書式番号。同じ表示形式の書式があればそれを使い、無ければ cellXfs に1つ足す。"""
+        fmt_id = DATE_FORMAT_IDS[kind]
+        if fmt_id in self.xf_formats:
+            return self.xf_formats.index(fmt_id)
+        if self.xml is None:
+            raise ValueError("styles.xml が無いブックには日付を書けません")
+        xf = b'<xf numFmtId="%d" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>' % fmt_id
+        self.xml, n = CELL_XFS_END.subn(lambda m: xf + m.group(0), self.xml, count=1)
+        if n == 0:
+            raise ValueError("styles.xml に cellXfs がありません")
+        self.xf_formats.append(fmt_id)
+        self.xml = CELL_XFS_COUNT.sub(lambda m: m.group(1) + b"%d" % len(self.xf_formats), self.xml, count=1)
+        self.added = True
+        return len(self.xf_formats) - 1
+
+
+# ---- 3) セル1つの読み取り ----
+def _attrs(raw: bytes) -> dict[bytes, bytes]:
+    return dict(ATTR.findall(raw))
+
+
+def _parse_value(attrs: dict, inner: bytes | None):
+    """<c> の中身から値を取り出す。共有文字列は ("s", 番号) のまま返す。"""
+    if not inner:
+        return None
+    t = attrs.get(b"t", b"n")
+    if t == b"inlineStr":
+        return _xml_text(b"".join(TEXT.findall(inner)))
+    v = VALUE.search(inner)
+    if v is None:
+        return None
+    text = v.group(1).decode("utf-8")
+    if t == b"s":
+        return ("s", int(text))
+    if t == b"b":
+        return text == "1"
+    if t in (b"str", b"e"):
+        return _xml_text(v.group(1))
+    return int(text) if text.lstrip("-").isdigit() else float(text)
+
+
+def _xml_text(raw: bytes) -> str:
+    return ET.fromstring(b"<t>" + raw + b"</t>").text or ""  # &amp; などの文字参照を戻す
+
+
+def _shared_string(zf: zipfile.ZipFile, name: str, index: int) -> str:
+    """sharedStrings.xml の index 番目の文字列（そこまで読んだら止める）。"""
+    parser = ET.XMLPullParser(events=("end",))
+    count = 0
+    for chunk in _chunks(zf, name):
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag != f"{MAIN_NS}si":
+                continue
+            if count == index:
+                # <si><t>…</t></si> か、書式付きの <si><r><t>…</t></r>…</si>（ふりがな rPh は除く）
+                return "".join(t.text or "" for t in elem.iter(f"{MAIN_NS}t") if t not in _phonetic(elem))
+            count += 1
+            elem.clear()
+    raise IndexError(f"共有文字列 {index} 番がありません")
+
+
+def _phonetic(si) -> set:
+    return {t for ph in si.iter(f"{MAIN_NS}rPh") for t in ph.iter(f"{MAIN_NS}t")}
+
+
+def read_cell(path, ref: str, sheet: str | None = None):
+    """1セルの値を返す（空なら None。日付の表示形式なら datetime）。"""
+    col, row = split_ref(ref)
+    with zipfile.ZipFile(path) as zf:
+        parts = book_parts(zf)
+        found = []
+        for _ in _rewrite_rows(_chunks(zf, parts.sheet_part(sheet)), [row], lambda n, xml: found.append(xml) or b""):
+            if found:  # 目的の行まで来たら、残りのXMLは読まない
+                break
+        row_xml = found[0] if found else None
+        if row_xml is None:
+            return None
+        for c, attrs, inner, _ in _cells(row_xml):
+            if c == col:
+                break
+        else:
+            return None
+        value = _parse_value(attrs, inner)
+        if isinstance(value, tuple):
+            return _shared_string(zf, parts.shared_strings, value[1])
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and b"s" in attrs:
+            styles = _Styles(zf.read(parts.styles) if parts.styles else None)
+            if styles.is_date(int(attrs[b"s"])):
+                return from_excel(value, parts.epoch)
+        return value
+
+
+# ---- 4) シートXMLを流しながら、目的の行だけ差し替える ----
+def _rewrite_rows(pieces, rows: list[int], edit):
+    """シートXMLのバイト列を流し、rows の各行を edit(行番号, 元の<row>…</row> or None) の戻り値に差し替える。
+
+    rows に無い行は解析せずにそのまま通す。最後の目的の行を過ぎたら、残りは丸ごとそのまま流す。
+    """
+    pieces = iter(pieces)
+    targets = sorted(set(rows))
+    buf, pos, scan = b"", 0, 0  # pos：ここまでは出力済み / scan：次に <row> を探し始める位置
+
+    def more() -> bool:
+        nonlocal buf, pos, scan
+        chunk = next(pieces, None)
+        if chunk is None:
+            return False
+        buf, scan, pos = buf[pos:] + chunk, scan - pos, 0
+        return True
+
+    # 行の並び（<sheetData>）の手前まで
+    while not (m := SHEET_DATA_OPEN.search(buf)):
+        if not more():
+            raise ValueError("シートXMLに sheetData がありません")
+    if m.group(2):  # <sheetData/>：行が1つも無いシート
+        prefix = m.group(1) + b":" if m.group(1) else b""
+        yield buf[: m.start()] + b"<" + prefix + b"sheetData>"
+        yield b"".join(edit(n, None) for n in targets)
+        yield b"</" + prefix + b"sheetData>" + buf[m.end() :]
+        yield from pieces
+        return
+    yield buf[: m.end()]
+    pos = scan = m.end()
+
+    prev = 0  # 直前の行番号（r 属性の無い行は「直前 + 1」行目）
+    while targets:
+        m = ROW_OR_END.search(buf, scan)
+        if m is None:
+            cut = buf.rfind(b"<", scan)  # タグが途中で切れていることがあるので、最後の < から後ろは残す
+            cut = len(buf) if cut < 0 else cut
+            yield buf[pos:cut]
+            pos = scan = cut
+            if not more():
+                raise ValueError("シートXMLの終わり（</sheetData>）が見つかりません")
+            continue
+        if m.group(0).startswith(b"</"):  # シートの最後まで来た → 残りの行を足す
+            yield buf[pos : m.start()]
+            pos = m.start()
+            yield b"".join(edit(n, None) for n in targets)
+            break
+        r = _attrs(m.group(1)).get(b"r")
+        number = int(r) if r else prev + 1
+        if number < targets[0]:  # 目的の行より前 → 中身は見ずに次の <row> へ
+            prev, scan = number, m.end()
+            continue
+        yield buf[pos : m.start()]
+        pos = m.start()
+        if number > targets[0]:  # 目的の行がまだ無い → この行の前に新しく作る
+            yield edit(targets.pop(0), None)
+            continue
+        while not m.group(2):  # <row r="1"/> 以外は </row> まで読む
+            close = ROW_END.search(buf, m.end())
+            if close:
+                break
+            if not more():
+                raise ValueError(f"{number} 行目の終わりが見つかりません")
+            m = ROW_OR_END.match(buf, pos)  # more() で buf の先頭がこの行の <row> になっている
+        end = close.end() if not m.group(2) else m.end()
+        yield edit(targets.pop(0), buf[m.start() : end])
+        prev, pos = number, end
+        scan = pos
+    yield buf[pos:]
+    yield from pieces
+
+
+def _cells(row_xml: bytes):
+    """<row> の中のセルを (列番号, 属性, 中身, 一致) で順に返す（r 属性の無いセルは直前の列 + 1）。"""
+    col = 0
+    for m in CELL.finditer(row_xml, row_xml.find(b">") + 1):
+        attrs = _attrs(m.group(1))
+        ref = attrs.get(b"r")
+        col = split_ref(ref.decode())[0] if ref else col + 1
+        yield col, attrs, m.group(2), m
+
+
+# ---- 5) 新しいセルのXMLを作る ----
+class Text(str):
+    """"=" で始まっても数式にせず、文字列のまま書く値（CSV から来た顧客名など）。
+
+    patch_cells(…, {"B2": Text(name)}) のように使う。"=HYPERLINK(…)" も文字のまま表示される。
+    """
+
+
+def _is_formula(value) -> bool:
+    return isinstance(value, str) and not isinstance(value, Text) and value.startswith("=")
+
+
+class _CellWriter:
+    """書き込む値を <c> 要素に変換する。文字列は sharedStrings.xml の末尾に足す番号を使う。"""
+
+    def __init__(self, prefix: bytes, styles: _Styles, epoch: datetime, string_base: int | None):
+        self.prefix = prefix  # シートXMLが "x:row" のような接頭辞付きなら b"x:"
+        self.styles = styles
+        self.epoch = epoch
+        self.string_base = string_base  # None なら共有文字列を使わずセルに直接書く（inlineStr）
+        self.strings: dict[str, int] = {}  # 追加する文字列 → 番号
+        self.refs = 0  # 追加した文字列を参照するセルの数
+
+    def prepare(self, values) -> None:
+        """書き込む値から、追加する共有文字列と日付の書式を先に決めておく。
+
+        zip の中では sharedStrings.xml や styles.xml がシートより前にあることもあるため、
+        シートを書き換える前に「何番になるか」を確定させる。
+        """
+        for value in values:
+            if isinstance(value, str) and not _is_formula(value) and self.string_base is not None:
+                self.strings.setdefault(value, self.string_base + len(self.strings))
+                self.refs += 1
+            elif isinstance(value, (date, time)):
+                self.styles.date_style(_date_kind(value))
+
+    def cell(self, col: int, row: int, value, old: dict | None) -> bytes:
+        p = self.prefix
+        style = (old or {}).get(b"s")
+        t = None
+        if isinstance(value, bool):
+            t, inner = b"b", b"<%sv>%d</%sv>" % (p, value, p)
+        elif isinstance(value, (int, float)):
+            if value != value or value in (float("inf"), float("-inf")):
+                raise ValueError(f"Excel に書けない数値です: {value}")
+            inner = b"<%sv>%s</%sv>" % (p, repr(value).encode(), p)
+        elif isinstance(value, (date, time)):
+            if style is None or not self.styles.is_date(int(style)):
+                style = b"%d" % self.styles.date_style(_date_kind(value))
+            inner = b"<%sv>%s</%sv>" % (p, repr(to_excel(value, self.epoch)).encode(), p)
+        elif isinstance(value, str):
+            if ILLEGAL_CHARS.search(value):
+                raise ValueError(f"XML に書けない制御文字が含まれています: {value!r}")
+            text = escape(value).encode("utf-8")
+            if _is_formula(value):  # 数式（値は Excel が開いたときに計算する）
+                inner = b"<%sf>%s</%sf>" % (p, text[1:], p)
+            elif self.string_base is not None:
+                t, inner = b"s", b"<%sv>%d</%sv>" % (p, self.strings[value], p)
+            else:
+                t, inner = b"inlineStr", b"<%sis>%s</%sis>" % (p, _t_element(p, value, text), p)
+        else:
+            raise TypeError(f"書き込めない値です: {type(value).__name__}")
+        ref = f"{get_column_letter(col)}{row}".encode()
+        attrs = b' r="%s"' % ref + (b' s="%s"' % style if style else b"") + (b' t="%s"' % t if t else b"")
+        return b"<%sc%s>%s</%sc>" % (p, attrs, inner, p)
+
+    def row(self, number: int, row_xml: bytes | None, edits: dict[int, object]) -> bytes:
+        """1行分の <row> を、edits（列番号 → 値。None はセルを消す）を反映して作り直す。"""
+        p = self.prefix
+        cells, old_attrs, tail = {}, {}, b""
+        if row_xml is None:
+            head = b'<%srow r="%d">' % (p, number)
+        else:
+            head_end = row_xml.find(b">") + 1
+            # spans（この行で使っている列の範囲のヒント）は変わるので外す。<row …/> は開き・閉じタグに直す
+            head = re.sub(rb'\sspans="[^"]*"', b"", row_xml[:head_end])
+            if head.endswith(b"/>"):
+                head = head[:-2].rstrip() + b">"
+            last = head_end
+            for col, attrs, _, m in _cells(row_xml):
+                raw = m.group(0)
+                if b"r" not in attrs:  # 列の位置を書いておかないと、セルを挿入したときにずれる
+                    ref = b' r="%s%d"' % (get_column_letter(col).encode(), number)
+                    raw = re.sub(rb"^(<(?:\w+:)?c)\b", lambda c: c.group(1) + ref, raw, count=1)
+                cells[col], old_attrs[col], last = raw, attrs, m.end()
+            close = ROW_END.search(row_xml, last)
+            tail = row_xml[last : close.start()] if close else b""  # セル以外の要素（extLst など）
+        for col, value in edits.items():
+            if value is None:
+                cells.pop(col, None)
+            else:
+                cells[col] = self.cell(col, number, value, old_attrs.get(col))
+        return head + b"".join(cells[col] for col in sorted(cells)) + tail + b"</%srow>" % p
+
+
+def _date_kind(value) -> type:
+    return datetime if isinstance(value, datetime) else date if isinstance(value, date) else time
+
+
+def _t_element(p: bytes, value: str, text: bytes) -> bytes:
+    space = b' xml:space="preserve"' if value != value.strip() else b""  # 前後の空白を消されないように
+    return b"<%st%s>%s</%st>" % (p, space, text, p)
+
+
+# ---- 6) sharedStrings.xml とシートXMLの書き換え ----
+def _string_count(zf: zipfile.ZipFile, name: str) -> int:
+    """今ある共有文字列の数（= 次に足す文字列の番号）。"""
+    head = b""
+    for chunk in _chunks(zf, name):
+        head += chunk
+        if m := SST_OPEN.search(head):
+            unique = _attrs(m.group(1)).get(b"uniqueCount")
+            if unique is not None:
+                return int(unique)
+            break
+    # uniqueCount が書かれていないブック → <si> を数える
+    count = 0
+    parser = ET.XMLPullParser(events=("end",))
+    for chunk in _chunks(zf, name):
+        parser.feed(chunk)
+        for _, elem in parser.read_events():
+            if elem.tag == f"{MAIN_NS}si":
+                count += 1
+            elem.clear()
+    return count
+
+
+def _append_strings(pieces, writer: _CellWriter):
+    """sharedStrings.xml の末尾に文字列を足し、count / uniqueCount を更新しながら流す。"""
+    pieces = iter(pieces)
+    buf = b""
+    while not (m := SST_OPEN.search(buf)):
+        buf += next(pieces)
+    prefix = re.match(rb"<(\w+:)?", m.group(0)).group(1) or b""
+    attrs = _attrs(m.group(1))
+    updates = {b"uniqueCount": b"%d" % (writer.string_base + len(writer.strings))}
+    if b"count" in attrs:  # count は「文字列セルの数」（同じ文字列を使うセルも数える）
+        updates[b"count"] = b"%d" % (int(attrs[b"count"]) + writer.refs)
+    opening = m.group(1)
+    for key, value in updates.items():
+        opening, n = re.subn(rb'(\b%s=")[^"]*' % key, lambda a: a.group(1) + value, opening, count=1)
+        if n == 0:
+            opening += b' %s="%s"' % (key, value)
+    added = b"".join(
+        b"<%ssi>%s</%ssi>" % (prefix, _t_element(prefix, s, escape(s).encode("utf-8")), prefix) for s in writer.strings
+    )
+    yield buf[: m.start()] + b"<%ssst%s>" % (prefix, opening)
+    if m.group(2):  # <sst …/>：文字列が1つも無い
+        yield added + b"</%ssst>" % prefix + buf[m.end() :]
+        yield from pieces
+        return
+    # </sst> はファイルの最後にあるので、末尾の少しだけを手元に残しながら流す
+    tail = buf[m.end() :]
+    for chunk in pieces:
+        tail += chunk
+        if len(tail) > 256:
+            yield tail[:-256]
+            tail = tail[-256:]
+    close = list(SST_CLOSE.finditer(tail))
+    if not close:
+        raise ValueError("sharedStrings.xml の終わり（</sst>）が見つかりません")
+    yield tail[: close[-1].start()] + added + tail[close[-1].start() :]
+
+
+def _expand_dimension(head: bytes, refs: list[tuple[int, int]]) -> bytes:
+    """<dimension ref="A1:D10"/>（使っている範囲）を、書き込むセルが入るように広げる。"""
+    m = DIMENSION.search(head)
+    if not m:
+        return head
+    try:
+        corners = [split_ref(r) for r in m.group(2).decode().split(":")]
+    except ValueError:
+        return head
+    cols = [c for c, _ in corners + refs]
+    rows = [r for _, r in corners + refs]
+    new = f"{get_column_letter(min(cols))}{min(rows)}:{get_column_letter(max(cols))}{max(rows)}".encode()
+    return head[: m.start(2)] + new + head[m.end(2) :]
+
+
+def _patch_sheet(pieces, by_row: dict[int, dict], writer: _CellWriter):
+    refs = [(col, row) for row, cols in by_row.items() for col in cols]
+    patched = _rewrite_rows(pieces, list(by_row), lambda n, xml: writer.row(n, xml, by_row[n]))
+    yield _expand_dimension(next(patched), refs)  # 最初のかたまりは <sheetData> までのヘッダー部分
+    yield from patched
+
+
+# ---- 7) zip の組み立て（書き換えないメンバーは圧縮されたまま丸ごとコピー） ----
+# 丸ごとコピーは zipfile の公開されていない属性（fp・start_dir・NameToInfo）を使う。
+# Python のバージョンで無くなっていたら、展開して圧縮し直すふつうの方法（_copy_member）に切り替える
+_RAW_COPY_ATTRS = ("fp", "start_dir", "filelist", "NameToInfo")
+
+
+def _can_copy_raw(zin: zipfile.ZipFile, zout: zipfile.ZipFile) -> bool:
+    return all(hasattr(zf, attr) for zf in (zin, zout) for attr in _RAW_COPY_ATTRS)
+
+
+def _copy_member(zin: zipfile.ZipFile, zout: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+    """公開 API だけでコピーする（展開して圧縮し直すので、丸ごとコピーより遅い）。"""
+    new = zipfile.ZipInfo(info.filename, info.date_time)
+    new.compress_type, new.external_attr, new.comment = info.compress_type, info.external_attr, info.comment
+    with zin.open(info) as src, zout.open(new, "w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT // 2) as dst:
+        shutil.copyfileobj(src, dst, CHUNK)
+
+
+def _copy_raw(zin: zipfile.ZipFile, zout: zipfile.ZipFile, info: zipfile.ZipInfo, end: int) -> None:
+    """ローカルヘッダーと圧縮済みデータを、展開せずにそのままコピーする（_can_copy_raw() が True のときだけ）。"""
+    new = zipfile.ZipInfo(info.filename, info.date_time)
+    for attr in ("compress_type", "comment", "extra", "create_system", "create_version", "extract_version",
+                 "flag_bits", "volume", "internal_attr", "external_attr", "CRC", "compress_size", "file_size"):
+        setattr(new, attr, getattr(info, attr))
+    zout.fp.seek(zout.start_dir)
+    new.header_offset = zout.fp.tell()
+    zin.fp.seek(info.header_offset)
+    remaining = end - info.header_offset
+    while remaining > 0:
+        chunk = zin.fp.read(min(CHUNK, remaining))
+        if not chunk:
+            raise ValueError(f"{info.filename} のデータが途中で切れています")
+        zout.fp.write(chunk)
+        remaining -= len(chunk)
+    # ZipFile は filelist をもとに、close() のときに目次（セントラルディレクトリ）を書く
+    zout.filelist.append(new)
+    zout.NameToInfo[new.filename] = new
+    zout.start_dir = zout.fp.tell()
+
+
+def _write_stream(zout: zipfile.ZipFile, info: zipfile.ZipInfo, pieces) -> None:
+    with zout.open(info.filename, "w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT // 2) as f:
+        for piece in pieces:
+            f.write(piece)
+
+
+def patch_cells(
+    src,
+    edits: dict[str, object],
+    out=None,
+    sheet: str | None = None,
+    compresslevel: int = 6,
+) -> Path:
+    """セルを書き換えた .xlsx を out（省略時は src に上書き）に保存する。
+
+    edits	{"B1": 12345, "D1": "こんにちは", "F1": datetime.now(), "G1": "=SUM(B1:C1)", "H1": None（消す）}
+    	外から来た文字列は Text("…") で包むと、"=" で始まっていても数式にならない
+    sheet	シート名（省略時は wb.active と同じシート）
+    compresslevel	書き換えたメンバーの圧縮レベル（6 は zlib の既定。1 だと約2倍速いがファイルは2割ほど大きい）
+    """
+    src = Path(src)
+    out = Path(out) if out is not None else src
+    by_row: dict[int, dict] = {}
+    for ref, value in edits.items():
+        col, row = split_ref(ref)
+        by_row.setdefault(row, {})[col] = value
+    part = out.with_name(out.name + ".part")  # 書き終わってから置き換える（src と out が同じでも安全）
+
+    with zipfile.ZipFile(src) as zin:
+        parts = book_parts(zin)
+        sheet_part = parts.sheet_part(sheet)
+        first = next(_chunks(zin, sheet_part), b"")
+        m = WORKSHEET.search(first)
+        prefix = m.group(1) + b":" if m and m.group(1) else b""
+        strings = parts.shared_strings
+        needs_strings = any(isinstance(v, str) and not _is_formula(v) for v in edits.values())
+        base = _string_count(zin, strings) if strings and needs_strings else None
+        styles = _Styles(zin.read(parts.styles) if parts.styles else None)
+        writer = _CellWriter(prefix, styles, parts.epoch, base)
+        writer.prepare(edits.values())
+
+        try:
+            with zipfile.ZipFile(part, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zout:
+                raw = _can_copy_raw(zin, zout)
+                if raw:  # 各メンバーのデータの終わり ＝ 次のメンバーの始まり（最後は目次の始まり）
+                    infos = sorted(zin.infolist(), key=lambda i: i.header_offset)
+                    ends = {i.filename: n.header_offset for i, n in zip(infos, infos[1:])}
+                    if infos:
+                        ends[infos[-1].filename] = zin.start_dir
+                for info in zin.infolist():
+                    name = info.filename
+                    if name == sheet_part:
+                        _write_stream(zout, info, _patch_sheet(_chunks(zin, name), by_row, writer))
+                    elif name == strings and writer.strings:
+                        _write_stream(zout, info, _append_strings(_chunks(zin, name), writer))
+                    elif name == parts.styles and styles.added:
+                        zout.writestr(name, styles.xml)
+                    elif name == parts.calc_chain:
+                        continue  # calcChain.xml は削除（関連付けと Content_Types からも外す）
+                    elif parts.calc_chain and name in ("[Content_Types].xml", "xl/_rels/workbook.xml.rels"):
+                        zout.writestr(name, CALC_CHAIN_TYPE.sub(b"", zin.read(name)))
+                    elif raw:
+                        _copy_raw(zin, zout, info, ends[name])
+                    else:
+                        _copy_member(zin, zout, info)
+        except BaseException:
+            part.unlink(missing_ok=True)
+            raise
+    os.replace(part, out)
+    return out
+
+
+# 🔹 ポイント
+# 書き換えるメンバー	対象シートのXML・sharedStrings.xml（文字列を書いたとき）・styles.xml（日付の書式が無かったとき）
+# そのままコピー	それ以外すべて（ほかのシート・画像・グラフなど）。展開も再圧縮もしない
+#   	（zipfile の内部の属性が使えない Python では、展開して圧縮し直す。結果の中身は同じ）
+# 文字列セル	sharedStrings.xml の末尾に追加して、その番号をセルに書く（Excel と同じ形）
+# 日付セル	シリアル値（1900/1/1 からの日数）＋ 日付の表示形式の書式番号
+# 数式セル	"=..." の文字列は数式として書く（計算結果は Excel で開いたときに入る）
+# Text("=...")	数式にせず文字列セルにする。CSV などから来た値をそのまま書くときは必ずこちら
+
+
+# ---- 8) コマンドラインから実行 ----
+def main() -> None:
+    import argparse
+    import time as _time
+
+    parser = argparse.ArgumentParser(description="xlsx のセルを、ブック全体を開かずに読み書きする")
+    parser.add_argument("file", type=Path, help="対象ブック")
+    parser.add_argument("cells", nargs="+", help="読む: B1 / 書く: B1=12345（文字列は D1=こんにちは）")
+    parser.add_argument("--sheet", help="シート名（既定：開いたときに選ばれているシート）")
+    parser.add_argument("--out", type=Path, help="保存先（既定：上書き）")
+    args = parser.parse_args()
+
+    edits = {}
+    for item in args.cells:
+        ref, sep, text = item.partition("=")
+        if not sep:
+            started = _time.perf_counter()
+            value = read_cell(args.file, ref, args.sheet)
+            print(f"▶ {ref}: {value!r}（{(_time.perf_counter() - started) * 1000:.1f} ms）")
+            continue
+        edits[ref] = _parse_cli_value(text)
+    if edits:
+        started = _time.perf_counter()
+        out = patch_cells(args.file, edits, args.out, args.sheet)
+        print(f"✅ {len(edits)} セルを書き換え: {out}（{(_time.perf_counter() - started) * 1000:.1f} ms）")
+
+
+def _parse_cli_value(text: str):
+    """コマンドラインの "12345" は数値、"" は空（セルを消す）、それ以外は文字列として扱う。"""
+    if text == "":
+        return None
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+if __name__ == "__main__":
+    main()